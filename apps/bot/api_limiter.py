@@ -0,0 +1,183 @@
+"""Outgoing Telegram Bot API rate limiter."""
+import asyncio
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+
+from infrastructure.monitoring.logging import get_logger
+from shared.utils.rate_limit import KeyedTokenBuckets, TokenBucket
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+logger = get_logger(__name__)
+
+_bulk_calls: ContextVar[bool] = ContextVar("bulk_api_calls", default=False)
+
+
+@contextmanager
+def bulk_calls() -> Iterator[None]:
+    """Mark Bot API calls made within this context as bulk (e.g. broadcasts), see ``ApiRateLimiter``."""
+    token = _bulk_calls.set(True)
+    try:
+        yield
+    finally:
+        _bulk_calls.reset(token)
+
+
+@dataclass
+class ApiMethodStats:
+    """Per-method request counters.
+
+    ``calls`` counts method calls and ``retries`` the extra requests sent
+    after RetryAfter; latency covers every request.
+    """
+
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    latency_total: float = 0.0
+    latency_max: float = 0.0
+
+    @property
+    def requests(self) -> int:
+        """Requests sent, retries included."""
+        return self.calls + self.retries
+
+    @property
+    def latency_avg(self) -> float:
+        """Average request latency in seconds."""
+        return self.latency_total / self.requests if self.requests else 0.0
+
+
+@dataclass
+class ApiLimiterStats:
+    """Rate limiter counters."""
+
+    queued: int = 0
+    max_queued: int = 0
+    throttled: int = 0
+    wait_time_total: float = 0.0
+    wait_time_max: float = 0.0
+    methods: dict[str, ApiMethodStats] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert stats to dictionary."""
+        data = asdict(self)
+        for name, method in self.methods.items():
+            data["methods"][name]["requests"] = method.requests
+            data["methods"][name]["latency_avg"] = method.latency_avg
+        return data
+
+
+class ApiRateLimiter(BaseRequestMiddleware):
+    """Bot session middleware that keeps outgoing calls within Telegram limits.
+
+    Calls addressed to a chat (methods with ``chat_id``) wait for a token from
+    the per-chat bucket (private chats and groups have separate rates), then
+    from the global bucket, so bursts are queued and smoothed instead of
+    answered with 429. Other methods pass through. ``TelegramRetryAfter``
+    pauses the chat's bucket, or the global one for calls not addressed to a
+    chat, and retries with exponential backoff.
+
+    Calls made in ``bulk_calls()`` also take a token from a ``bulk_rate``
+    bucket first, so bulk sends get at most that share of the global rate and
+    interactive replies keep the rest.
+    """
+
+    def __init__(
+        self,
+        global_rate: float,
+        chat_rate: float,
+        group_rate: float,
+        chat_burst: float,
+        max_retries: int,
+        retry_backoff: float,
+        bulk_rate: float | None = None,
+    ):
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.stats = ApiLimiterStats()
+        self._global = TokenBucket(global_rate)
+        self._bulk = TokenBucket(min(bulk_rate, global_rate) if bulk_rate is not None else global_rate)
+        self._chats = KeyedTokenBuckets(chat_rate, capacity=chat_burst)
+        self._groups = KeyedTokenBuckets(group_rate, capacity=chat_burst)
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: "Bot",
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        chat_id = getattr(method, "chat_id", None)
+        method_stats = self._method_stats(type(method).__name__)
+        method_stats.calls += 1
+
+        attempt = 0
+        while True:
+            if chat_id is not None:
+                await self._wait(chat_id)
+
+            started = time.monotonic()
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                if attempt >= self.max_retries:
+                    method_stats.errors += 1
+                    raise
+                method_stats.retries += 1
+                delay = e.retry_after + self.retry_backoff * 2**attempt
+                attempt += 1
+                logger.warning(
+                    "RetryAfter on %s (chat_id=%s), retrying in %.1fs", type(method).__name__, chat_id, delay
+                )
+            except Exception:
+                method_stats.errors += 1
+                raise
+            finally:
+                latency = time.monotonic() - started
+                method_stats.latency_total += latency
+                method_stats.latency_max = max(method_stats.latency_max, latency)
+
+            if chat_id is None:
+                # Not scoped to a chat: every chat call queues behind the pause
+                self._global.pause(delay)
+                await asyncio.sleep(delay)
+            else:
+                # Later calls to this chat queue behind the pause too
+                self._chat_buckets(chat_id).pause(chat_id, delay)
+
+    def _method_stats(self, name: str) -> ApiMethodStats:
+        stats = self.stats.methods.get(name)
+        if stats is None:
+            stats = self.stats.methods[name] = ApiMethodStats()
+        return stats
+
+    def _chat_buckets(self, chat_id: int | str) -> KeyedTokenBuckets:
+        """Private chats have positive IDs; groups, channels and @usernames use group limits."""
+        return self._chats if isinstance(chat_id, int) and chat_id > 0 else self._groups
+
+    async def _wait(self, chat_id: int | str) -> None:
+        """Take per-chat and global tokens, sleeping while queued."""
+        stats = self.stats
+        stats.queued += 1
+        stats.max_queued = max(stats.max_queued, stats.queued)
+        try:
+            waited = await self._bulk.acquire() if _bulk_calls.get() else 0.0
+            waited += await self._chat_buckets(chat_id).acquire(chat_id)
+            waited += await self._global.acquire()
+        finally:
+            stats.queued -= 1
+
+        if waited > 0:
+            stats.throttled += 1
+            stats.wait_time_total += waited
+            stats.wait_time_max = max(stats.wait_time_max, waited)
@@ -1,13 +1,15 @@
 """Dependency Injection container setup with Dishka."""
-from collections.abc import AsyncIterable
+from collections.abc import AsyncGenerator
 
-from dishka import AsyncContainer, Provider, Scope, provide
+from dishka import AsyncContainer, Provider, Scope, from_context, provide
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 from apps.bot.services.user_service import UserService
 from config.settings.base import AppSettings, get_settings
-from infrastructure.database.core.session import get_engine, get_session_factory
+from infrastructure.database.core.session import get_engine, get_session_factory, is_read_only
 from infrastructure.database.uow import UnitOfWork
+from infrastructure.database.user_cache import UserCache, get_user_cache
+from shared.dto.user import UserSnapshotDTO
 
 
 class SettingsProvider(Provider):
@@ -30,21 +32,37 @@ class InfrastructureProvider(Provider):
         return get_engine()
 
     @provide(scope=Scope.REQUEST)
-    async def get_session(self, engine: AsyncEngine) -> AsyncIterable[AsyncSession]:
-        """Provide database session with auto-commit."""
-        session_factory = get_session_factory()
+    async def get_session(self, engine: AsyncEngine) -> AsyncGenerator[AsyncSession, BaseException | None]:
+        """Provide database session with auto-commit.
+
+        The connection is checked out on the first statement only, so a session
+        that ran nothing costs no round trip. Once a transaction is open, COMMIT
+        costs the same as the ROLLBACK closing it would send, so it is always
+        committed: writes the session cannot see (data-modifying CTEs, functions)
+        are never lost. Requests that raised are rolled back. Handlers flagged
+        ``read_only`` get an autocommit session without BEGIN/COMMIT round trips.
+        """
+        session_factory = get_session_factory(read_only=is_read_only())
         async with session_factory() as session:
-            try:
-                yield session
+            # Dishka sends the exception that closed the scope instead of throwing it
+            exception = yield session
+            if exception is None:
                 await session.commit()
-            except Exception:
+            else:
                 await session.rollback()
-                raise
+
+    @provide(scope=Scope.APP)
+    def get_user_cache(self) -> UserCache:
+        """Provide in-process user cache."""
+        return get_user_cache()
+
+    # Current user, added by CurrentUserMiddleware in a child (ACTION) scope
+    current_user = from_context(provides=UserSnapshotDTO, scope=Scope.ACTION)
 
     @provide(scope=Scope.REQUEST)
-    def get_uow(self, session: AsyncSession) -> UnitOfWork:
+    def get_uow(self, session: AsyncSession, user_cache: UserCache) -> UnitOfWork:
         """Provide Unit of Work."""
-        return UnitOfWork(session)
+        return UnitOfWork(session, user_cache=user_cache)
 
 
 class ServiceProvider(Provider):
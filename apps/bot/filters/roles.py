@@ -0,0 +1,42 @@
+"""Role-based access filters."""
+from aiogram.filters import BaseFilter
+from aiogram.types import TelegramObject, User
+
+from infrastructure.database.role_index import get_role_index
+from shared.enums import UserRole
+
+
+class HasRoleFilter(BaseFilter):
+    """Filter that passes for users with ``role`` or a higher one.
+
+    Roles come from the in-process ``RoleIndex``, so a check is two dict
+    lookups and no database query. Works for any update with a sender.
+    """
+
+    def __init__(self, role: UserRole):
+        self.role = role
+
+    async def __call__(self, event: TelegramObject, event_from_user: User | None = None) -> bool:
+        """Check user's role."""
+        return event_from_user is not None and get_role_index().has_role(event_from_user.id, self.role)
+
+
+class IsAdminFilter(HasRoleFilter):
+    """Filter that passes only for admins: ``BOT__ADMIN_IDS`` and users with the admin role."""
+
+    def __init__(self) -> None:
+        super().__init__(UserRole.ADMIN)
+
+
+class IsModeratorFilter(HasRoleFilter):
+    """Filter that passes for moderators and admins."""
+
+    def __init__(self) -> None:
+        super().__init__(UserRole.MODERATOR)
+
+
+class IsPremiumFilter(HasRoleFilter):
+    """Filter that passes for premium users, moderators and admins."""
+
+    def __init__(self) -> None:
+        super().__init__(UserRole.PREMIUM)
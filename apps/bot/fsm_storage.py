@@ -0,0 +1,309 @@
+"""Postgres-backed FSM storage with an in-process cache."""
+import asyncio
+import json
+import math
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+from asyncpg import Connection
+from sqlalchemy.engine.interfaces import PoolProxiedConnection
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from infrastructure.database.repositories.fsm_state_repository import FsmRecord, FsmStateRepository
+from infrastructure.monitoring.logging import get_logger
+
+logger = get_logger(__name__)
+
+# NOTIFY channel carrying "<instance token> <key>" of every written or deleted record
+CHANNEL = "fsm_states"
+
+_RECONNECT_DELAY = 5.0
+_EMPTY: FsmRecord = (None, {})
+
+
+@dataclass
+class FsmStorageStats:
+    """FSM storage counters."""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    coalesced: int = 0
+    flushes: int = 0
+    flushed_keys: int = 0
+    failed_flushes: int = 0
+    invalidations: int = 0
+    expired: int = 0
+
+
+class PostgresStorage(BaseStorage):
+    """FSM storage in the ``fsm_states`` table, shared by all bot instances.
+
+    Reads are served from an LRU cache of at most ``cache_size`` records, each
+    valid for ``cache_ttl`` seconds. Keys without a record stay cached until
+    evicted: the FSM middleware reads the state of every update, including the
+    ones throttling then drops, and most of them have none. Writes go through the cache to the
+    database before ``set_state``/``set_data`` return, which raise if the write
+    fails (it stays pending and is retried by the next one). Every write sends
+    a NOTIFY that evicts the key from other instances' caches. The cache is
+    used only while this instance is listening, so a lost listener connection
+    means reads from the database, not stale states.
+
+    With ``flush_interval`` > 0 (write-behind) writes are instead coalesced per
+    key for that many seconds, so rapid transitions cost a single upsert, and
+    other instances see a write after at most ``flush_interval`` seconds; a
+    crash loses the writes not flushed yet. Records not written for
+    ``state_ttl`` seconds are deleted every ``cleanup_interval`` seconds. Data
+    must be JSON-serializable.
+    """
+
+    def __init__(
+        self,
+        engine: AsyncEngine,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        cache_size: int,
+        cache_ttl: float,
+        flush_interval: float,
+        state_ttl: int,
+        cleanup_interval: float,
+        key_builder: KeyBuilder | None = None,
+    ):
+        self.engine = engine
+        self.session_factory = session_factory
+        self.cache_size = cache_size
+        self.cache_ttl = cache_ttl
+        self.flush_interval = flush_interval
+        self.state_ttl = state_ttl
+        self.cleanup_interval = cleanup_interval
+        self.key_builder = key_builder or DefaultKeyBuilder(
+            with_bot_id=True, with_business_connection_id=True, with_destiny=True
+        )
+        self.stats = FsmStorageStats()
+        # key -> (expires_at, record)
+        self._cache: OrderedDict[str, tuple[float, FsmRecord]] = OrderedDict()
+        # key -> record not yet written
+        self._pending: dict[str, FsmRecord] = {}
+        # Bumped on every eviction, so a read racing with one is not cached
+        self._generation = 0
+        self._token = uuid.uuid4().hex
+        self._listening = False
+        self._closed = False
+        self._wakeup = asyncio.Event()
+        self._tasks: list[asyncio.Task[None]] = []
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        """Set state of a key."""
+        storage_key = self.key_builder.build(key)
+        _, data = await self._get(storage_key)
+        await self._set(storage_key, state.state if isinstance(state, State) else state, data)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        """Get state of a key."""
+        state, _ = await self._get(self.key_builder.build(key))
+        return state
+
+    async def set_data(self, key: StorageKey, data: dict[str, Any]) -> None:
+        """Replace data of a key."""
+        # Serialized now, so a bad value fails the handler instead of a later flush
+        data = json.loads(json.dumps(data))
+        storage_key = self.key_builder.build(key)
+        state, _ = await self._get(storage_key)
+        await self._set(storage_key, state, data)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        """Get a copy of data of a key."""
+        _, data = await self._get(self.key_builder.build(key))
+        return data.copy()
+
+    async def _get(self, key: str) -> FsmRecord:
+        """Get record from pending writes, cache or database."""
+        record = self._pending.get(key)
+        if record is not None:
+            return record
+
+        if self._listening:
+            entry = self._cache.get(key)
+            if entry is not None and entry[0] >= time.monotonic():
+                self._cache.move_to_end(key)
+                self.stats.hits += 1
+                return entry[1]
+
+        self.stats.misses += 1
+        generation = self._generation
+        async with self.session_factory() as session:
+            record = await FsmStateRepository(session).get(key) or _EMPTY
+
+        if generation == self._generation and key not in self._pending:
+            self._cache_set(key, record)
+        return record
+
+    async def _set(self, key: str, state: str | None, data: dict[str, Any]) -> None:
+        """Queue a write and update the cache."""
+        if key in self._pending:
+            self.stats.coalesced += 1
+        self._pending[key] = (state, data)
+        self._cache_set(key, (state, data))
+        self.stats.writes += 1
+
+        if self._closed or not self.flush_interval or not self._tasks:
+            # No flush task retries a failed write-through: the caller must see it
+            await self.flush(raise_errors=True)
+        else:
+            self._wakeup.set()
+
+    def _cache_set(self, key: str, record: FsmRecord) -> None:
+        if not self.cache_size:
+            return
+        if key in self._cache:
+            self._cache.move_to_end(key)
+        elif len(self._cache) >= self.cache_size:
+            self._cache.popitem(last=False)
+        # Evictions on write keep an empty record valid, however old
+        expires_at = math.inf if record[0] is None and not record[1] else time.monotonic() + self.cache_ttl
+        self._cache[key] = (expires_at, record)
+
+    def _evict(self, key: str) -> None:
+        self._generation += 1
+        self._cache.pop(key, None)
+
+    async def flush(self, raise_errors: bool = False) -> int:
+        """Write pending records. Returns number of written keys.
+
+        Records of a failed flush stay pending for the next one; the error is
+        logged, and raised with ``raise_errors``.
+        """
+        if not self._pending:
+            return 0
+
+        batch, self._pending = self._pending, {}
+        # Sorted so concurrent flushers lock rows in the same order
+        keys = sorted(batch)
+        try:
+            async with self.session_factory() as session:
+                repository = FsmStateRepository(session)
+                await repository.save_many(
+                    [(key, *batch[key]) for key in keys if batch[key][0] is not None or batch[key][1]]
+                )
+                # Cleared records are not kept
+                await repository.delete_many(
+                    [key for key in keys if batch[key][0] is None and not batch[key][1]]
+                )
+                await repository.notify(CHANNEL, [f"{self._token} {key}" for key in keys])
+                await session.commit()
+        except asyncio.CancelledError:
+            self._requeue(batch)
+            raise
+        except Exception as e:
+            self.stats.failed_flushes += 1
+            logger.error("FSM flush failed: keys=%s, error=%s (%s)", len(keys), e, type(e).__name__)
+            self._requeue(batch)
+            if raise_errors:
+                raise
+            return 0
+
+        self.stats.flushes += 1
+        self.stats.flushed_keys += len(keys)
+        return len(keys)
+
+    def _requeue(self, batch: dict[str, FsmRecord]) -> None:
+        # Writes queued meanwhile are newer
+        for key, record in batch.items():
+            self._pending.setdefault(key, record)
+
+    async def cleanup(self) -> int:
+        """Delete records not written for ``state_ttl`` seconds. Returns number of deleted records."""
+        deleted = 0
+        while True:
+            async with self.session_factory() as session:
+                repository = FsmStateRepository(session)
+                keys = await repository.delete_expired(self.state_ttl)
+                await repository.notify(CHANNEL, [f"{self._token} {key}" for key in keys])
+                await session.commit()
+            for key in keys:
+                self._evict(key)
+            deleted += len(keys)
+            if not keys:
+                break
+
+        if deleted:
+            self.stats.expired += deleted
+            logger.info("Deleted %d abandoned FSM records", deleted)
+        return deleted
+
+    def _on_notify(self, connection: Connection, pid: int, channel: str, payload: str) -> None:
+        token, _, key = payload.partition(" ")
+        if token != self._token:
+            # Evicts even uncached keys: a read of this key may be in flight
+            self._evict(key)
+            self.stats.invalidations += 1
+
+    async def _listen(self) -> None:
+        """Keep a LISTEN connection open; trust the cache only while it is."""
+        while not self._closed:
+            raw: PoolProxiedConnection | None = None
+            try:
+                raw = await self.engine.raw_connection()
+                connection: Connection = raw.driver_connection
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _, lost=lost: lost.set())
+                await connection.add_listener(CHANNEL, self._on_notify)
+                # Anything cached before may have missed notifications
+                self._generation += 1
+                self._cache.clear()
+                self._listening = True
+                await lost.wait()
+                logger.warning("FSM cache listener connection lost")
+            except Exception as e:
+                logger.error("FSM cache listener failed: %s (%s)", e, type(e).__name__)
+            finally:
+                self._listening = False
+                if raw is not None:
+                    # Never hand a LISTENing connection back to the pool
+                    raw.invalidate()
+            await asyncio.sleep(_RECONNECT_DELAY)
+
+    async def _flush_loop(self) -> None:
+        """Flush coalesced writes ``flush_interval`` seconds after the first one."""
+        while not self._closed:
+            await self._wakeup.wait()
+            await asyncio.sleep(self.flush_interval)
+            self._wakeup.clear()
+            await self.flush()
+
+    async def _cleanup_loop(self) -> None:
+        """Delete abandoned records periodically."""
+        while True:
+            try:
+                await self.cleanup()
+            except Exception as e:
+                logger.error("FSM cleanup failed: %s (%s)", e, type(e).__name__)
+            await asyncio.sleep(self.cleanup_interval)
+
+    def start(self) -> None:
+        """Start cache listener, write coalescing and cleanup."""
+        if self._tasks:
+            return
+        self._closed = False
+        self._tasks.append(asyncio.create_task(self._cleanup_loop(), name="fsm-cleanup"))
+        if self.cache_size:
+            self._tasks.append(asyncio.create_task(self._listen(), name="fsm-cache-listener"))
+        if self.flush_interval:
+            self._tasks.append(asyncio.create_task(self._flush_loop(), name="fsm-flush"))
+
+    async def close(self) -> None:
+        """Stop background tasks and write everything still pending.
+
+        Writes made after closing go straight to the database.
+        """
+        self._closed = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        await self.flush()
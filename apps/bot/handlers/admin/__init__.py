@@ -0,0 +1 @@
+"""Admin handlers module."""
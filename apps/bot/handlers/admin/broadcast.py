@@ -0,0 +1,71 @@
+"""Broadcast admin commands."""
+from aiogram import Router
+from aiogram.filters import Command, CommandObject
+from aiogram.types import Message
+
+from apps.bot.filters.roles import IsAdminFilter
+from apps.bot.locales import Translator
+from apps.bot.middlewares.current_user_middleware import user_agnostic
+from apps.bot.services.broadcaster import Broadcaster
+from infrastructure.monitoring.logging import get_logger
+
+logger = get_logger(__name__)
+router = user_agnostic(Router(name="admin_broadcast"))
+router.message.filter(IsAdminFilter())
+
+
+@router.message(Command("broadcast"))
+async def cmd_broadcast(
+    message: Message, command: CommandObject, broadcaster: Broadcaster, i18n: Translator
+) -> None:
+    """Handle /broadcast <text> command."""
+    if not command.args:
+        await message.answer(i18n("broadcast.usage"))
+        return
+
+    broadcast = await broadcaster.create(command.args, created_by=message.from_user.id)
+    await message.answer(i18n("broadcast.started", id=broadcast.id))
+    logger.info("broadcast created: id=%s, admin_id=%s", broadcast.id, message.from_user.id)
+
+
+@router.message(Command("broadcast_status"))
+async def cmd_broadcast_status(
+    message: Message, command: CommandObject, broadcaster: Broadcaster, i18n: Translator
+) -> None:
+    """Handle /broadcast_status <id> command."""
+    if not command.args or not command.args.isdigit():
+        await message.answer(i18n("broadcast.status_usage"))
+        return
+
+    progress = broadcaster.progress.get(int(command.args))
+    if progress is None:
+        await message.answer(i18n("broadcast.not_running", id=command.args))
+        return
+
+    eta = i18n("broadcast.eta", seconds=int(progress.eta)) if progress.eta is not None else i18n("common.none")
+    await message.answer(
+        i18n(
+            "broadcast.status",
+            id=progress.broadcast_id,
+            processed=progress.processed,
+            total=progress.total,
+            sent=progress.sent,
+            failed=progress.failed,
+            blocked=progress.blocked,
+            rate=progress.rate,
+            eta=eta,
+        )
+    )
+
+
+@router.message(Command("broadcast_cancel"))
+async def cmd_broadcast_cancel(
+    message: Message, command: CommandObject, broadcaster: Broadcaster, i18n: Translator
+) -> None:
+    """Handle /broadcast_cancel <id> command."""
+    if not command.args or not command.args.isdigit():
+        await message.answer(i18n("broadcast.cancel_usage"))
+        return
+
+    await broadcaster.cancel(int(command.args))
+    await message.answer(i18n("broadcast.cancelled", id=command.args))
@@ -0,0 +1,48 @@
+"""User statistics admin command."""
+from aiogram import Router
+from aiogram.filters import Command
+from aiogram.types import Message
+from dishka import FromDishka
+
+from apps.bot.filters.roles import IsAdminFilter
+from apps.bot.locales import Translator
+from apps.bot.middlewares.current_user_middleware import user_agnostic
+from apps.bot.services.user_service import UserService
+from shared.utils.formatters import SafeText
+
+router = user_agnostic(Router(name="admin_stats"))
+router.message.filter(IsAdminFilter())
+
+
+STATS_DAYS = 7
+
+
+def _format_counts(counts: dict[str, int], i18n: Translator) -> str:
+    return ", ".join(
+        f"{key}: {value}" for key, value in sorted(counts.items(), key=lambda item: -item[1])
+    ) or i18n("common.none")
+
+
+@router.message(Command("stats"), flags={"read_only": True})
+async def cmd_stats(message: Message, i18n: Translator, user_service: FromDishka[UserService]) -> None:
+    """Handle /stats command."""
+    stats = await user_service.get_stats(days=STATS_DAYS)
+
+    days = sorted(stats.new_by_day.keys() | stats.active_by_day.keys(), reverse=True)
+    daily = SafeText(
+        "\n".join(
+            i18n("stats.day", day=day, new=stats.new_by_day.get(day, 0), active=stats.active_by_day.get(day, 0))
+            for day in days
+        )
+    )
+    await message.answer(
+        i18n(
+            "stats.summary",
+            total=stats.total,
+            by_status=_format_counts(stats.by_status, i18n),
+            by_role=_format_counts(stats.by_role, i18n),
+            by_language=_format_counts(stats.by_language, i18n),
+            days=STATS_DAYS,
+            daily=daily or i18n("common.none"),
+        )
+    )
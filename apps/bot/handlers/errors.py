@@ -2,6 +2,7 @@
 from aiogram import Router
 from aiogram.types import ErrorEvent
 
+from apps.bot.locales import Translator, get_i18n
 from infrastructure.monitoring.logging import get_logger
 
 logger = get_logger(__name__)
@@ -9,8 +10,8 @@ router = Router(name="errors")
 
 
 @router.error()
-async def error_handler(event: ErrorEvent) -> None:
+async def error_handler(event: ErrorEvent, i18n: Translator | None = None) -> None:
     """Handle unhandled errors in bot handlers."""
     logger.error("Unhandled error: %s", event.exception, exc_info=event.exception)
     if event.update.message:
-        await event.update.message.answer("Произошла ошибка. Попробуйте позже.")
+        await event.update.message.answer((i18n or get_i18n().default)("errors.unexpected"))
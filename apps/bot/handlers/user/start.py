@@ -2,10 +2,10 @@
 from aiogram import Router
 from aiogram.filters import CommandStart
 from aiogram.types import Message
-from dishka import FromDishka
 
-from apps.bot.services.user_service import UserService
+from apps.bot.locales import Translator
 from infrastructure.monitoring.logging import get_logger
+from shared.dto.user import UserSnapshotDTO
 
 logger = get_logger(__name__)
 router = Router(name="start")
@@ -14,17 +14,11 @@ router = Router(name="start")
 @router.message(CommandStart())
 async def cmd_start(
     message: Message,
-    user_service: FromDishka[UserService],
+    i18n: Translator,
+    user: UserSnapshotDTO,
 ) -> None:
-    """Handle /start command."""
-    user = await user_service.register_or_update(message.from_user)
-
-    text = (
-        f"<b>Привет, {user.first_name}!</b>\n\n"
-        f"Добро пожаловать в бот."
-    )
-
-    await message.answer(text)
+    """Handle /start command. The user is registered by ``CurrentUserMiddleware``."""
+    await message.answer(i18n("start.greeting", name=user.first_name))
 
     logger.info(
         "start command: user_id=%s, telegram_id=%s, username=%s",
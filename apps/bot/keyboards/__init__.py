@@ -0,0 +1,12 @@
+"""Keyboards: factories registered with ``@keyboard`` and served by ``KeyboardRegistry``."""
+from apps.bot.keyboards.common import get_main_menu_keyboard
+from apps.bot.keyboards.registry import KeyboardRegistry, get_keyboards, keyboard
+
+# === IMPORT NEW KEYBOARD MODULES ABOVE ===
+
+__all__ = [
+    "KeyboardRegistry",
+    "get_keyboards",
+    "keyboard",
+    "get_main_menu_keyboard",
+]
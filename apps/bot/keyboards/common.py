@@ -2,11 +2,20 @@
 from aiogram.types import InlineKeyboardMarkup
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 
+from apps.bot.keyboards.registry import get_keyboards, keyboard
+from apps.bot.locales import Translator
 
-def get_main_menu_keyboard() -> InlineKeyboardMarkup:
+
+@keyboard("main_menu")
+def build_main_menu_keyboard(i18n: Translator) -> InlineKeyboardMarkup:
     """Build main menu inline keyboard."""
     builder = InlineKeyboardBuilder()
-    builder.button(text="Профиль", callback_data="profile")
-    builder.button(text="Помощь", callback_data="help")
+    builder.button(text=i18n("keyboards.main_menu.profile"), callback_data="profile")
+    builder.button(text=i18n("keyboards.main_menu.help"), callback_data="help")
     builder.adjust(2)
     return builder.as_markup()
+
+
+def get_main_menu_keyboard(i18n: Translator) -> InlineKeyboardMarkup:
+    """Get shared main menu keyboard."""
+    return get_keyboards().get("main_menu", i18n)
@@ -0,0 +1,133 @@
+"""Registry of keyboards built once per locale and shared between replies."""
+import inspect
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup
+from pydantic import ConfigDict
+
+from apps.bot.locales import I18n, Translator, get_i18n
+from config.settings.base import get_settings
+
+# factory(i18n, *params) -> markup
+KeyboardFactory = Callable[..., InlineKeyboardMarkup]
+
+_factories: dict[str, KeyboardFactory] = {}
+
+
+class FrozenInlineKeyboardButton(InlineKeyboardButton):
+    """Button that rejects attribute assignment."""
+
+    model_config = ConfigDict(frozen=True)
+
+
+class FrozenInlineKeyboardMarkup(InlineKeyboardMarkup):
+    """Markup that rejects attribute assignment; serialized like its base class."""
+
+    model_config = ConfigDict(frozen=True)
+
+
+def freeze(markup: InlineKeyboardMarkup) -> FrozenInlineKeyboardMarkup:
+    """Copy markup into frozen models."""
+    return FrozenInlineKeyboardMarkup(
+        inline_keyboard=[
+            [FrozenInlineKeyboardButton(**button.model_dump(exclude_unset=True)) for button in row]
+            for row in markup.inline_keyboard
+        ]
+    )
+
+
+def keyboard(name: str) -> Callable[[KeyboardFactory], KeyboardFactory]:
+    """Register a keyboard factory under ``name``.
+
+    The factory receives the locale's ``Translator`` and any hashable params and
+    must depend on nothing else: its result is cached and shared.
+    """
+
+    def decorator(factory: KeyboardFactory) -> KeyboardFactory:
+        if name in _factories:
+            raise ValueError(f"Keyboard {name!r} is already registered")
+        _factories[name] = factory
+        return factory
+
+    return decorator
+
+
+@dataclass
+class KeyboardCacheStats:
+    """Keyboard registry counters."""
+
+    builds: int = 0
+    hits: int = 0
+    evictions: int = 0
+
+
+class KeyboardRegistry:
+    """Hands out shared, immutable ``InlineKeyboardMarkup`` instances.
+
+    Keyboards without params are built once per locale and kept; with
+    ``warm()`` all of them are built at startup. Parameterized keyboards are
+    kept in an LRU of ``max_size`` entries keyed by (name, locale, params).
+
+    aiogram does not revalidate a model instance passed as ``reply_markup``, so
+    a reply costs neither a builder nor pydantic validation. Markups and
+    buttons are frozen; the row lists must not be mutated either.
+    """
+
+    def __init__(self, i18n: I18n, factories: dict[str, KeyboardFactory], max_size: int):
+        self.i18n = i18n
+        self.factories = factories
+        self.max_size = max_size
+        self.stats = KeyboardCacheStats()
+        self._static: dict[tuple[str, str], InlineKeyboardMarkup] = {}
+        self._lru: OrderedDict[tuple[str, str, tuple[Hashable, ...]], InlineKeyboardMarkup] = OrderedDict()
+
+    def get(self, name: str, i18n: Translator, *params: Hashable) -> InlineKeyboardMarkup:
+        """Get keyboard ``name`` in the locale of ``i18n``."""
+        if not params:
+            markup = self._static.get((name, i18n.locale))
+            if markup is None:
+                markup = self._static[name, i18n.locale] = self._build(name, i18n)
+            else:
+                self.stats.hits += 1
+            return markup
+
+        key = (name, i18n.locale, params)
+        markup = self._lru.get(key)
+        if markup is not None:
+            self._lru.move_to_end(key)
+            self.stats.hits += 1
+            return markup
+
+        markup = self._build(name, i18n, *params)
+        if len(self._lru) >= self.max_size:
+            self._lru.popitem(last=False)
+            self.stats.evictions += 1
+        self._lru[key] = markup
+        return markup
+
+    def _build(self, name: str, i18n: Translator, *params: Hashable) -> InlineKeyboardMarkup:
+        self.stats.builds += 1
+        return freeze(self.factories[name](i18n, *params))
+
+    def warm(self) -> None:
+        """Build every keyboard without params for every locale."""
+        for name, factory in self.factories.items():
+            if len(inspect.signature(factory).parameters) > 1:
+                continue
+            for locale in self.i18n.locales:
+                self.get(name, self.i18n.get(locale))
+
+
+_registry: KeyboardRegistry | None = None
+
+
+def get_keyboards() -> KeyboardRegistry:
+    """Get or create keyboard registry."""
+    global _registry
+
+    if _registry is None:
+        _registry = KeyboardRegistry(get_i18n(), _factories, max_size=get_settings().bot.keyboard_cache_size)
+
+    return _registry
@@ -0,0 +1,4 @@
+"""Localization: ``<locale>.toml`` catalogs compiled at startup."""
+from apps.bot.locales.i18n import I18n, Translator, get_i18n
+
+__all__ = ["I18n", "Translator", "get_i18n"]
@@ -0,0 +1,130 @@
+"""Localization catalogs compiled into render functions."""
+import tomllib
+from collections.abc import Collection, Mapping
+from pathlib import Path
+from typing import Any
+
+from config.settings.base import get_settings
+from infrastructure.monitoring.logging import get_logger
+from shared.enums import Language
+from shared.utils.formatters import RenderFunction, compile_template, escape_html
+
+logger = get_logger(__name__)
+
+LOCALES_DIR = Path(__file__).parent
+
+
+def _flatten(table: Mapping[str, Any], prefix: str = "") -> dict[str, str]:
+    """Flatten nested TOML tables into dotted keys."""
+    flat: dict[str, str] = {}
+    for name, value in table.items():
+        key = f"{prefix}{name}"
+        if isinstance(value, Mapping):
+            flat.update(_flatten(value, f"{key}."))
+        elif isinstance(value, str):
+            flat[key] = value
+        else:
+            raise ValueError(f"Message {key!r} must be a string, got {type(value).__name__}")
+    return flat
+
+
+class Translator:
+    """Renders messages of one locale: ``i18n("start.greeting", name=...)``.
+
+    Messages are HTML: values are escaped unless they are ``SafeText``, and
+    rendered messages are ``SafeText``, so they nest without double escaping.
+    """
+
+    __slots__ = ("locale", "_templates")
+
+    def __init__(self, locale: str, templates: dict[str, RenderFunction]):
+        self.locale = locale
+        self._templates = templates
+
+    def __call__(self, key: str, /, **values: Any) -> str:
+        """Render message ``key``. Raises KeyError for unknown keys."""
+        return self._templates[key](**values)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._templates
+
+    def __repr__(self) -> str:
+        return f"<Translator locale={self.locale}>"
+
+
+class I18n:
+    """All catalogs of ``<locale>.toml`` files, compiled once.
+
+    Keys missing from a locale fall back to the default locale at load time,
+    so rendering is one dict lookup and one call. A translation that uses a
+    placeholder the default message does not have fails loading, and so does
+    a catalog whose locale is not in ``supported`` (e.g. the ``Language`` enum
+    stored with users), since ``match`` may return any loaded locale.
+    """
+
+    def __init__(self, path: Path, default_locale: str, supported: Collection[str] | None = None):
+        catalogs = {file.stem: _flatten(tomllib.loads(file.read_text("utf-8"))) for file in sorted(path.glob("*.toml"))}
+        if default_locale not in catalogs:
+            raise ValueError(f"No catalog for default locale {default_locale!r} in {path}")
+        if supported is not None:
+            unsupported = catalogs.keys() - set(supported)
+            if unsupported:
+                raise ValueError(f"Catalogs for unsupported locales {sorted(unsupported)} in {path}")
+
+        default = {key: compile_template(text, key, escape_html) for key, text in catalogs[default_locale].items()}
+        self._translators: dict[str, Translator] = {}
+        for locale, messages in catalogs.items():
+            templates = {key: template for key, (template, _) in default.items()}
+            for key, text in messages.items():
+                if key not in default:
+                    logger.warning("Locale %s: message %s is not in the default locale, ignored", locale, key)
+                    continue
+                template, fields = compile_template(text, f"{locale}:{key}", escape_html)
+                extra = fields - default[key][1]
+                if extra:
+                    raise ValueError(f"Locale {locale}: message {key!r} uses unknown placeholders {sorted(extra)}")
+                templates[key] = template
+
+            missing = default.keys() - messages.keys()
+            if missing:
+                logger.warning("Locale %s: %d messages fall back to %s", locale, len(missing), default_locale)
+            self._translators[locale] = Translator(locale, templates)
+
+        self.default = self._translators[default_locale]
+        # language_code -> locale; Telegram sends a small set of IETF tags
+        self._matches: dict[str | None, str] = {}
+
+    @property
+    def locales(self) -> frozenset[str]:
+        """Available locales."""
+        return frozenset(self._translators)
+
+    def match(self, language_code: str | None) -> str:
+        """Map a Telegram ``language_code`` (e.g. ``pt-br``) to an available locale."""
+        locale = self._matches.get(language_code)
+        if locale is None:
+            base = (language_code or "").split("-", 1)[0].lower()
+            locale = base if base in self._translators else self.default.locale
+            self._matches[language_code] = locale
+        return locale
+
+    def get(self, locale: str | None) -> Translator:
+        """Get translator of ``locale``, or of the default locale."""
+        return self._translators.get(locale, self.default) if locale else self.default
+
+
+_i18n: I18n | None = None
+
+
+def get_i18n() -> I18n:
+    """Get or load localization catalogs."""
+    global _i18n
+
+    if _i18n is None:
+        _i18n = I18n(
+            LOCALES_DIR,
+            default_locale=get_settings().bot.default_language,
+            supported=[language.value for language in Language],
+        )
+
+    return _i18n
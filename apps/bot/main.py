@@ -3,14 +3,48 @@ import asyncio
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
 from aiogram.enums import ParseMode
+from dishka import AsyncContainer
 from dishka.integrations.aiogram import setup_dishka
 
+from apps.bot.api_limiter import ApiRateLimiter
 from apps.bot.di_container import create_container
+from apps.bot.fsm_storage import PostgresStorage
+from apps.bot.keyboards import get_keyboards
+from apps.bot.locales import get_i18n
+from apps.bot.middlewares.activity_middleware import ActivityMiddleware
+from apps.bot.middlewares.current_user_middleware import USER_AGNOSTIC_UPDATES, CurrentUserMiddleware
+from apps.bot.middlewares.i18n_middleware import I18nMiddleware
 from apps.bot.middlewares.logging_middleware import LoggingMiddleware
+from apps.bot.middlewares.metrics_middleware import ApiMetricsMiddleware, MetricsMiddleware
+from apps.bot.middlewares.query_budget_middleware import QueryBudgetMiddleware
+from apps.bot.middlewares.read_only_middleware import ReadOnlyMiddleware
+from apps.bot.middlewares.throttling_middleware import ThrottlingMiddleware
+from apps.bot.scheduler import ScheduledDispatcher
+from apps.bot.services.broadcaster import Broadcaster
+from apps.bot.webhook import run_webhook
 from config.settings.base import get_settings
-from infrastructure.database.core.session import close_engine
+from infrastructure.database.activity import close_activity_buffer, get_activity_buffer
+from infrastructure.database.core.session import (
+    close_engine,
+    get_engine,
+    get_read_only_engine,
+    get_replica_router,
+    get_session_factory,
+)
+from infrastructure.database.role_index import close_role_index, get_role_index
+from infrastructure.database.user_cache import get_user_cache
+from infrastructure.database.user_stats import close_user_stats_reconciler, get_user_stats_reconciler
 from infrastructure.monitoring.logging import setup_logging
+from infrastructure.monitoring.metrics import (
+    API_QUEUED,
+    SCHEDULER_ACTIVE_CHATS,
+    SCHEDULER_QUEUED,
+    instrument_engine,
+    start_metrics_server,
+)
 
 logger = setup_logging()
 
@@ -18,64 +52,200 @@ logger = setup_logging()
 def register_routers(dp: Dispatcher) -> None:
     """Register all routers."""
     from apps.bot.handlers import errors
+    from apps.bot.handlers.admin import broadcast, stats
     from apps.bot.handlers.user import start
 
     dp.include_router(start.router)
+    dp.include_router(broadcast.router)
+    dp.include_router(stats.router)
     dp.include_router(errors.router)
     # === REGISTER NEW ROUTERS ABOVE ===
 
 
 def register_middlewares(dp: Dispatcher) -> None:
     """Register middlewares."""
+    settings = get_settings()
+
+    # Outermost: every session of the update, the user lookup included, is attributed to the sender
+    read_only_middleware = ReadOnlyMiddleware()
+    dp.update.outer_middleware(read_only_middleware)
+
+    if settings.metrics.enabled:
+        metrics_middleware = MetricsMiddleware()
+        dp.update.outer_middleware(metrics_middleware)
+        for name, observer in dp.observers.items():
+            if name not in ("update", "error"):
+                observer.middleware(metrics_middleware)
+
+    query_budget_middleware = QueryBudgetMiddleware(
+        budget=settings.database.query_budget,
+        strict=settings.debug or settings.database.query_budget_strict,
+    )
+    dp.update.outer_middleware(query_budget_middleware)
+    for name, observer in dp.observers.items():
+        if name not in ("update", "error"):
+            observer.middleware(query_budget_middleware)
+
+    # Outer, so error handlers and the throttling notice get the user's locale
+    dp.update.outer_middleware(I18nMiddleware(get_i18n(), get_user_cache()))
+
+    # Outer: runs before the DI container, so flood costs no session
+    throttling_middleware = ThrottlingMiddleware(
+        rate=settings.bot.throttling_rate,
+        burst=settings.bot.throttling_burst,
+        notify_interval=settings.bot.throttling_notify_interval,
+    )
+    dp.update.outer_middleware(throttling_middleware)
+    dp.message.middleware(throttling_middleware)
+    dp.callback_query.middleware(throttling_middleware)
+
     dp.message.middleware(LoggingMiddleware())
     dp.callback_query.middleware(LoggingMiddleware())
 
+    activity_middleware = ActivityMiddleware(get_activity_buffer())
+    dp.message.middleware(activity_middleware)
+    dp.callback_query.middleware(activity_middleware)
+
+    # Inner: runs after routing, so agnostic handlers and routers load no user
+    current_user_middleware = CurrentUserMiddleware(get_session_factory(), get_user_cache())
+    for name, observer in dp.observers.items():
+        if name not in ("update", "error") and name not in USER_AGNOSTIC_UPDATES:
+            observer.middleware(current_user_middleware)
 
-async def on_startup(bot: Bot) -> None:
+    dp.message.middleware(read_only_middleware)
+    dp.callback_query.middleware(read_only_middleware)
+
+
+async def on_startup(bot: Bot, broadcaster: Broadcaster, fsm_storage: PostgresStorage) -> None:
     """Actions on bot startup."""
     settings = get_settings()
     bot_info = await bot.get_me()
+    fsm_storage.start()
+    role_index = get_role_index()
+    await role_index.refresh()
+    role_index.start()
+    get_keyboards().warm()
+    get_activity_buffer().start()
+    get_user_stats_reconciler().start()
+    replica_router = get_replica_router()
+    if replica_router is not None:
+        replica_router.start()
+    broadcaster.start_resuming()
     logger.info("Bot starting (environment=%s, username=%s)", settings.environment, bot_info.username)
 
 
-async def on_shutdown(bot: Bot) -> None:
+async def on_shutdown(bot: Bot, broadcaster: Broadcaster) -> None:
     """Actions on bot shutdown."""
     logger.info("Bot shutting down...")
+    await broadcaster.close()
+    await close_activity_buffer()
+    await close_user_stats_reconciler()
+    await close_role_index()
     await close_engine()
     logger.info("Bot stopped")
 
 
-async def main() -> None:
-    """Main bot function."""
+def create_dispatcher(bot: Bot) -> tuple[ScheduledDispatcher, AsyncContainer]:
+    """Build dispatcher with routers, middlewares, DI container and lifecycle hooks."""
     settings = get_settings()
 
-    bot = Bot(
-        token=settings.bot.token.get_secret_value(),
-        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+    # Closed by the dispatcher's own shutdown handler
+    fsm_storage = PostgresStorage(
+        get_engine(),
+        get_session_factory(),
+        cache_size=settings.database.fsm_cache_size,
+        cache_ttl=settings.database.fsm_cache_ttl,
+        flush_interval=settings.database.fsm_flush_interval_ms / 1000,
+        state_ttl=settings.database.fsm_state_ttl,
+        cleanup_interval=settings.database.fsm_cleanup_interval,
+    )
+    dp = ScheduledDispatcher(
+        storage=fsm_storage,
+        max_concurrent_updates=settings.bot.max_concurrent_updates,
+        max_chat_queue_size=settings.bot.max_chat_queue_size,
+    )
+    dp["fsm_storage"] = fsm_storage
+    dp["broadcaster"] = Broadcaster(
+        bot,
+        get_session_factory(),
+        concurrency=settings.bot.broadcast_concurrency,
+        chunk_size=settings.bot.broadcast_chunk_size,
+        lease=settings.bot.broadcast_lease,
     )
 
-    dp = Dispatcher()
+    # Middlewares first: outer ones must run before Dishka's container middleware
+    register_middlewares(dp)
 
     container = create_container()
     setup_dishka(container=container, router=dp, auto_inject=True)
 
     register_routers(dp)
-    register_middlewares(dp)
 
     dp.startup.register(on_startup)
     dp.shutdown.register(on_shutdown)
 
-    logger.info("Starting polling...")
+    return dp, container
 
-    try:
-        await dp.start_polling(
-            bot,
-            allowed_updates=dp.resolve_used_update_types(),
-            drop_pending_updates=settings.bot.drop_pending_updates,
+
+async def main() -> None:
+    """Main bot function."""
+    settings = get_settings()
+
+    session = None
+    if settings.bot.api_base_url:
+        session = AiohttpSession(api=TelegramAPIServer.from_base(settings.bot.api_base_url))
+
+    bot = Bot(
+        token=settings.bot.token.get_secret_value(),
+        session=session,
+        default=DefaultBotProperties(parse_mode=ParseMode.HTML),
+    )
+    if settings.bot.api_rate_limit:
+        api_limiter = ApiRateLimiter(
+            global_rate=settings.bot.api_global_rate,
+            chat_rate=settings.bot.api_chat_rate,
+            group_rate=settings.bot.api_group_rate,
+            chat_burst=settings.bot.api_chat_burst,
+            max_retries=settings.bot.api_max_retries,
+            retry_backoff=settings.bot.api_retry_backoff,
+            bulk_rate=settings.bot.broadcast_rate,
         )
+        bot.session.middleware(api_limiter)
+        API_QUEUED.set_function(lambda: api_limiter.stats.queued)
+    if settings.metrics.enabled:
+        # Registered after the limiter, so only the request itself is timed
+        bot.session.middleware(ApiMetricsMiddleware())
+
+    dp, container = create_dispatcher(bot)
+
+    metrics_runner = None
+    if settings.metrics.enabled:
+        instrument_engine(get_engine(), "primary")
+        instrument_engine(get_read_only_engine(), "read_only")
+        replica_router = get_replica_router()
+        for replica in replica_router.replicas if replica_router is not None else ():
+            instrument_engine(replica.engine, replica.name)
+        SCHEDULER_QUEUED.set_function(lambda: dp.scheduler.stats.queued)
+        SCHEDULER_ACTIVE_CHATS.set_function(lambda: dp.scheduler.stats.active_chats)
+        metrics_runner = await start_metrics_server(settings.metrics.host, settings.metrics.port)
+
+    try:
+        if settings.bot.mode == "webhook":
+            logger.info("Starting webhook...")
+            await run_webhook(dp, bot, settings.bot)
+        else:
+            logger.info("Starting polling...")
+            await dp.start_polling(
+                bot,
+                allowed_updates=dp.resolve_used_update_types(),
+                drop_pending_updates=settings.bot.drop_pending_updates,
+                handle_as_tasks=False,
+            )
     finally:
         await bot.session.close()
         await container.close()
+        if metrics_runner is not None:
+            await metrics_runner.cleanup()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,27 @@
+"""Activity tracking middleware."""
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import Message, TelegramObject
+
+from infrastructure.database.activity import ActivityBuffer
+
+
+class ActivityMiddleware(BaseMiddleware):
+    """Middleware that records user activity into the write-behind buffer."""
+
+    def __init__(self, buffer: ActivityBuffer):
+        self.buffer = buffer
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        """Record activity and pass event on."""
+        from_user = getattr(event, "from_user", None)
+        if from_user is not None:
+            self.buffer.record(from_user.id, messages=1 if isinstance(event, Message) else 0)
+        return await handler(event, data)
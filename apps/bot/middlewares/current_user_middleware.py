@@ -0,0 +1,121 @@
+"""Current user middleware."""
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware, Router
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import TelegramObject, User
+from dishka import AsyncContainer
+from dishka.integrations.aiogram import CONTAINER_NAME
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from apps.bot.locales import get_i18n
+from apps.bot.services.user_service import UserService
+from infrastructure.database.core.session import has_writes
+from infrastructure.database.uow import UnitOfWork
+from infrastructure.database.user_cache import UserCache
+from shared.dto.user import UserSnapshotDTO
+
+# Update types that carry no user to resolve, or one that must not be registered
+USER_AGNOSTIC_UPDATES = frozenset(
+    {
+        "poll",
+        "channel_post",
+        "edited_channel_post",
+        "chat_member",
+        "my_chat_member",
+        "message_reaction_count",
+        "chat_boost",
+        "removed_chat_boost",
+    }
+)
+
+_agnostic_routers: set[Router] = set()
+
+
+def user_agnostic(router: Router) -> Router:
+    """Mark router and its sub-routers as not needing the current user."""
+    _agnostic_routers.add(router)
+    return router
+
+
+class CurrentUserMiddleware(BaseMiddleware):
+    """Middleware that resolves the sender's user record once per update.
+
+    The ``UserSnapshotDTO`` comes from the user cache when the cached profile
+    matches the sender, otherwise from one ``get_or_create`` upsert that also
+    registers unseen users. Handlers get it as ``user`` or
+    ``FromDishka[UserSnapshotDTO]``.
+
+    Nothing is loaded for updates without a sender, handlers flagged
+    ``user_agnostic`` and routers marked with ``user_agnostic(router)``.
+    Register as an inner middleware (``observer.middleware``) on update types
+    not in ``USER_AGNOSTIC_UPDATES``: it runs after routing, so only matched
+    handlers cost a lookup.
+
+    Usage: ``async def handler(message: Message, user: UserSnapshotDTO)``
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], user_cache: UserCache):
+        self.session_factory = session_factory
+        self.user_cache = user_cache
+        self._agnostic: dict[Router, bool] = {}
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        """Resolve current user and pass it to the handler."""
+        telegram_user: User | None = data.get("event_from_user")
+        if (
+            telegram_user is None
+            or telegram_user.is_bot
+            or get_flag(data, "user_agnostic", default=False)
+            or self._is_agnostic(data.get("event_router"))
+        ):
+            return await handler(event, data)
+
+        user = await self.resolve(telegram_user)
+        data["user"] = user
+
+        container: AsyncContainer | None = data.get(CONTAINER_NAME)
+        if container is None:
+            return await handler(event, data)
+        # A child scope is the way to add context to a running Dishka container
+        async with container({UserSnapshotDTO: user}) as action_container:
+            data[CONTAINER_NAME] = action_container
+            return await handler(event, data)
+
+    def _is_agnostic(self, router: Router | None) -> bool:
+        if router is None:
+            return False
+        agnostic = self._agnostic.get(router)
+        if agnostic is None:
+            agnostic = self._agnostic[router] = any(r in _agnostic_routers for r in router.chain_head)
+        return agnostic
+
+    async def resolve(self, telegram_user: User) -> UserSnapshotDTO:
+        """Get user snapshot from the cache, or upsert the user."""
+        snapshot = self.user_cache.get(telegram_user.id)
+        if snapshot is not None and _same_profile(snapshot, telegram_user):
+            return snapshot
+
+        async with self.session_factory() as session:
+            user = await UserService(UnitOfWork(session, user_cache=self.user_cache)).register_or_update(telegram_user)
+            snapshot = UserSnapshotDTO.model_validate(user)
+            if has_writes(session):
+                await session.commit()
+                self.user_cache.set(snapshot)
+        return snapshot
+
+
+def _same_profile(snapshot: UserSnapshotDTO, telegram_user: User) -> bool:
+    """Check that the upsert would change nothing."""
+    return (
+        snapshot.username == telegram_user.username
+        and snapshot.first_name == telegram_user.first_name
+        and snapshot.last_name == telegram_user.last_name
+        and snapshot.language.value == get_i18n().match(telegram_user.language_code)
+    )
@@ -0,0 +1,45 @@
+"""Localization middleware."""
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject, User
+
+from apps.bot.locales import I18n
+from infrastructure.database.user_cache import UserCache
+
+
+class I18nMiddleware(BaseMiddleware):
+    """Middleware that puts the user's ``Translator`` into handler data as ``i18n``.
+
+    The language comes from the cached user snapshot, or from Telegram's
+    ``language_code`` when the user is not cached, so resolving it never
+    queries the database. Register as ``dp.update.outer_middleware`` so error
+    handlers and the throttling notice are localized too.
+
+    Usage: ``async def handler(message: Message, i18n: Translator)``
+    """
+
+    def __init__(self, i18n: I18n, user_cache: UserCache):
+        self.i18n = i18n
+        self.user_cache = user_cache
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        """Resolve user's locale."""
+        user: User | None = data.get("event_from_user")
+        if user is None:
+            translator = self.i18n.default
+        else:
+            snapshot = self.user_cache.get(user.id)
+            if snapshot is not None:
+                translator = self.i18n.get(snapshot.language.value)
+            else:
+                translator = self.i18n.get(self.i18n.match(user.language_code))
+
+        data["i18n"] = translator
+        return await handler(event, data)
@@ -0,0 +1,84 @@
+"""Metrics middlewares for updates and outgoing Bot API calls."""
+import time
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any
+
+from aiogram import BaseMiddleware
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.methods import Response, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import TelegramObject, Update
+
+from infrastructure.monitoring.metrics import (
+    API_DURATION,
+    API_ERRORS_TOTAL,
+    HANDLER_DURATION,
+    UPDATE_ERRORS_TOTAL,
+    UPDATES_IN_FLIGHT,
+    UPDATES_TOTAL,
+)
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+_HANDLED_BY = "metrics_handled_by"
+
+
+class MetricsMiddleware(BaseMiddleware):
+    """Middleware that records update counts, errors and processing time.
+
+    Register one instance as ``dp.update.outer_middleware`` (times the whole
+    update) and as inner middleware on event observers, where it only notes
+    which router and handler took the update, so the latency histogram is
+    labelled per router and handler.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        """Measure update or label it with the handler that took it."""
+        if not isinstance(event, Update):
+            handled_by = data.get(_HANDLED_BY)
+            handler_object: HandlerObject | None = data.get("handler")
+            if handled_by is not None and handler_object is not None:
+                handled_by[0] = data["event_router"].name
+                handled_by[1] = handler_object.callback.__name__
+            return await handler(event, data)
+
+        # Shared by reference with the inner call, which fills it in
+        handled_by = data[_HANDLED_BY] = ["", "unhandled"]
+        UPDATES_TOTAL.inc(event.event_type)
+        UPDATES_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception as e:
+            UPDATE_ERRORS_TOTAL.inc(type(e).__name__)
+            raise
+        finally:
+            HANDLER_DURATION.observe(time.perf_counter() - started, *handled_by)
+            UPDATES_IN_FLIGHT.dec()
+
+
+class ApiMetricsMiddleware(BaseRequestMiddleware):
+    """Bot session middleware that records Telegram API call latency and errors."""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: "Bot",
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        name = type(method).__name__
+        started = time.perf_counter()
+        try:
+            return await make_request(bot, method)
+        except Exception as e:
+            API_ERRORS_TOTAL.inc(name, type(e).__name__)
+            raise
+        finally:
+            API_DURATION.observe(time.perf_counter() - started, name)
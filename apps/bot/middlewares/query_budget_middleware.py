@@ -0,0 +1,41 @@
+"""Per-update SQL query budget middleware."""
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import TelegramObject, Update
+
+from infrastructure.database.core.query_stats import get_query_stats, track_queries
+
+
+class QueryBudgetMiddleware(BaseMiddleware):
+    """Middleware that counts SQL queries per update and enforces a budget.
+
+    Register one instance as ``dp.update.outer_middleware`` (ties queries to
+    the update ID) and as inner middleware on event observers, where handlers
+    flagged ``query_budget`` override the default budget, e.g.
+    ``@router.message(Command("report"), flags={"query_budget": 100})``.
+    In strict mode an update over budget fails with ``QueryBudgetExceededError``.
+    """
+
+    def __init__(self, budget: int, strict: bool = False):
+        self.budget = budget
+        self.strict = strict
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        """Track queries of update, or apply handler budget override."""
+        if not isinstance(event, Update):
+            budget = get_flag(data, "query_budget")
+            stats = get_query_stats()
+            if budget is not None and stats is not None:
+                stats.budget = budget
+            return await handler(event, data)
+
+        with track_queries(event.update_id, self.budget, self.strict):
+            return await handler(event, data)
@@ -0,0 +1,45 @@
+"""Read-only session middleware."""
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import TelegramObject, Update, User
+
+from infrastructure.database.core.replicas import actor_context
+from infrastructure.database.core.session import read_only_context
+
+
+class ReadOnlyMiddleware(BaseMiddleware):
+    """Middleware that gives handlers flagged ``read_only`` a read-only DB session.
+
+    Read-only sessions may be served by a read replica. Register one instance
+    twice:
+
+    - ``dp.update.outer_middleware``, before every other middleware: sessions
+      opened while processing the update (including the user lookup) are
+      attributed to the sending user, so their reads go to the primary right
+      after their own writes.
+    - ``dp.message.middleware`` / ``dp.callback_query.middleware``: enables
+      read-only sessions for flagged handlers.
+
+    Usage: ``@router.message(Command("stats"), flags={"read_only": True})``
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        """Attribute sessions to the sender, or enable read-only sessions for flagged handlers."""
+        if isinstance(event, Update):
+            user: User | None = data.get("event_from_user")
+            with actor_context(user.id if user else None):
+                return await handler(event, data)
+
+        if not get_flag(data, "read_only", default=False):
+            return await handler(event, data)
+
+        with read_only_context():
+            return await handler(event, data)
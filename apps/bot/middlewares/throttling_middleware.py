@@ -0,0 +1,85 @@
+"""Anti-flood throttling middleware."""
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.dispatcher.flags import get_flag
+from aiogram.exceptions import TelegramAPIError
+from aiogram.types import CallbackQuery, Message, TelegramObject, Update, User
+
+from apps.bot.locales import Translator, get_i18n
+from infrastructure.monitoring.logging import get_logger
+from shared.utils.rate_limit import KeyedTokenBuckets
+
+logger = get_logger(__name__)
+
+
+class ThrottlingMiddleware(BaseMiddleware):
+    """Middleware that drops updates of users exceeding their rate.
+
+    Register one instance twice:
+
+    - ``dp.update.outer_middleware`` (before ``setup_dishka``): per-user limit
+      of ``rate`` updates per second with bursts of ``burst``. Overflowing
+      updates are dropped before the DI container is entered.
+    - ``dp.message.middleware`` / ``dp.callback_query.middleware``: per-handler
+      limit for handlers flagged ``throttling`` (updates per second per user),
+      e.g. ``@router.message(Command("report"), flags={"throttling": 0.2})``.
+
+    State is a token bucket per key in ``KeyedTokenBuckets`` (O(1) per check,
+    idle keys evicted). A dropped user is told to slow down at most once per
+    ``notify_interval`` seconds.
+    """
+
+    def __init__(self, rate: float, burst: float, notify_interval: float):
+        self.dropped = 0
+        self._users = KeyedTokenBuckets(rate, capacity=burst)
+        self._handlers: dict[float, KeyedTokenBuckets] = {}
+        self._notified = KeyedTokenBuckets(1 / notify_interval, capacity=1, idle_ttl=notify_interval)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        """Pass event on if user is within rate, drop it otherwise."""
+        user: User | None = data.get("event_from_user")
+        if user is None:
+            return await handler(event, data)
+
+        handler_object: HandlerObject | None = data.get("handler")
+        if handler_object is None:
+            allowed = self._users.try_acquire(user.id)
+        else:
+            rate = get_flag(data, "throttling")
+            if rate is None:
+                return await handler(event, data)
+            allowed = self._handler_buckets(rate).try_acquire((user.id, id(handler_object.callback)))
+
+        if allowed:
+            return await handler(event, data)
+
+        self.dropped += 1
+        logger.debug("Throttled update from user_id=%s", user.id)
+        if self._notified.try_acquire(user.id):
+            await self._notify(event, data.get("i18n") or get_i18n().default)
+        return None
+
+    def _handler_buckets(self, rate: float) -> KeyedTokenBuckets:
+        buckets = self._handlers.get(rate)
+        if buckets is None:
+            buckets = self._handlers[rate] = KeyedTokenBuckets(rate, capacity=1, idle_ttl=max(60.0, 1 / rate))
+        return buckets
+
+    @staticmethod
+    async def _notify(event: TelegramObject, i18n: Translator) -> None:
+        """Tell the user to slow down."""
+        if isinstance(event, Update):
+            event = event.event
+        try:
+            if isinstance(event, Message | CallbackQuery):
+                await event.answer(i18n("throttling.slow_down"))
+        except TelegramAPIError as e:
+            logger.debug("Failed to notify throttled user: %s", e)
@@ -0,0 +1,218 @@
+"""Per-chat ordered concurrent update scheduler."""
+import asyncio
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from aiogram import Bot, Dispatcher
+from aiogram.methods import TelegramMethod
+from aiogram.types import Update
+
+from infrastructure.monitoring.logging import get_logger
+
+logger = get_logger(__name__)
+
+_QueueItem = tuple[Bot, Update, dict[str, Any], float]
+
+
+@dataclass
+class SchedulerStats:
+    """Scheduler counters."""
+
+    submitted: int = 0
+    processed: int = 0
+    rejected: int = 0
+    waited: int = 0
+    failed: int = 0
+    queued: int = 0
+    in_flight: int = 0
+    active_chats: int = 0
+    max_chat_queue_depth: int = 0
+    wait_time_total: float = 0.0
+    wait_time_max: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert stats to dictionary."""
+        return asdict(self)
+
+
+def get_chat_key(update: Update) -> int | None:
+    """Resolve ordering key (chat ID, falling back to user ID) for update."""
+    try:
+        event = update.event
+    except Exception:
+        return None
+
+    chat = getattr(event, "chat", None)
+    if chat is not None:
+        return chat.id
+
+    # CallbackQuery carries the chat on the attached message
+    message = getattr(event, "message", None)
+    if message is not None:
+        return message.chat.id
+
+    user = getattr(event, "from_user", None) or getattr(event, "user", None)
+    if user is not None:
+        return user.id
+
+    return None
+
+
+class UpdateScheduler:
+    """Runs updates from different chats in parallel and from one chat in order.
+
+    Each chat gets a FIFO queue drained by a single worker task, so updates of
+    one chat never overlap. Workers share a global semaphore which bounds the
+    number of updates inside ``Dispatcher.feed_update`` at any moment.
+
+    ``put`` waits while the chat queue is full, pushing back on its caller
+    (the poller, or a webhook request); ``submit`` rejects such updates and
+    counts them.
+    """
+
+    def __init__(self, dispatcher: Dispatcher, max_concurrency: int, max_queue_per_chat: int):
+        self.dispatcher = dispatcher
+        self.max_queue_per_chat = max_queue_per_chat
+        self.stats = SchedulerStats()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._queues: dict[int, deque[_QueueItem]] = {}
+        # Set when a full chat queue gets room, see put()
+        self._room: dict[int, asyncio.Event] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._closed = False
+
+    def submit(self, bot: Bot, update: Update, **kwargs: Any) -> bool:
+        """Enqueue update for processing. Returns False if rejected."""
+        if self._closed:
+            self.stats.rejected += 1
+            return False
+
+        item = (bot, update, kwargs, asyncio.get_running_loop().time())
+        key = get_chat_key(update)
+        queue = self._queues.get(key) if key is not None else None
+
+        if queue is not None:
+            if len(queue) >= self.max_queue_per_chat:
+                self.stats.rejected += 1
+                logger.warning("Update rejected: chat_key=%s, queue_depth=%s", key, len(queue))
+                return False
+            queue.append(item)
+            self.stats.max_chat_queue_depth = max(self.stats.max_chat_queue_depth, len(queue))
+        else:
+            queue = deque((item,))
+            if key is not None:
+                self._queues[key] = queue
+                self.stats.active_chats = len(self._queues)
+            task = asyncio.create_task(self._drain(key, queue))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        self.stats.submitted += 1
+        self.stats.queued += 1
+        return True
+
+    async def put(self, bot: Bot, update: Update, **kwargs: Any) -> bool:
+        """Enqueue update, waiting while its chat queue is full. Returns False if closed."""
+        key = get_chat_key(update)
+        while key is not None and not self._closed:
+            queue = self._queues.get(key)
+            if queue is None or len(queue) < self.max_queue_per_chat:
+                break
+            room = self._room.get(key)
+            if room is None:
+                room = self._room[key] = asyncio.Event()
+            self.stats.waited += 1
+            await room.wait()
+        return self.submit(bot, update, **kwargs)
+
+    def _wake(self, key: int | None) -> None:
+        """Wake updates waiting for room in chat queue."""
+        if key is not None:
+            room = self._room.pop(key, None)
+            if room is not None:
+                room.set()
+
+    async def _drain(self, key: int | None, queue: deque[_QueueItem]) -> None:
+        """Process chat queue in order until it is empty."""
+        loop = asyncio.get_running_loop()
+        try:
+            while queue:
+                async with self._semaphore:
+                    bot, update, kwargs, enqueued_at = queue.popleft()
+                    self.stats.queued -= 1
+                    self._wake(key)
+
+                    wait_time = loop.time() - enqueued_at
+                    self.stats.wait_time_total += wait_time
+                    self.stats.wait_time_max = max(self.stats.wait_time_max, wait_time)
+
+                    self.stats.in_flight += 1
+                    try:
+                        await self._process(bot, update, kwargs)
+                    finally:
+                        self.stats.in_flight -= 1
+                        self.stats.processed += 1
+        finally:
+            if key is not None:
+                self._queues.pop(key, None)
+                self.stats.active_chats = len(self._queues)
+                self._wake(key)
+
+    async def _process(self, bot: Bot, update: Update, kwargs: dict[str, Any]) -> None:
+        """Feed single update to dispatcher."""
+        try:
+            response = await self.dispatcher.feed_update(bot, update, **kwargs)
+            if isinstance(response, TelegramMethod):
+                await self.dispatcher.silent_call_request(bot=bot, result=response)
+        except Exception as e:
+            self.stats.failed += 1
+            logger.error(
+                "Update processing failed: update_id=%s, error=%s (%s)",
+                update.update_id,
+                e,
+                type(e).__name__,
+                exc_info=e,
+            )
+
+    async def close(self) -> None:
+        """Stop accepting updates and wait until all queues are drained."""
+        self._closed = True
+        for key in list(self._room):
+            self._wake(key)
+        while self._tasks:
+            logger.info("Draining %d queued updates...", self.stats.queued + self.stats.in_flight)
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+class ScheduledDispatcher(Dispatcher):
+    """Dispatcher that routes polled updates through an UpdateScheduler.
+
+    Poll with ``handle_as_tasks=False``: the poller then waits while a chat
+    queue is full, so getUpdates does not confirm updates that have no room.
+    """
+
+    def __init__(self, *, max_concurrent_updates: int, max_chat_queue_size: int, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.scheduler = UpdateScheduler(
+            self,
+            max_concurrency=max_concurrent_updates,
+            max_queue_per_chat=max_chat_queue_size,
+        )
+
+    async def emit_shutdown(self, *args: Any, **kwargs: Any) -> None:
+        """Drain queued updates, then run shutdown handlers (FSM storage close first)."""
+        await self.scheduler.close()
+        await super().emit_shutdown(*args, **kwargs)
+
+    # Overrides a private method, checked against aiogram 3.13-3.15: _polling awaits
+    # it per update and advances the getUpdates offset once it returns.
+    async def _process_update(
+        self,
+        bot: Bot,
+        update: Update,
+        call_answer: bool = True,
+        **kwargs: Any,
+    ) -> bool:
+        """Hand update to scheduler instead of processing it inline, waiting for room."""
+        return await self.scheduler.put(bot, update, **kwargs)
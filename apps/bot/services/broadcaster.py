@@ -0,0 +1,292 @@
+"""Rate-limited, resumable mass broadcast engine."""
+import asyncio
+import contextlib
+import os
+import socket
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from enum import Enum
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramForbiddenError, TelegramRetryAfter
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from apps.bot.api_limiter import bulk_calls
+from infrastructure.database.models.broadcasts import Broadcast
+from infrastructure.database.uow import UnitOfWork
+from infrastructure.database.user_cache import get_user_cache
+from infrastructure.monitoring.logging import get_logger
+from shared.enums import BroadcastStatus, UserStatus
+
+logger = get_logger(__name__)
+
+
+class SendResult(str, Enum):
+    """Outcome of a single broadcast send."""
+
+    SENT = "sent"
+    FAILED = "failed"
+    BLOCKED = "blocked"
+
+
+@dataclass
+class BroadcastProgress:
+    """Live progress of a running broadcast."""
+
+    broadcast_id: int
+    total: int
+    sent: int = 0
+    failed: int = 0
+    blocked: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+    # Recipients already processed before this run (resumed broadcasts)
+    resumed_from: int = 0
+
+    @property
+    def processed(self) -> int:
+        """Processed recipients, including previous runs."""
+        return self.resumed_from + self.sent + self.failed + self.blocked
+
+    @property
+    def rate(self) -> float:
+        """Throughput of this run, recipients per second."""
+        elapsed = time.monotonic() - self.started_at
+        return (self.sent + self.failed + self.blocked) / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self) -> float | None:
+        """Estimated seconds until completion."""
+        rate = self.rate
+        if rate <= 0:
+            return None
+        return max(self.total - self.processed, 0) / rate
+
+
+class Broadcaster:
+    """Sends a message to every matching user within Telegram flood limits.
+
+    Recipients are read from ``UserRepository`` in keyset pages of ``chunk_size``
+    (constant memory) and sent as ``bulk_calls()`` through the bot session's
+    ``ApiRateLimiter``, which paces them within its bulk share of the global
+    rate and retries ``TelegramRetryAfter``; 403 marks the user as blocked.
+    After every page the checkpoint is committed to the ``broadcasts`` row, so
+    an interrupted broadcast resumes from the last page (a partially sent page
+    may be delivered twice).
+
+    Each broadcast is sent by one instance: its ``owner``. Instances claim
+    unfinished broadcasts with ``resume()``, which ``start_resuming()`` runs
+    every ``lease / 2`` seconds, and renew the claim with every checkpoint; a
+    claim not renewed for ``lease`` seconds is taken over by the next run.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        session_factory: async_sessionmaker[AsyncSession],
+        concurrency: int,
+        chunk_size: int,
+        lease: float,
+    ):
+        self.bot = bot
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+        self.lease = lease
+        # Stable across restarts of the same container, so it reclaims its own broadcasts at once
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"[-64:]
+        self.progress: dict[int, BroadcastProgress] = {}
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks: dict[int, asyncio.Task[None]] = {}
+        self._resume_task: asyncio.Task[None] | None = None
+
+    async def create(
+        self,
+        text: str,
+        created_by: int | None = None,
+        language: str | None = None,
+        active_within_hours: int | None = None,
+    ) -> Broadcast:
+        """Create broadcast and start sending it in background."""
+        async with self.session_factory() as session:
+            broadcast = await UnitOfWork(session).broadcasts.create(
+                text=text,
+                created_by=created_by,
+                language=language,
+                active_within_hours=active_within_hours,
+                owner=self.owner,
+                heartbeat_at=datetime.utcnow(),
+            )
+            await session.commit()
+
+        self.start(broadcast.id)
+        return broadcast
+
+    def start(self, broadcast_id: int) -> None:
+        """Start sending broadcast in background."""
+        if broadcast_id in self._tasks:
+            return
+        task = asyncio.create_task(self._run(broadcast_id))
+        self._tasks[broadcast_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(broadcast_id, None))
+
+    async def resume(self) -> None:
+        """Claim and resume unfinished broadcasts that no other instance is sending."""
+        stale_before = datetime.utcnow() - timedelta(seconds=self.lease)
+        async with self.session_factory() as session:
+            broadcast_ids = await UnitOfWork(session).broadcasts.claim_unfinished(self.owner, stale_before)
+            await session.commit()
+        for broadcast_id in broadcast_ids:
+            logger.info("Resuming broadcast %s", broadcast_id)
+            self.start(broadcast_id)
+
+    def start_resuming(self) -> None:
+        """Claim and resume unfinished broadcasts now and then every ``lease / 2`` seconds."""
+        if self._resume_task is None:
+            self._resume_task = asyncio.create_task(self._resume_loop(), name="broadcast-resume")
+
+    async def _resume_loop(self) -> None:
+        """Resume periodically until cancelled, so stale claims of dead instances are taken over."""
+        while True:
+            try:
+                await self.resume()
+            except Exception as e:
+                logger.error("Claiming broadcasts failed: %s (%s)", e, type(e).__name__)
+            await asyncio.sleep(self.lease / 2)
+
+    async def cancel(self, broadcast_id: int) -> None:
+        """Stop broadcast and mark it cancelled."""
+        task = self._tasks.get(broadcast_id)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        async with self.session_factory() as session:
+            await UnitOfWork(session).broadcasts.set_status(broadcast_id, BroadcastStatus.CANCELLED)
+            await session.commit()
+
+    async def close(self) -> None:
+        """Stop all running broadcasts and release them for other instances to resume."""
+        if self._resume_task is not None:
+            self._resume_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._resume_task
+            self._resume_task = None
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            async with self.session_factory() as session:
+                await UnitOfWork(session).broadcasts.release(self.owner)
+                await session.commit()
+        except Exception as e:
+            logger.error("Releasing broadcasts failed, they resume after the lease: %s (%s)", e, type(e).__name__)
+
+    async def _run(self, broadcast_id: int) -> None:
+        """Send broadcast page by page, committing a checkpoint after each page."""
+        async with self.session_factory() as session:
+            uow = UnitOfWork(session)
+            broadcast = await uow.broadcasts.get(broadcast_id)
+            if (
+                broadcast is None
+                or broadcast.owner != self.owner
+                or broadcast.status not in (BroadcastStatus.PENDING, BroadcastStatus.RUNNING)
+            ):
+                return
+
+            status = UserStatus(broadcast.user_status)
+            active_since = (
+                datetime.utcnow() - timedelta(hours=broadcast.active_within_hours)
+                if broadcast.active_within_hours
+                else None
+            )
+            if broadcast.total_recipients is None:
+                broadcast.total_recipients = await uow.users.count_recipients(
+                    status, broadcast.language, active_since
+                )
+            if broadcast.status == BroadcastStatus.PENDING:
+                await uow.broadcasts.set_status(broadcast_id, BroadcastStatus.RUNNING)
+            await session.commit()
+
+        text = broadcast.text
+        after_id = broadcast.last_user_id
+        progress = BroadcastProgress(
+            broadcast_id=broadcast_id,
+            total=broadcast.total_recipients,
+            resumed_from=broadcast.processed_count,
+        )
+        self.progress[broadcast_id] = progress
+
+        try:
+            while True:
+                async with self.session_factory() as session:
+                    recipients = await UnitOfWork(session).users.get_recipients(
+                        after_id, self.chunk_size, status, broadcast.language, active_since
+                    )
+                if not recipients:
+                    break
+
+                results = await asyncio.gather(
+                    *(self._send(telegram_id, text) for _, telegram_id in recipients)
+                )
+                blocked = [
+                    telegram_id
+                    for (_, telegram_id), result in zip(recipients, results, strict=True)
+                    if result == SendResult.BLOCKED
+                ]
+                sent = results.count(SendResult.SENT)
+                failed = results.count(SendResult.FAILED)
+                after_id = recipients[-1][0]
+
+                async with self.session_factory() as session:
+                    uow = UnitOfWork(session, get_user_cache())
+                    await uow.users.set_status_many(blocked, UserStatus.BLOCKED)
+                    owned = await uow.broadcasts.save_progress(
+                        broadcast_id, self.owner, after_id, sent, failed, len(blocked)
+                    )
+                    await session.commit()
+                if not owned:
+                    logger.warning("Broadcast %s was cancelled or taken over, stopping", broadcast_id)
+                    return
+
+                progress.sent += sent
+                progress.failed += failed
+                progress.blocked += len(blocked)
+                logger.info(
+                    "Broadcast %s: %s/%s processed (sent=%s, failed=%s, blocked=%s), %.1f msg/s, eta=%ss",
+                    broadcast_id,
+                    progress.processed,
+                    progress.total,
+                    progress.sent,
+                    progress.failed,
+                    progress.blocked,
+                    progress.rate,
+                    int(progress.eta) if progress.eta is not None else "?",
+                )
+
+            async with self.session_factory() as session:
+                await UnitOfWork(session).broadcasts.set_status(broadcast_id, BroadcastStatus.COMPLETED)
+                await session.commit()
+            logger.info("Broadcast %s completed: %s", broadcast_id, progress)
+        except asyncio.CancelledError:
+            logger.info("Broadcast %s stopped at user_id=%s", broadcast_id, after_id)
+            raise
+        except Exception as e:
+            logger.error("Broadcast %s failed: %s (%s)", broadcast_id, e, type(e).__name__, exc_info=e)
+        finally:
+            self.progress.pop(broadcast_id, None)
+
+    async def _send(self, chat_id: int, text: str) -> SendResult:
+        """Send one message; pacing and RetryAfter retries are up to the API rate limiter."""
+        async with self._semaphore:
+            try:
+                with bulk_calls():
+                    await self.bot.send_message(chat_id, text)
+                return SendResult.SENT
+            except TelegramForbiddenError:
+                return SendResult.BLOCKED
+            except TelegramRetryAfter as e:
+                logger.warning("Broadcast send hit RetryAfter too often: chat_id=%s, error=%s", chat_id, e)
+                return SendResult.FAILED
+            except TelegramAPIError as e:
+                logger.warning("Broadcast send failed: chat_id=%s, error=%s", chat_id, e)
+                return SendResult.FAILED
@@ -1,10 +1,11 @@
 """User service with business logic."""
 from aiogram.types import User as TelegramUser
 
+from apps.bot.locales import get_i18n
 from infrastructure.database.models.users import User
 from infrastructure.database.uow import UnitOfWork
-from shared.dto.user import UserCreateDTO
-from shared.enums import Language
+from shared.dto.user import UserCreateDTO, UserSnapshotDTO, UserStatsDTO
+from shared.enums import Language, UserStatDimension
 from shared.exceptions.base import NotFoundError
 
 
@@ -21,7 +22,7 @@ class UserService:
             username=telegram_user.username,
             first_name=telegram_user.first_name,
             last_name=telegram_user.last_name,
-            language=Language(telegram_user.language_code or "ru"),
+            language=Language(get_i18n().match(telegram_user.language_code)),
         )
 
         user, created = await self.uow.users.get_or_create(dto)
@@ -38,6 +39,14 @@ class UserService:
         """Get user by Telegram ID."""
         return await self.uow.users.get_by_telegram_id(telegram_id)
 
+    async def get_user_snapshot(self, telegram_id: int) -> UserSnapshotDTO | None:
+        """Get cached read-only user snapshot by Telegram ID."""
+        return await self.uow.users.get_snapshot(telegram_id)
+
     async def get_total_users(self) -> int:
         """Get total number of users."""
-        return await self.uow.users.count()
+        return await self.uow.user_stats.get_value(UserStatDimension.TOTAL)
+
+    async def get_stats(self, days: int = 7) -> UserStatsDTO:
+        """Get user counters and daily new/active users for the last ``days`` days."""
+        return await self.uow.user_stats.get_summary(days)
@@ -0,0 +1,89 @@
+"""Webhook ingestion server (alternative to long polling)."""
+import asyncio
+from typing import Any
+
+from aiogram import Bot
+from aiogram.types import Update
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from apps.bot.scheduler import ScheduledDispatcher, UpdateScheduler
+from config.settings.bot import BotSettings
+from infrastructure.monitoring.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class ScheduledRequestHandler(SimpleRequestHandler):
+    """Webhook handler that answers Telegram immediately and hands updates to the scheduler.
+
+    Every request is acknowledged with an empty 200 as soon as its update is
+    queued (a request waits while its chat queue is full); concurrency and
+    per-chat ordering are enforced by ``UpdateScheduler``.
+    """
+
+    def __init__(
+        self,
+        scheduler: UpdateScheduler,
+        bot: Bot,
+        secret_token: str | None = None,
+        **data: Any,
+    ):
+        super().__init__(
+            dispatcher=scheduler.dispatcher,
+            bot=bot,
+            handle_in_background=True,
+            secret_token=secret_token,
+            **data,
+        )
+        self.scheduler = scheduler
+
+    async def _handle_request_background(self, bot: Bot, request: web.Request) -> web.Response:
+        """Parse update, enqueue it and respond without waiting for handlers."""
+        update = Update.model_validate(
+            await request.json(loads=bot.session.json_loads),
+            context={"bot": bot},
+        )
+        await self.scheduler.put(bot, update, **self.data)
+        return web.json_response({}, dumps=bot.session.json_dumps)
+
+    async def close(self) -> None:
+        """Wait for queued updates, then close bot session."""
+        await self.scheduler.close()
+        await super().close()
+
+
+async def run_webhook(dp: ScheduledDispatcher, bot: Bot, settings: BotSettings, **kwargs: Any) -> None:
+    """Register webhook in Telegram and serve updates until cancelled."""
+    secret = settings.webhook_secret.get_secret_value() if settings.webhook_secret else None
+
+    app = web.Application()
+    handler = ScheduledRequestHandler(
+        scheduler=dp.scheduler,
+        bot=bot,
+        secret_token=secret,
+        **kwargs,
+    )
+    handler.register(app, path=settings.webhook_path)
+    setup_application(app, dp, bot=bot, **kwargs)
+
+    await bot.set_webhook(
+        url=settings.webhook_endpoint,
+        secret_token=secret,
+        allowed_updates=dp.resolve_used_update_types(),
+        drop_pending_updates=settings.drop_pending_updates,
+        max_connections=settings.webhook_max_connections,
+    )
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=settings.webhook_host, port=settings.webhook_port)
+    await site.start()
+    logger.info(
+        "Webhook server listening on %s:%s%s", settings.webhook_host, settings.webhook_port, settings.webhook_path
+    )
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
@@ -22,6 +22,17 @@ class LoggingSettings(BaseSettings):
         default="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
         description="Log format string",
     )
+    json_format: bool = Field(default=False, description="Write logs as one-line JSON")
+
+    # Pipeline
+    queue: bool = Field(default=True, description="Write logs from a background thread via a queue")
+    queue_size: int = Field(default=10_000, ge=1, description="Max queued records; overflow is dropped")
+    sample_rates: dict[str, float] = Field(
+        default_factory=dict,
+        description="Share of INFO/DEBUG records kept per logger prefix, e.g. {\"apps.bot.middlewares\": 0.1}",
+    )
+    error_limit: int = Field(default=10, ge=0, description="Max identical errors per interval (0 = unlimited)")
+    error_limit_interval: float = Field(default=60.0, gt=0, description="Error rate limit window, seconds")
 
     @property
     def log_level(self) -> int:
@@ -29,6 +40,19 @@ class LoggingSettings(BaseSettings):
         return getattr(logging, self.level.upper(), logging.INFO)
 
 
+class MetricsSettings(BaseSettings):
+    """Metrics endpoint configuration."""
+
+    model_config = SettingsConfigDict(
+        env_prefix="METRICS__",
+        extra="ignore",
+    )
+
+    enabled: bool = Field(default=False, description="Serve Prometheus metrics")
+    host: str = Field(default="127.0.0.1", description="Metrics server bind host")
+    port: int = Field(default=9090, description="Metrics server bind port")
+
+
 class AppSettings(BaseSettings):
     """Main application settings aggregator."""
 
@@ -52,6 +76,7 @@ class AppSettings(BaseSettings):
     bot: BotSettings = Field(default_factory=BotSettings)
     database: DatabaseSettings = Field(default_factory=DatabaseSettings)
     logging: LoggingSettings = Field(default_factory=LoggingSettings)
+    metrics: MetricsSettings = Field(default_factory=MetricsSettings)
 
     @property
     def is_development(self) -> bool:
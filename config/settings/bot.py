@@ -1,4 +1,6 @@
 """Telegram bot configuration settings."""
+from typing import Literal
+
 from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -12,10 +14,71 @@ class BotSettings(BaseSettings):
     )
 
     token: SecretStr = Field(..., description="Telegram bot token from @BotFather")
-    admin_ids: list[int] = Field(default_factory=list, description="List of admin user IDs")
+    admin_ids: frozenset[int] = Field(default_factory=frozenset, description="Admin user IDs, e.g. [1, 2]")
+    role_refresh_interval: int = Field(
+        default=60, ge=1, description="Seconds between role index reloads (picks up other instances' changes)"
+    )
+
+    api_base_url: str | None = Field(
+        default=None, description="Bot API server base URL (local Bot API server or load-test fake)"
+    )
 
     # Bot behavior
     drop_pending_updates: bool = Field(default=True, description="Drop pending updates on start")
+    default_language: str = Field(
+        default="ru", description="Locale for users whose language has no catalog in apps/bot/locales"
+    )
+    keyboard_cache_size: int = Field(default=1024, ge=1, description="Max cached parameterized keyboards")
+
+    # Update ingestion
+    mode: Literal["polling", "webhook"] = Field(default="polling", description="Update ingestion mode")
+    max_concurrent_updates: int = Field(
+        default=30, ge=1, description="Max updates processed at once (keep <= DB pool_size + max_overflow)"
+    )
+    max_chat_queue_size: int = Field(default=50, ge=1, description="Max queued updates per chat before intake waits")
+
+    # Webhook (used when mode=webhook)
+    webhook_url: str | None = Field(default=None, description="Public base URL Telegram sends updates to")
+    webhook_path: str = Field(default="/webhook", description="Webhook route path")
+    webhook_secret: SecretStr | None = Field(default=None, description="X-Telegram-Bot-Api-Secret-Token value")
+    webhook_host: str = Field(default="0.0.0.0", description="Webhook server bind host")
+    webhook_port: int = Field(default=8080, description="Webhook server bind port")
+    webhook_max_connections: int = Field(
+        default=100, ge=1, le=100, description="Max simultaneous HTTPS connections Telegram opens"
+    )
+
+    # Anti-flood (incoming updates per user)
+    throttling_rate: float = Field(default=2.0, gt=0, description="Updates per second allowed per user")
+    throttling_burst: float = Field(default=5.0, ge=1, description="Updates a user may send in a burst")
+    throttling_notify_interval: float = Field(
+        default=10.0, gt=0, description="Min seconds between 'slow down' replies to a user"
+    )
+
+    # Outgoing Bot API rate limits
+    api_rate_limit: bool = Field(default=True, description="Queue outgoing calls within Telegram limits")
+    api_global_rate: float = Field(default=30.0, gt=0, description="Outgoing chat messages per second, all chats")
+    api_chat_rate: float = Field(default=1.0, gt=0, description="Outgoing messages per second per private chat")
+    api_group_rate: float = Field(default=20 / 60, gt=0, description="Outgoing messages per second per group")
+    api_chat_burst: float = Field(default=3.0, ge=1, description="Messages a chat may receive in a burst")
+    api_max_retries: int = Field(default=3, ge=0, description="Retries of a call after RetryAfter")
+    api_retry_backoff: float = Field(default=1.0, ge=0, description="Base backoff added to RetryAfter, seconds")
+
+    # Broadcasts
+    broadcast_rate: float = Field(
+        default=25.0, gt=0, description="Broadcast share of api_global_rate, messages per second"
+    )
+    broadcast_concurrency: int = Field(default=10, ge=1, description="Concurrent in-flight broadcast sends")
+    broadcast_chunk_size: int = Field(default=100, ge=1, description="Recipients per checkpoint")
+    broadcast_lease: float = Field(
+        default=300.0, gt=0, description="Seconds without a checkpoint before another instance takes a broadcast over"
+    )
+
+    @property
+    def webhook_endpoint(self) -> str:
+        """Full public webhook URL."""
+        if not self.webhook_url:
+            raise ValueError("BOT__WEBHOOK_URL is required when BOT__MODE=webhook")
+        return self.webhook_url.rstrip("/") + self.webhook_path
 
     def is_admin(self, user_id: int) -> bool:
         """Check if user is admin."""
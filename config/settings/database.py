@@ -40,6 +40,49 @@ class DatabaseSettings(BaseSettings):
     pool_recycle: int = Field(default=3600, description="Pool recycle time in seconds")
     echo: bool = Field(default=False, description="Enable SQL query logging")
 
+    # Read replicas
+    replica_urls: list[str] = Field(
+        default_factory=list, description="Read replica URLs, JSON list (same credentials format as DATABASE_URL)"
+    )
+    replica_max_lag: float = Field(default=5.0, gt=0, description="Lag in seconds that takes a replica out of rotation")
+    replica_check_interval: float = Field(default=5.0, gt=0, description="Replica health check interval in seconds")
+
+    # Query instrumentation
+    slow_query_ms: int = Field(default=200, ge=0, description="Log statements slower than this (0 = off)")
+    query_budget: int = Field(default=30, ge=0, description="Max queries per update before warning (0 = off)")
+    query_budget_strict: bool = Field(
+        default=False, description="Fail updates over budget (always on with DEBUG=true)"
+    )
+
+    # Write-behind user activity buffer
+    activity_flush_interval_ms: int = Field(default=1000, ge=10, description="Activity buffer flush interval")
+    activity_flush_max_users: int = Field(default=500, ge=1, description="Flush early once this many users are buffered")
+    activity_buffer_max_users: int = Field(
+        default=50_000, ge=1, description="Max buffered users; activity of new users beyond it is dropped"
+    )
+
+    # User statistics rollup
+    user_stats_reconcile_interval: int = Field(
+        default=3600, ge=1, description="Seconds between user stats drift checks (each scans users)"
+    )
+
+    # In-process user cache
+    user_cache_size: int = Field(default=10_000, ge=1, description="Max cached user snapshots")
+    user_cache_ttl: int = Field(default=300, ge=1, description="User snapshot TTL in seconds")
+
+    # FSM storage
+    fsm_cache_size: int = Field(default=10_000, ge=0, description="Max cached FSM records (0 = no cache)")
+    fsm_cache_ttl: int = Field(default=300, ge=1, description="Cached FSM record TTL in seconds")
+    fsm_flush_interval_ms: int = Field(
+        default=0, ge=0, description="Coalesce FSM writes for this long before flushing (0 = write-through)"
+    )
+    fsm_state_ttl: int = Field(
+        default=7 * 24 * 3600, ge=60, description="Delete FSM records not written for this many seconds"
+    )
+    fsm_cleanup_interval: int = Field(
+        default=3600, ge=1, description="Seconds between abandoned FSM record cleanups"
+    )
+
     @model_validator(mode="before")
     @classmethod
     def read_database_url(cls, values: dict[str, Any]) -> dict[str, Any]:
@@ -58,7 +101,12 @@ class DatabaseSettings(BaseSettings):
 
     def _parse_database_url(self, driver: str) -> str:
         """Parse database_url and rebuild with the specified driver."""
-        parsed = urlparse(self.database_url)
+        return self._rebuild_url(self.database_url, driver)
+
+    @staticmethod
+    def _rebuild_url(url: str, driver: str) -> str:
+        """Rebuild URL with the specified driver."""
+        parsed = urlparse(url)
 
         # Replace scheme with the target driver
         scheme = driver
@@ -121,6 +169,11 @@ class DatabaseSettings(BaseSettings):
         )
         return uri.render_as_string(hide_password=False)
 
+    @property
+    def replica_async_urls(self) -> list[str]:
+        """Construct async SQLAlchemy URLs of read replicas."""
+        return [self._rebuild_url(url, "postgresql+asyncpg") for url in self.replica_urls]
+
     @property
     def sync_url(self) -> str:
         """Construct sync SQLAlchemy URL for psycopg2 (used in Alembic)."""
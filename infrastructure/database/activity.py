@@ -0,0 +1,162 @@
+"""Write-behind buffer for user activity counters."""
+import asyncio
+import contextlib
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from config.settings.base import get_settings
+from infrastructure.database.core.session import get_session_factory
+from infrastructure.database.repositories.user_repository import UserRepository
+from infrastructure.monitoring.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class ActivityStats:
+    """Activity buffer counters."""
+
+    recorded: int = 0
+    dropped: int = 0
+    flushes: int = 0
+    flushed_users: int = 0
+    failed_flushes: int = 0
+
+
+class ActivityBuffer:
+    """Aggregates per-user message deltas and last activity in memory.
+
+    Pending activity is written every ``flush_interval`` seconds, or as soon as
+    ``flush_max_users`` users are buffered, with a single
+    ``UPDATE users ... FROM (VALUES ...)`` statement. At most ``max_users`` users
+    are held; activity of users beyond that bound is dropped and counted.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        flush_interval: float,
+        flush_max_users: int,
+        max_users: int,
+    ):
+        self.session_factory = session_factory
+        self.flush_interval = flush_interval
+        self.flush_max_users = flush_max_users
+        self.max_users = max_users
+        self.stats = ActivityStats()
+        # telegram_id -> [messages delta, last activity]
+        self._pending: dict[int, list] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+        self._closing = False
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def record(self, telegram_id: int, messages: int = 0, at: datetime | None = None) -> None:
+        """Record user activity (non-blocking)."""
+        at = at or datetime.utcnow()
+        entry = self._pending.get(telegram_id)
+
+        if entry is not None:
+            entry[0] += messages
+            if at > entry[1]:
+                entry[1] = at
+        elif len(self._pending) >= self.max_users:
+            self.stats.dropped += 1
+            return
+        else:
+            self._pending[telegram_id] = [messages, at]
+            if len(self._pending) >= self.flush_max_users:
+                self._wakeup.set()
+
+        self.stats.recorded += 1
+
+    async def flush(self) -> int:
+        """Write pending activity to the database. Returns number of flushed users."""
+        if not self._pending:
+            return 0
+
+        batch, self._pending = self._pending, {}
+        # Sorted by key so concurrent flushers lock rows in the same order
+        rows = [(telegram_id, entry[0], entry[1]) for telegram_id, entry in sorted(batch.items())]
+
+        try:
+            async with self.session_factory() as session:
+                await UserRepository(session).apply_activity(rows)
+                await session.commit()
+        except Exception as e:
+            self.stats.failed_flushes += 1
+            logger.error("Activity flush failed: users=%s, error=%s (%s)", len(rows), e, type(e).__name__)
+            self._requeue(rows)
+            return 0
+
+        self.stats.flushes += 1
+        self.stats.flushed_users += len(rows)
+        return len(rows)
+
+    def _requeue(self, rows: list[tuple[int, int, datetime]]) -> None:
+        """Merge a failed batch back into pending activity; it was already counted as recorded."""
+        for telegram_id, messages, at in rows:
+            entry = self._pending.get(telegram_id)
+            if entry is not None:
+                entry[0] += messages
+                if at > entry[1]:
+                    entry[1] = at
+            elif len(self._pending) < self.max_users:
+                self._pending[telegram_id] = [messages, at]
+            else:
+                self.stats.dropped += 1
+
+    async def _run(self) -> None:
+        """Flush periodically until closed."""
+        while not self._closing:
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """Start background flushing."""
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        """Stop background flushing and write everything still pending."""
+        self._closing = True
+        self._wakeup.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+        await self.flush()
+
+
+_activity_buffer: ActivityBuffer | None = None
+
+
+def get_activity_buffer() -> ActivityBuffer:
+    """Get or create activity buffer."""
+    global _activity_buffer
+
+    if _activity_buffer is None:
+        settings = get_settings()
+        _activity_buffer = ActivityBuffer(
+            session_factory=get_session_factory(),
+            flush_interval=settings.database.activity_flush_interval_ms / 1000,
+            flush_max_users=settings.database.activity_flush_max_users,
+            max_users=settings.database.activity_buffer_max_users,
+        )
+
+    return _activity_buffer
+
+
+async def close_activity_buffer() -> None:
+    """Flush and close activity buffer."""
+    global _activity_buffer
+
+    if _activity_buffer is not None:
+        await _activity_buffer.close()
+        _activity_buffer = None
@@ -1,14 +1,41 @@
 """Database core module."""
+from infrastructure.database.core.query_stats import (
+    QueryBudgetExceededError,
+    QueryStats,
+    get_query_stats,
+    track_queries,
+)
+from infrastructure.database.core.replicas import ReplicaRouter, actor_context, replica_context, replica_read
 from infrastructure.database.core.session import (
     close_engine,
     get_engine,
+    get_read_only_engine,
+    get_replica_router,
     get_session,
     get_session_factory,
+    has_writes,
+    is_read_only,
+    mark_writes,
+    read_only_context,
 )
 
 __all__ = [
     "get_engine",
+    "get_read_only_engine",
     "get_session_factory",
     "get_session",
     "close_engine",
+    "has_writes",
+    "is_read_only",
+    "mark_writes",
+    "read_only_context",
+    "get_replica_router",
+    "ReplicaRouter",
+    "replica_read",
+    "replica_context",
+    "actor_context",
+    "QueryStats",
+    "QueryBudgetExceededError",
+    "get_query_stats",
+    "track_queries",
 ]
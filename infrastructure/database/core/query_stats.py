@@ -0,0 +1,151 @@
+"""SQL query instrumentation: timings, slow-query log and per-update query budget."""
+import re
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, ExceptionContext, ExecutionContext
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from infrastructure.monitoring.logging import get_logger
+from shared.exceptions.base import DatabaseError
+
+logger = get_logger(__name__)
+
+_query_stats: ContextVar["QueryStats | None"] = ContextVar("query_stats", default=None)
+
+_WHITESPACE = re.compile(r"\s+")
+_PARAM_LIST = re.compile(r"\(\s*(?:\$\d+|%\(\w+\)s|\?)(?:\s*,\s*(?:\$\d+|%\(\w+\)s|\?))+\s*\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|(?<![$\w])\d+(?:\.\d+)?\b")
+
+
+class QueryBudgetExceededError(DatabaseError):
+    """Update issued more queries than its budget allows."""
+
+
+@dataclass
+class QueryStats:
+    """Queries issued while processing one update."""
+
+    update_id: int | None = None
+    budget: int = 0
+    strict: bool = False
+    queries: int = 0
+    round_trips: int = 0
+    total_time: float = 0.0
+    slowest_time: float = 0.0
+    slowest_statement: str | None = None
+    closed: bool = False
+
+    @property
+    def over_budget(self) -> bool:
+        """Check whether query count exceeds budget (0 = unlimited)."""
+        return 0 < self.budget < self.queries
+
+    def check_budget(self) -> None:
+        """Raise ``QueryBudgetExceededError`` in strict mode if the next query would exceed budget."""
+        if self.strict and 0 < self.budget <= self.queries:
+            raise QueryBudgetExceededError(self.summary(self.queries + 1), details={"slowest": self.slowest_statement})
+
+    def summary(self, queries: int) -> str:
+        """Describe query usage for logs and errors."""
+        return (
+            f"Update {self.update_id} issued {queries} queries (budget {self.budget}), "
+            f"{self.round_trips} round trips, {self.total_time * 1000:.1f}ms in SQL"
+        )
+
+
+def normalize_sql(statement: str, max_length: int = 1000) -> str:
+    """Collapse whitespace, parameter lists and literals so equal queries group together."""
+    statement = _WHITESPACE.sub(" ", statement).strip()
+    statement = _LITERAL.sub("?", statement)
+    statement = _PARAM_LIST.sub("(...)", statement)
+    return statement[:max_length]
+
+
+def get_query_stats() -> QueryStats | None:
+    """Get query stats of the update being processed."""
+    return _query_stats.get()
+
+
+@contextmanager
+def track_queries(update_id: int | None = None, budget: int = 0, strict: bool = False) -> Iterator[QueryStats]:
+    """Count queries issued within this context.
+
+    A budget overrun is logged on exit. In strict mode the statement that
+    would exceed the budget raises ``QueryBudgetExceededError`` instead of
+    being sent, so the update fails before its session commits. Background
+    tasks spawned inside the context inherit the stats object but stop
+    counting once the context has exited.
+    """
+    stats = QueryStats(update_id=update_id, budget=budget, strict=strict)
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        stats.closed = True
+        _query_stats.reset(token)
+
+    if stats.over_budget:
+        logger.warning(stats.summary(stats.queries))
+
+
+def instrument_queries(engine: AsyncEngine, slow_query_ms: int) -> None:
+    """Attach cursor and transaction hooks that time statements, count round trips and enforce budgets."""
+    sync_engine = engine.sync_engine
+    slow_query_time = slow_query_ms / 1000
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_execute(
+        conn: Connection, cursor: Any, statement: str, parameters: Any, context: ExecutionContext, executemany: bool
+    ) -> None:
+        stats = _query_stats.get()
+        if stats is not None and not stats.closed:
+            stats.check_budget()
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_execute(
+        conn: Connection, cursor: Any, statement: str, parameters: Any, context: ExecutionContext, executemany: bool
+    ) -> None:
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+
+        stats = _query_stats.get()
+        if stats is not None and not stats.closed:
+            stats.queries += 1
+            stats.round_trips += 1
+            stats.total_time += elapsed
+            if elapsed > stats.slowest_time:
+                stats.slowest_time = elapsed
+                stats.slowest_statement = statement
+
+        if slow_query_ms and elapsed >= slow_query_time:
+            logger.warning(
+                "Slow query (%.1fms, update_id=%s): %s",
+                elapsed * 1000,
+                stats.update_id if stats is not None else None,
+                normalize_sql(statement),
+            )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _on_error(context: ExceptionContext) -> None:
+        # Failed statements never reach after_cursor_execute
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+    def _count_round_trip(conn: Connection) -> None:
+        stats = _query_stats.get()
+        if stats is None or stats.closed:
+            return
+        # Autocommit connections send no BEGIN/COMMIT
+        if conn.get_execution_options().get("isolation_level") != "AUTOCOMMIT":
+            stats.round_trips += 1
+
+    event.listen(sync_engine, "begin", _count_round_trip)
+    event.listen(sync_engine, "commit", _count_round_trip)
+    event.listen(sync_engine, "rollback", _count_round_trip)
@@ -0,0 +1,215 @@
+"""Read-replica selection: round-robin over healthy replicas, read-your-writes bound."""
+import asyncio
+import contextlib
+import itertools
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from functools import wraps
+from typing import ParamSpec, TypeVar
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from infrastructure.monitoring.logging import get_logger
+
+logger = get_logger(__name__)
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# None: replicas only for read-only sessions; True/False: forced on/off for the context
+_replica_read: ContextVar[bool | None] = ContextVar("replica_read", default=None)
+_actor: ContextVar[int | None] = ContextVar("db_actor", default=None)
+
+# 0 when the replica has replayed everything it received, else seconds since the last replayed commit
+_LAG_QUERY = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+# Session info key: whether the session's last statement was routed to a replica
+ON_REPLICA_KEY = "on_replica"
+
+# Prune expired read-your-writes entries every N recorded writes
+_PRUNE_EVERY = 1000
+
+
+def wants_replica(default: bool = False) -> bool:
+    """Check whether current context allows reading from a replica; ``default`` when it does not say."""
+    enabled = _replica_read.get()
+    return default if enabled is None else enabled
+
+
+@contextmanager
+def replica_context(enabled: bool = True) -> Iterator[None]:
+    """Let SELECTs issued within this context go to a replica, or with ``enabled=False`` keep them on the primary."""
+    token = _replica_read.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_read.reset(token)
+
+
+def replica_read(method: Callable[P, Awaitable[R]]) -> Callable[P, Awaitable[R]]:
+    """Mark a read-only repository method as safe to serve from a replica.
+
+    When the replica connection drops during the call, the repository's
+    session is rolled back (releasing the dead connection) and the method runs
+    again on the primary. Sessions that wrote never read from a replica, so the
+    rollback loses no writes, but it does release row locks and expire loaded
+    objects.
+    """
+
+    @wraps(method)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+        if _replica_read.get() is False:
+            # Kept on the primary by the caller, e.g. a retry of an enclosing replica_read
+            return await method(*args, **kwargs)
+
+        session = args[0].session  # type: ignore[attr-defined]
+        with replica_context():
+            try:
+                return await method(*args, **kwargs)
+            except DBAPIError as e:
+                if not (e.connection_invalidated and session.info.get(ON_REPLICA_KEY)):
+                    raise
+                logger.warning("Replica connection lost during %s, retrying on the primary", method.__qualname__)
+
+        await session.rollback()
+        with replica_context(False):
+            return await method(*args, **kwargs)
+
+    return wrapper
+
+
+def get_actor() -> int | None:
+    """Get the user on whose behalf the current statements run."""
+    return _actor.get()
+
+
+@contextmanager
+def actor_context(user_id: int | None) -> Iterator[None]:
+    """Attribute sessions within this context to ``user_id`` for read-your-writes."""
+    token = _actor.set(user_id)
+    try:
+        yield
+    finally:
+        _actor.reset(token)
+
+
+@dataclass
+class ReplicaState:
+    """Health of one replica."""
+
+    engine: AsyncEngine
+    name: str
+    healthy: bool = True
+    lag: float = 0.0
+    failures: int = 0
+
+
+class ReplicaRouter:
+    """Picks replica engines for reads.
+
+    Replicas are used round-robin while healthy. A background check marks a
+    replica down when it is unreachable or lags more than ``max_lag`` seconds,
+    and a disconnect error on any statement marks it down immediately. With no
+    healthy replica, callers fall back to the primary.
+
+    Users who committed a write are routed to the primary for
+    ``max_lag + check_interval`` seconds: every replica still in rotation is at
+    most that far behind, so they always read their own writes.
+    """
+
+    def __init__(self, engines: list[AsyncEngine], max_lag: float, check_interval: float):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.write_window = max_lag + check_interval
+        self.replicas = [ReplicaState(engine, engine.url.render_as_string()) for engine in engines]
+        self._cycle = itertools.cycle(self.replicas)
+        # user_id -> monotonic time of the last committed write
+        self._recent_writes: dict[int, float] = {}
+        self._writes_since_prune = 0
+        self._task: asyncio.Task[None] | None = None
+
+        for replica in self.replicas:
+            self._watch_errors(replica)
+
+    def _watch_errors(self, replica: ReplicaState) -> None:
+        @event.listens_for(replica.engine.sync_engine, "handle_error")
+        def _on_error(context: ExceptionContext) -> None:
+            if context.is_disconnect and replica.healthy:
+                self._mark_down(replica, "connection lost")
+
+    def _mark_down(self, replica: ReplicaState, reason: str) -> None:
+        replica.healthy = False
+        replica.failures += 1
+        logger.warning("Replica %s removed from rotation: %s", replica.name, reason)
+
+    def pick(self) -> AsyncEngine | None:
+        """Get next healthy replica engine, or None to use the primary."""
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if replica.healthy:
+                return replica.engine
+        return None
+
+    def record_write(self, user_id: int) -> None:
+        """Remember that ``user_id`` just committed a write."""
+        now = time.monotonic()
+        self._recent_writes[user_id] = now
+        self._writes_since_prune += 1
+        if self._writes_since_prune >= _PRUNE_EVERY:
+            self._writes_since_prune = 0
+            expired = now - self.write_window
+            self._recent_writes = {uid: at for uid, at in self._recent_writes.items() if at > expired}
+
+    def wrote_recently(self, user_id: int) -> bool:
+        """Check whether replicas may not have ``user_id``'s last write yet."""
+        written_at = self._recent_writes.get(user_id)
+        return written_at is not None and time.monotonic() - written_at < self.write_window
+
+    async def check(self) -> None:
+        """Probe every replica and update its health."""
+        await asyncio.gather(*(self._check_one(replica) for replica in self.replicas))
+
+    async def _check_one(self, replica: ReplicaState) -> None:
+        try:
+            async with replica.engine.connect() as conn:
+                replica.lag = float((await conn.execute(_LAG_QUERY)).scalar() or 0)
+        except Exception as e:
+            if replica.healthy:
+                self._mark_down(replica, f"health check failed: {e}")
+            return
+
+        if replica.lag > self.max_lag:
+            if replica.healthy:
+                self._mark_down(replica, f"lag {replica.lag:.1f}s > {self.max_lag}s")
+        elif not replica.healthy:
+            replica.healthy = True
+            logger.info("Replica %s back in rotation (lag %.1fs)", replica.name, replica.lag)
+
+    def start(self) -> None:
+        """Start periodic health checks."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="replica-health")
+
+    async def _run(self) -> None:
+        while True:
+            await self.check()
+            await asyncio.sleep(self.check_interval)
+
+    async def close(self) -> None:
+        """Stop health checks and dispose replica engines."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
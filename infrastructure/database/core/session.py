@@ -1,14 +1,112 @@
 """Database session management."""
+from collections.abc import AsyncGenerator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any
 
-from collections.abc import AsyncGenerator
-from contextlib import asynccontextmanager
-
+from sqlalchemy import Engine, Select, event
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
 
 from config.settings.base import get_settings
+from infrastructure.database.core.query_stats import instrument_queries
+from infrastructure.database.core.replicas import ON_REPLICA_KEY, ReplicaRouter, get_actor, wants_replica
+from shared.exceptions.base import DatabaseError
 
 _engine: AsyncEngine | None = None
+_read_only_engine: AsyncEngine | None = None
 _session_factory: async_sessionmaker[AsyncSession] | None = None
+_read_only_session_factory: async_sessionmaker[AsyncSession] | None = None
+_replica_router: ReplicaRouter | None = None
+
+_read_only: ContextVar[bool] = ContextVar("read_only_session", default=False)
+
+
+class TrackedSession(Session):
+    """Sync session that records in ``info`` whether it issued any writes.
+
+    With replicas configured, plain SELECTs go to a replica when the session is
+    read-only or the call is marked ``replica_read``, unless this session or,
+    recently, the same user has written. ``info[ON_REPLICA_KEY]`` tells whether
+    the last statement went to a replica (``replica_read`` retries on the primary
+    when that connection drops).
+    """
+
+    def get_bind(self, mapper: Any = None, *, clause: Any = None, **kwargs: Any) -> Engine:
+        """Route replica-safe reads to a replica, everything else to the primary."""
+        self.info[ON_REPLICA_KEY] = False
+        if (
+            _replica_router is not None
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+            and wants_replica(default=bool(self.info.get("read_only")))
+            and not self._flushing
+            and not (self.info.get("has_writes") or self.new or self.dirty or self.deleted)
+        ):
+            actor = get_actor()
+            if actor is None or not _replica_router.wrote_recently(actor):
+                engine = _replica_router.pick()
+                if engine is not None:
+                    self.info[ON_REPLICA_KEY] = True
+                    return engine.sync_engine
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _on_execute(orm_execute_state: ORMExecuteState) -> None:
+    """Mark session as written, reject DML in read-only sessions early (the server rejects any write)."""
+    if orm_execute_state.is_select:
+        return
+
+    session = orm_execute_state.session
+    if session.info.get("read_only") and (
+        orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete
+    ):
+        raise DatabaseError("Write statement in read-only session")
+    session.info["has_writes"] = True
+
+
+@event.listens_for(TrackedSession, "before_flush")
+def _on_flush(session: Session, flush_context: UOWTransaction, instances: object) -> None:
+    """Mark session as written when ORM objects are flushed."""
+    if session.new or session.dirty or session.deleted:
+        if session.info.get("read_only"):
+            raise DatabaseError("Flush in read-only session")
+        session.info["has_writes"] = True
+
+
+@event.listens_for(TrackedSession, "after_commit")
+def _on_commit(session: Session) -> None:
+    """Send the writing user's next reads to the primary until replicas catch up."""
+    if _replica_router is not None and session.info.get("has_writes"):
+        actor = get_actor()
+        if actor is not None:
+            _replica_router.record_write(actor)
+
+
+def mark_writes(session: AsyncSession) -> None:
+    """Mark session as written by a statement that looks like a SELECT (data-modifying CTE)."""
+    session.info["has_writes"] = True
+
+
+def has_writes(session: AsyncSession) -> bool:
+    """Check whether session issued or holds pending writes."""
+    return bool(session.info.get("has_writes") or session.new or session.dirty or session.deleted)
+
+
+def is_read_only() -> bool:
+    """Check whether current context requests read-only sessions."""
+    return _read_only.get()
+
+
+@contextmanager
+def read_only_context(enabled: bool = True) -> Iterator[None]:
+    """Make sessions created within this context read-only."""
+    token = _read_only.set(enabled)
+    try:
+        yield
+    finally:
+        _read_only.reset(token)
 
 
 def get_engine() -> AsyncEngine:
@@ -27,19 +125,98 @@ def get_engine() -> AsyncEngine:
             connect_args=settings.database.async_connect_args,
             future=True,
         )
+        instrument_queries(_engine, slow_query_ms=settings.database.slow_query_ms)
 
     return _engine
 
 
-def get_session_factory() -> async_sessionmaker[AsyncSession]:
-    """Get or create session factory."""
-    global _session_factory
+def get_read_only_engine() -> AsyncEngine:
+    """Get or create the engine of read-only sessions.
+
+    Its connections run in autocommit mode with ``default_transaction_read_only``
+    set, so the server rejects any write, whatever the statement looks like.
+    """
+    global _read_only_engine
+
+    if _read_only_engine is None:
+        settings = get_settings()
+        server_settings = {"default_transaction_read_only": "on"}
+        _read_only_engine = create_async_engine(
+            settings.database.async_url,
+            echo=settings.database.echo,
+            pool_size=settings.database.pool_size,
+            max_overflow=settings.database.max_overflow,
+            pool_pre_ping=settings.database.pool_pre_ping,
+            pool_recycle=settings.database.pool_recycle,
+            connect_args=settings.database.async_connect_args | {"server_settings": server_settings},
+            isolation_level="AUTOCOMMIT",
+        )
+        instrument_queries(_read_only_engine, slow_query_ms=settings.database.slow_query_ms)
+
+    return _read_only_engine
+
+
+def get_replica_router() -> ReplicaRouter | None:
+    """Get or create read replica router, None when no replicas are configured."""
+    global _replica_router
+
+    settings = get_settings()
+    if _replica_router is None and settings.database.replica_urls:
+        engines = []
+        for url in settings.database.replica_async_urls:
+            # Replicas only serve single SELECTs: autocommit saves BEGIN/COMMIT round trips
+            engine = create_async_engine(
+                url,
+                echo=settings.database.echo,
+                pool_size=settings.database.pool_size,
+                max_overflow=settings.database.max_overflow,
+                pool_pre_ping=settings.database.pool_pre_ping,
+                pool_recycle=settings.database.pool_recycle,
+                connect_args=settings.database.async_connect_args,
+                isolation_level="AUTOCOMMIT",
+            )
+            instrument_queries(engine, slow_query_ms=settings.database.slow_query_ms)
+            engines.append(engine)
+        _replica_router = ReplicaRouter(
+            engines,
+            max_lag=settings.database.replica_max_lag,
+            check_interval=settings.database.replica_check_interval,
+        )
+
+    return _replica_router
+
+
+def get_session_factory(read_only: bool = False) -> async_sessionmaker[AsyncSession]:
+    """Get or create session factory.
+
+    Sessions check out a pooled connection lazily, on their first statement.
+    Read-only sessions use ``get_read_only_engine()``: autocommit (no
+    BEGIN/COMMIT round trips) on connections where the server rejects writes.
+    With replicas configured, sessions route replica-safe SELECTs to them
+    (see ``TrackedSession``).
+    """
+    global _session_factory, _read_only_session_factory
+
+    if read_only:
+        if _read_only_session_factory is None:
+            get_replica_router()
+            _read_only_session_factory = async_sessionmaker(
+                bind=get_read_only_engine(),
+                class_=AsyncSession,
+                sync_session_class=TrackedSession,
+                expire_on_commit=False,
+                autoflush=False,
+                info={"read_only": True},
+            )
+        return _read_only_session_factory
 
     if _session_factory is None:
+        get_replica_router()
         engine = get_engine()
         _session_factory = async_sessionmaker(
             bind=engine,
             class_=AsyncSession,
+            sync_session_class=TrackedSession,
             expire_on_commit=False,
             autocommit=False,
             autoflush=False,
@@ -65,9 +242,20 @@ async def get_session() -> AsyncGenerator[AsyncSession, None]:
 
 
 async def close_engine() -> None:
-    """Close database engine."""
-    global _engine
+    """Close database engine and replicas."""
+    global _engine, _read_only_engine, _session_factory, _read_only_session_factory, _replica_router
+
+    if _replica_router is not None:
+        await _replica_router.close()
+        _replica_router = None
+
+    if _read_only_engine is not None:
+        await _read_only_engine.dispose()
+        _read_only_engine = None
+        _read_only_session_factory = None
 
     if _engine is not None:
         await _engine.dispose()
         _engine = None
+        _session_factory = None
+        _read_only_session_factory = None
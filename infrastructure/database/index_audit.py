@@ -0,0 +1,287 @@
+"""Index usage and bloat report.
+
+Reads ``pg_stat_user_indexes`` and the catalogs. For each index it reports size,
+scans since the last statistics reset, whether another index makes it redundant,
+and estimated bloat. Bloat comes from ``pgstattuple`` when that extension is
+installed, otherwise from ``pg_stats`` widths and ``reltuples``.
+
+Usage:
+    python -m infrastructure.database.index_audit [--table users] [--replicas] [--json]
+
+Scan counters are per server: an index used only by queries routed to a read
+replica looks unused on the primary, so audit replicas too (``--replicas``).
+"""
+import argparse
+import asyncio
+import json
+import math
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from config.settings.base import get_settings
+from infrastructure.database.core.session import close_engine, get_engine
+
+# Flag bloat only above both thresholds; small indexes always look bloated
+BLOAT_RATIO = 0.3
+BLOAT_MIN_BYTES = 1024 * 1024
+
+# B-tree page layout: page header, special space, line pointer, index tuple header
+_PAGE_OVERHEAD = 24 + 16
+_TUPLE_OVERHEAD = 4 + 8
+_DEFAULT_FILLFACTOR = 90
+
+_INDEXES_QUERY = text("""
+    SELECT s.schemaname, s.relname AS table_name, s.indexrelname AS name, am.amname AS method,
+           pg_get_indexdef(s.indexrelid) AS definition,
+           pg_get_expr(x.indpred, x.indrelid) AS predicate,
+           x.indisunique AS is_unique, x.indisprimary AS is_primary, x.indisvalid AS is_valid,
+           x.indnkeyatts AS key_count, string_to_array(x.indkey::text, ' ')::int[] AS columns,
+           pg_relation_size(s.indexrelid) AS size_bytes, i.relpages, i.reltuples,
+           s.idx_scan AS scans, s.idx_tup_read AS tuples_read, s.idx_tup_fetch AS tuples_fetched,
+           COALESCE((SELECT substring(o FROM 'fillfactor=(\\d+)')::int FROM unnest(i.reloptions) o
+                     WHERE starts_with(o, 'fillfactor=')), :fillfactor) AS fillfactor,
+           -- Unknown for expression columns and columns without statistics
+           CASE WHEN NOT 0 = ANY(x.indkey) THEN
+               (SELECT CASE WHEN count(*) = count(st.avg_width) THEN sum(st.avg_width) END
+                  FROM pg_attribute a
+                  LEFT JOIN pg_stats st
+                    ON st.schemaname = s.schemaname AND st.tablename = s.relname AND st.attname = a.attname
+                 WHERE a.attrelid = x.indrelid AND a.attnum = ANY(x.indkey))
+           END AS key_width
+      FROM pg_stat_user_indexes s
+      JOIN pg_index x ON x.indexrelid = s.indexrelid
+      JOIN pg_class i ON i.oid = s.indexrelid
+      JOIN pg_am am ON am.oid = i.relam
+     WHERE CAST(:table AS text) IS NULL OR s.relname = :table
+     ORDER BY s.schemaname, s.relname, s.indexrelname
+""")
+
+_STATS_RESET_QUERY = text("SELECT stats_reset FROM pg_stat_database WHERE datname = current_database()")
+_PGSTATTUPLE_QUERY = text("SELECT 1 FROM pg_extension WHERE extname = 'pgstattuple'")
+_PGSTATINDEX_QUERY = text("SELECT avg_leaf_density FROM pgstatindex(CAST(:index AS regclass))")
+
+
+@dataclass
+class IndexStats:
+    """Usage and size of one index."""
+
+    schema: str
+    table: str
+    name: str
+    method: str
+    definition: str
+    predicate: str | None
+    is_unique: bool
+    is_primary: bool
+    is_valid: bool
+    columns: list[int]
+    size_bytes: int
+    scans: int
+    tuples_read: int
+    tuples_fetched: int
+    bloat_bytes: int | None = None
+    redundant_with: list[str] = field(default_factory=list)
+
+    @property
+    def unused(self) -> bool:
+        """Never scanned and not enforcing a constraint."""
+        return self.scans == 0 and not (self.is_unique or self.is_primary)
+
+    @property
+    def bloat_ratio(self) -> float | None:
+        """Share of the index that is estimated to be dead or empty space."""
+        if self.bloat_bytes is None or not self.size_bytes:
+            return None
+        return self.bloat_bytes / self.size_bytes
+
+    @property
+    def bloated(self) -> bool:
+        """Estimated bloat is worth a REINDEX CONCURRENTLY."""
+        ratio = self.bloat_ratio
+        return ratio is not None and ratio >= BLOAT_RATIO and (self.bloat_bytes or 0) >= BLOAT_MIN_BYTES
+
+    @property
+    def problems(self) -> list[str]:
+        """Human-readable findings."""
+        found = []
+        if not self.is_valid:
+            found.append("invalid")
+        if self.unused:
+            found.append("unused")
+        if self.redundant_with:
+            found.append(f"redundant with {', '.join(self.redundant_with)}")
+        if self.bloated:
+            found.append(f"bloated {self.bloat_ratio:.0%}")
+        return found
+
+
+@dataclass
+class IndexReport:
+    """Index statistics of one server."""
+
+    server: str
+    stats_reset: datetime | None
+    indexes: list[IndexStats]
+
+
+def _estimate_bloat(row: Any, block_size: int) -> int | None:
+    """Estimate B-tree bloat from tuple count and average key width."""
+    if row.method != "btree" or row.key_width is None or row.reltuples < 0:
+        return None
+    tuple_bytes = _TUPLE_OVERHEAD + math.ceil(row.key_width / 8) * 8
+    usable = (block_size - _PAGE_OVERHEAD) * row.fillfactor / 100
+    # Leaf pages plus the metapage; inner pages are a rounding error
+    expected_pages = math.ceil(row.reltuples * tuple_bytes / usable) + 1
+    return max(0, row.relpages - expected_pages) * block_size
+
+
+def _find_redundant(indexes: list[IndexStats], key_counts: dict[str, int]) -> None:
+    """Mark B-tree indexes whose key columns are a leading prefix of another one with the same predicate."""
+    for index in indexes:
+        keys = index.columns[: key_counts[index.name]]
+        # Expression columns (0) cannot be compared by number
+        if index.method != "btree" or index.is_primary or 0 in keys:
+            continue
+        for other in indexes:
+            other_keys = other.columns[: key_counts[other.name]]
+            if (
+                other is index
+                or other.method != "btree"
+                or other.table != index.table
+                or other.schema != index.schema
+                or other.predicate != index.predicate
+                or other_keys[: len(keys)] != keys
+            ):
+                continue
+            if len(other_keys) == len(keys):
+                # Identical keys: keep the constraint, or the first name among equals
+                if index.is_unique and not other.is_unique:
+                    continue
+                if index.is_unique == other.is_unique and not other.is_primary and index.name < other.name:
+                    continue
+            elif index.is_unique:
+                # A unique index on fewer columns enforces a stronger constraint
+                continue
+            index.redundant_with.append(other.name)
+
+
+async def collect_index_stats(conn: AsyncConnection, table: str | None = None) -> IndexReport:
+    """Collect statistics of user indexes (optionally of one table)."""
+    block_size = int((await conn.execute(text("SHOW block_size"))).scalar_one())
+    stats_reset = (await conn.execute(_STATS_RESET_QUERY)).scalar()
+    has_pgstattuple = (await conn.execute(_PGSTATTUPLE_QUERY)).scalar() is not None
+    rows = (await conn.execute(_INDEXES_QUERY, {"table": table, "fillfactor": _DEFAULT_FILLFACTOR})).all()
+
+    indexes = []
+    key_counts = {}
+    for row in rows:
+        bloat_bytes = _estimate_bloat(row, block_size)
+        if has_pgstattuple and row.method == "btree" and row.size_bytes:
+            # Exact leaf density; reads the whole index
+            density = (
+                await conn.execute(_PGSTATINDEX_QUERY, {"index": f'"{row.schemaname}"."{row.name}"'})
+            ).scalar()
+            if density is not None and not math.isnan(density):
+                target = row.fillfactor / 100
+                bloat_bytes = int(row.size_bytes * max(0.0, 1 - density / 100 / target))
+
+        key_counts[row.name] = row.key_count
+        indexes.append(
+            IndexStats(
+                schema=row.schemaname,
+                table=row.table_name,
+                name=row.name,
+                method=row.method,
+                definition=row.definition,
+                predicate=row.predicate,
+                is_unique=row.is_unique,
+                is_primary=row.is_primary,
+                is_valid=row.is_valid,
+                columns=row.columns,
+                size_bytes=row.size_bytes,
+                scans=row.scans or 0,
+                tuples_read=row.tuples_read or 0,
+                tuples_fetched=row.tuples_fetched or 0,
+                bloat_bytes=bloat_bytes,
+            )
+        )
+
+    _find_redundant(indexes, key_counts)
+    return IndexReport(server=conn.engine.url.render_as_string(), stats_reset=stats_reset, indexes=indexes)
+
+
+async def audit_indexes(engine: AsyncEngine, table: str | None = None) -> IndexReport:
+    """Collect index statistics of the database behind ``engine``."""
+    async with engine.connect() as conn:
+        return await collect_index_stats(conn, table)
+
+
+def _format_size(size: int | None) -> str:
+    if size is None:
+        return "-"
+    for unit in ("B", "kB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return str(size)
+
+
+def format_report(report: IndexReport) -> str:
+    """Render report as a text table."""
+    since = report.stats_reset.isoformat(timespec="seconds") if report.stats_reset else "cluster start"
+    lines = [f"{report.server} (scans since {since})"]
+    header = f"{'index':<40} {'size':>10} {'scans':>12} {'tup read':>12} {'bloat':>10}  problems"
+    lines += [header, "-" * len(header)]
+    for index in report.indexes:
+        lines.append(
+            f"{index.table + '.' + index.name:<40} {_format_size(index.size_bytes):>10} {index.scans:>12} "
+            f"{index.tuples_read:>12} {_format_size(index.bloat_bytes):>10}  {'; '.join(index.problems)}"
+        )
+    return "\n".join(lines)
+
+
+def _to_json(report: IndexReport) -> dict[str, Any]:
+    data = asdict(report)
+    for index, item in zip(report.indexes, data["indexes"], strict=True):
+        item["unused"] = index.unused
+        item["bloat_ratio"] = index.bloat_ratio
+        item["problems"] = index.problems
+    data["stats_reset"] = report.stats_reset.isoformat() if report.stats_reset else None
+    return data
+
+
+async def main() -> None:
+    """Print index report of the primary (and replicas)."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--table", help="only indexes of this table")
+    parser.add_argument("--replicas", action="store_true", help="also audit configured read replicas")
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args()
+
+    engines = [get_engine()]
+    if args.replicas:
+        engines += [
+            create_async_engine(url, poolclass=NullPool)
+            for url in get_settings().database.replica_async_urls
+        ]
+
+    try:
+        reports = [await audit_indexes(engine, args.table) for engine in engines]
+    finally:
+        for engine in engines[1:]:
+            await engine.dispose()
+        await close_engine()
+
+    if args.json:
+        print(json.dumps([_to_json(report) for report in reports], indent=2))
+    else:
+        print("\n\n".join(format_report(report) for report in reports))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
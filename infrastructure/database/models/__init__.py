@@ -1,3 +1,6 @@
 from .base import Base as Base
+from .broadcasts import Broadcast as Broadcast
+from .fsm_states import FsmState as FsmState
+from .user_stats import UserStat as UserStat
 from .users import User as User
 # === IMPORT NEW MODELS ABOVE ===
@@ -0,0 +1,47 @@
+"""Broadcast model."""
+from datetime import datetime
+
+from sqlalchemy import BIGINT, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from shared.enums import BroadcastStatus, UserStatus
+
+from .base import Base, TableNameMixin, TimestampMixin, int_pk
+
+
+class Broadcast(Base, TableNameMixin, TimestampMixin):
+    """Mass message to users, with a resumable progress checkpoint."""
+
+    id: Mapped[int_pk]
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    status: Mapped[str] = mapped_column(
+        String(20), server_default=BroadcastStatus.PENDING.value, nullable=False, index=True
+    )
+    created_by: Mapped[int | None] = mapped_column(BIGINT, nullable=True)
+
+    # Recipient filters
+    user_status: Mapped[str] = mapped_column(String(20), server_default=UserStatus.ACTIVE.value, nullable=False)
+    language: Mapped[str | None] = mapped_column(String(2), nullable=True)
+    active_within_hours: Mapped[int | None] = mapped_column(nullable=True)
+
+    # Progress checkpoint: recipients are processed in users.id order
+    last_user_id: Mapped[int] = mapped_column(server_default="0", nullable=False)
+    total_recipients: Mapped[int | None] = mapped_column(nullable=True)
+    sent_count: Mapped[int] = mapped_column(server_default="0", nullable=False)
+    failed_count: Mapped[int] = mapped_column(server_default="0", nullable=False)
+    blocked_count: Mapped[int] = mapped_column(server_default="0", nullable=False)
+
+    # Instance sending the broadcast; its claim lapses when heartbeat_at gets stale
+    owner: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(nullable=True)
+
+    started_at: Mapped[datetime | None] = mapped_column(nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(nullable=True)
+
+    @property
+    def processed_count(self) -> int:
+        """Number of recipients already processed."""
+        return self.sent_count + self.failed_count + self.blocked_count
+
+    def __repr__(self) -> str:
+        return f"<Broadcast id={self.id} status={self.status} processed={self.processed_count}>"
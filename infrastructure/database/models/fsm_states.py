@@ -0,0 +1,25 @@
+"""FSM state model."""
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql.functions import func
+
+from .base import Base
+
+
+class FsmState(Base):
+    """FSM state and data of one storage key (chat, user, thread, destiny)."""
+
+    __tablename__ = "fsm_states"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    state: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    data: Mapped[dict[str, Any]] = mapped_column(JSONB, server_default="{}", nullable=False)
+    # Abandoned records are deleted by age
+    updated_at: Mapped[datetime] = mapped_column(server_default=func.now(), nullable=False, index=True)
+
+    def __repr__(self) -> str:
+        return f"<FsmState key={self.key} state={self.state}>"
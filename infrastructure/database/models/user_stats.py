@@ -0,0 +1,25 @@
+"""User statistics rollup model."""
+from sqlalchemy import BIGINT, SmallInteger, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class UserStat(Base):
+    """One shard of a user counter, kept up to date by triggers on ``users``.
+
+    ``dimension``/``key`` pairs: ``total``/``""``, ``status``/``role``/``language``
+    with the column value, and daily ``new``/``active`` with a ``YYYY-MM-DD`` key.
+    Each database backend increments its own ``shard`` row so concurrent
+    transactions do not contend on one counter; the value is the sum over shards.
+    """
+
+    __tablename__ = "user_stats"
+
+    dimension: Mapped[str] = mapped_column(String(16), primary_key=True)
+    key: Mapped[str] = mapped_column(String(32), primary_key=True)
+    shard: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    value: Mapped[int] = mapped_column(BIGINT, server_default="0", nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<UserStat {self.dimension}:{self.key} shard={self.shard} value={self.value}>"
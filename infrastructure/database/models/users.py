@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import BIGINT, ForeignKey, String
+from sqlalchemy import BIGINT, ForeignKey, Index, String, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from shared.enums import Language, UserRole, UserStatus
@@ -14,12 +14,24 @@ from .base import Base, TableNameMixin, TimestampMixin, int_pk
 class User(Base, TableNameMixin, TimestampMixin):
     """User model representing Telegram bot users."""
 
+    # Indexes follow UserRepository query shapes; each one costs every non-HOT activity update
+    __table_args__ = (
+        Index(
+            "ix_users_active_last_activity_at",
+            "last_activity_at",
+            postgresql_where=text(f"status = '{UserStatus.ACTIVE.value}'"),
+        ),
+        Index("ix_users_privileged_role", "role", postgresql_where=text(f"role <> '{UserRole.USER.value}'")),
+        Index("ix_users_username_not_null", "username", postgresql_where=text("username IS NOT NULL")),
+        Index("ix_users_referrer_id_not_null", "referrer_id", postgresql_where=text("referrer_id IS NOT NULL")),
+    )
+
     # Primary key
     id: Mapped[int_pk]
     telegram_id: Mapped[int] = mapped_column(BIGINT, unique=True, index=True, nullable=False)
 
     # Basic info
-    username: Mapped[str | None] = mapped_column(String(255), index=True, nullable=True)
+    username: Mapped[str | None] = mapped_column(String(255), nullable=True)
     first_name: Mapped[str] = mapped_column(String(255), nullable=False)
     last_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
@@ -30,15 +42,15 @@ class User(Base, TableNameMixin, TimestampMixin):
 
     # Status and role
     status: Mapped[str] = mapped_column(
-        String(20), server_default=UserStatus.ACTIVE.value, nullable=False, index=True
+        String(20), server_default=UserStatus.ACTIVE.value, nullable=False
     )
     role: Mapped[str] = mapped_column(
-        String(20), server_default=UserRole.USER.value, nullable=False, index=True
+        String(20), server_default=UserRole.USER.value, nullable=False
     )
 
     # Referral system
     referrer_id: Mapped[int | None] = mapped_column(
-        ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True
+        ForeignKey("users.id", ondelete="SET NULL"), nullable=True
     )
     referrer: Mapped[User | None] = relationship(
         "User", back_populates="referrals", foreign_keys=[referrer_id], remote_side=lambda: [User.id]
@@ -48,7 +60,7 @@ class User(Base, TableNameMixin, TimestampMixin):
     )
 
     # Analytics
-    last_activity_at: Mapped[datetime | None] = mapped_column(nullable=True, index=True)
+    last_activity_at: Mapped[datetime | None] = mapped_column(nullable=True)
     total_messages: Mapped[int] = mapped_column(server_default="0", nullable=False)
 
     @property
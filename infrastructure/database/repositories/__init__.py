@@ -1,11 +1,18 @@
 """Repositories module."""
-from infrastructure.database.repositories.base import BaseRepository
+from infrastructure.database.repositories.base import BaseRepository, BulkUpsertResult
+from infrastructure.database.repositories.broadcast_repository import BroadcastRepository
+from infrastructure.database.repositories.fsm_state_repository import FsmStateRepository
 from infrastructure.database.repositories.user_repository import UserRepository
+from infrastructure.database.repositories.user_stats_repository import UserStatsRepository
 
 # === IMPORT NEW REPOSITORIES ABOVE ===
 
 __all__ = [
     "BaseRepository",
+    "BulkUpsertResult",
     "UserRepository",
+    "BroadcastRepository",
+    "UserStatsRepository",
+    "FsmStateRepository",
     # === EXPORT NEW REPOSITORIES ABOVE ===
 ]
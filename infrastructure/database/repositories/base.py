@@ -1,14 +1,49 @@
 """Base repository with common CRUD operations."""
-from collections.abc import Sequence
+import uuid
+from collections.abc import AsyncIterator, Iterable, Sequence
+from dataclasses import dataclass
 from typing import Any, Generic, TypeVar
 
-from sqlalchemy import delete, func, select, update
+from sqlalchemy import Boolean, ColumnElement, column, delete, func, literal_column, select, table, text, tuple_, update
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import Insert, insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ClauseElement, TextClause
 
+from infrastructure.database.core.replicas import replica_read
+from infrastructure.database.core.session import mark_writes
 from infrastructure.database.models.base import Base
+from shared.exceptions.base import DatabaseError
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+# asyncpg limit on bind parameters per statement
+MAX_BIND_PARAMS = 32767
+
+
+def render_once(stmt: ClauseElement) -> TextClause:
+    """Render a statement SQLAlchemy cannot cache into cacheable SQL text.
+
+    PostgreSQL ``INSERT ... ON CONFLICT`` has no cache key, so it is compiled
+    again on every execution. Build it once with named ``bindparam`` values
+    and execute the result with a params dict; use ``.columns()`` and
+    ``select(...).from_statement()`` to get typed or ORM rows back.
+    """
+    return text(str(stmt.compile(dialect=postgresql.dialect(paramstyle="named"))))
+
+
+@dataclass
+class BulkUpsertResult:
+    """Result of a bulk upsert."""
+
+    inserted: int = 0
+    updated: int = 0
+
+    @property
+    def total(self) -> int:
+        """Total affected rows."""
+        return self.inserted + self.updated
+
 
 class BaseRepository(Generic[ModelType]):
     """Base repository for all database operations."""
@@ -46,6 +81,85 @@ class BaseRepository(Generic[ModelType]):
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def get_page(
+        self,
+        *criteria: ColumnElement[bool],
+        limit: int = 100,
+        after: Any = None,
+        order_by: str = "id",
+        descending: bool = False,
+        **filters,
+    ) -> Sequence[ModelType]:
+        """Get page of models using keyset (seek) pagination.
+
+        Pass the ``order_by`` value of the last row of the previous page as ``after``;
+        for a column other than ``id`` pass a ``(value, id)`` tuple, ``id`` breaking
+        ties in the same direction. Each page is an index range scan, so cost does
+        not grow with page depth like OFFSET does. ``order_by`` should be an
+        indexed, non-nullable column.
+        """
+        column = getattr(self.model, order_by)
+        stmt = select(self.model).where(*criteria).filter_by(**filters)
+        keys = [column] if order_by == "id" else [column, self.model.id]
+
+        stmt = stmt.order_by(*(key.desc() for key in keys) if descending else keys)
+        if after is not None:
+            position = tuple_(*keys) if len(keys) > 1 else column
+            bound = tuple_(*after) if len(keys) > 1 else after
+            stmt = stmt.where(position < bound if descending else position > bound)
+
+        result = await self.session.execute(stmt.limit(limit))
+        return result.scalars().all()
+
+    async def iter_pages(
+        self,
+        *criteria: ColumnElement[bool],
+        chunk_size: int = 1000,
+        order_by: str = "id",
+        descending: bool = False,
+        **filters,
+    ) -> AsyncIterator[Sequence[ModelType]]:
+        """Iterate over all matching models in keyset-paginated chunks."""
+        after = None
+        while True:
+            page = await self.get_page(
+                *criteria, limit=chunk_size, after=after, order_by=order_by, descending=descending, **filters
+            )
+            if not page:
+                return
+            yield page
+            if len(page) < chunk_size:
+                return
+            last = page[-1]
+            after = last.id if order_by == "id" else (getattr(last, order_by), last.id)
+
+    async def stream(
+        self,
+        *criteria: ColumnElement[bool],
+        chunk_size: int = 1000,
+        **filters,
+    ) -> AsyncIterator[Sequence[ModelType]]:
+        """Stream all matching models in chunks through a server-side cursor.
+
+        Memory stays bounded by ``chunk_size`` regardless of table size. Server-side
+        cursors need a transaction, so read-only (autocommit) sessions fall back to
+        ``iter_pages``.
+        """
+        if self.session.info.get("read_only"):
+            async for page in self.iter_pages(*criteria, chunk_size=chunk_size, **filters):
+                yield page
+            return
+
+        stmt = (
+            select(self.model)
+            .where(*criteria)
+            .filter_by(**filters)
+            .execution_options(yield_per=chunk_size)
+        )
+        result = await self.session.stream_scalars(stmt)
+        async for partition in result.partitions():
+            yield partition
+
     async def create(self, **kwargs) -> ModelType:
         """Create new model."""
         instance = self.model(**kwargs)
@@ -61,6 +175,112 @@ class BaseRepository(Generic[ModelType]):
         await self.session.flush()
         return instances
 
+    async def upsert_many(
+        self,
+        data: list[dict[str, Any]],
+        conflict_columns: Sequence[str] = ("id",),
+        update_columns: Sequence[str] | None = None,
+        batch_size: int = 1000,
+    ) -> BulkUpsertResult:
+        """Insert or update multiple rows with multi-row ``INSERT ... ON CONFLICT``.
+
+        ``update_columns`` defaults to every provided column except the conflict
+        columns; pass an empty sequence to skip existing rows (``DO NOTHING``).
+        Duplicate conflict keys in ``data`` are collapsed, the last one wins.
+        """
+        self._check_writable("Bulk upsert")
+        result = BulkUpsertResult()
+        if not data:
+            return result
+
+        columns = list(data[0])
+        if update_columns is None:
+            update_columns = [col for col in columns if col not in conflict_columns]
+
+        # One statement cannot affect the same row twice
+        rows = list({tuple(item[col] for col in conflict_columns): item for item in data}.values())
+        batch_size = max(1, min(batch_size, MAX_BIND_PARAMS // len(columns)))
+
+        for start in range(0, len(rows), batch_size):
+            stmt = insert(self.model).values(rows[start : start + batch_size])
+            batch = await self._merge(stmt, conflict_columns, update_columns)
+            result.inserted += batch.inserted
+            result.updated += batch.updated
+
+        return result
+
+    async def copy_upsert(
+        self,
+        records: Iterable[Sequence[Any]],
+        columns: Sequence[str],
+        conflict_columns: Sequence[str] = ("id",),
+        update_columns: Sequence[str] | None = None,
+    ) -> BulkUpsertResult:
+        """Bulk upsert for very large loads via COPY into a staging table.
+
+        Records are streamed with asyncpg ``copy_records_to_table`` into a temporary
+        table, then merged with a single ``INSERT ... SELECT ... ON CONFLICT``.
+        Duplicate conflict keys are collapsed (an arbitrary one wins).
+        """
+        self._check_writable("COPY upsert")
+        if update_columns is None:
+            update_columns = [col for col in columns if col not in conflict_columns]
+
+        connection = await self.session.connection()
+        quote = connection.dialect.identifier_preparer.quote
+        staging_name = f"_staging_{self.model.__tablename__}_{uuid.uuid4().hex[:8]}"
+        column_list = ", ".join(quote(col) for col in columns)
+
+        await self.session.execute(
+            text(
+                f"CREATE TEMP TABLE {quote(staging_name)} ON COMMIT DROP AS "
+                f"SELECT {column_list} FROM {quote(self.model.__tablename__)} WITH NO DATA"
+            )
+        )
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            staging_name, records=records, columns=list(columns)
+        )
+
+        staging = table(staging_name, *(column(col) for col in columns))
+        key = [staging.c[col] for col in conflict_columns]
+        source = select(*staging.c).distinct(*key).order_by(*key)
+        stmt = insert(self.model).from_select(list(columns), source)
+
+        result = await self._merge(stmt, conflict_columns, update_columns)
+        await self.session.execute(text(f"DROP TABLE {quote(staging_name)}"))
+        return result
+
+    async def _merge(
+        self,
+        stmt: Insert,
+        conflict_columns: Sequence[str],
+        update_columns: Sequence[str],
+    ) -> BulkUpsertResult:
+        """Execute insert with ON CONFLICT clause and count inserted/updated rows."""
+        if update_columns:
+            set_ = {col: stmt.excluded[col] for col in update_columns}
+            if "updated_at" in self.model.__table__.c:
+                set_["updated_at"] = func.now()
+            stmt = stmt.on_conflict_do_update(index_elements=list(conflict_columns), set_=set_)
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+
+        merged = stmt.returning(literal_column("xmax = 0", Boolean).label("inserted")).cte("merged")
+        counts = select(
+            func.count().filter(merged.c.inserted),
+            func.count().filter(~merged.c.inserted),
+        )
+        # A SELECT over the INSERT: mark the write so it is committed and never routed to a replica
+        mark_writes(self.session)
+        inserted, updated = (await self.session.execute(counts)).one()
+        return BulkUpsertResult(inserted=inserted, updated=updated)
+
+    def _check_writable(self, operation: str) -> None:
+        """Reject a write the session cannot detect by statement type in a read-only session."""
+        if self.session.info.get("read_only"):
+            raise DatabaseError(f"{operation} in read-only session")
+
     async def update(self, id: Any, **kwargs) -> ModelType | None:
         """Update model by ID."""
         stmt = (
@@ -80,12 +300,14 @@ class BaseRepository(Generic[ModelType]):
         await self.session.flush()
         return result.rowcount > 0
 
+    @replica_read
     async def count(self, **filters) -> int:
         """Count models with optional filters."""
         stmt = select(func.count()).select_from(self.model).filter_by(**filters)
         result = await self.session.execute(stmt)
         return result.scalar() or 0
 
+    @replica_read
     async def exists(self, **filters) -> bool:
         """Check if model exists."""
         count = await self.count(**filters)
@@ -0,0 +1,91 @@
+"""Broadcast repository."""
+from datetime import datetime
+
+from sqlalchemy import or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.database.models.broadcasts import Broadcast
+from infrastructure.database.repositories.base import BaseRepository
+from shared.enums import BroadcastStatus
+
+_UNFINISHED = (BroadcastStatus.PENDING.value, BroadcastStatus.RUNNING.value)
+
+
+class BroadcastRepository(BaseRepository[Broadcast]):
+    """Repository for Broadcast model."""
+
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, Broadcast)
+
+    async def claim_unfinished(self, owner: str, stale_before: datetime) -> list[int]:
+        """Claim unfinished broadcasts that are unowned, owned by ``owner`` or whose owner went silent.
+
+        Rows are locked with ``SKIP LOCKED``, so concurrent claimers never get the same
+        broadcast. Returns claimed IDs.
+        """
+        claimable = (
+            select(Broadcast.id)
+            .where(
+                Broadcast.status.in_(_UNFINISHED),
+                or_(
+                    Broadcast.owner.is_(None),
+                    Broadcast.owner == owner,
+                    Broadcast.heartbeat_at < stale_before,
+                ),
+            )
+            .order_by(Broadcast.id)
+            .with_for_update(skip_locked=True)
+        )
+        stmt = (
+            update(Broadcast)
+            .where(Broadcast.id.in_(claimable.scalar_subquery()))
+            .values(owner=owner, heartbeat_at=datetime.utcnow())
+            .returning(Broadcast.id)
+        )
+        result = await self.session.execute(stmt)
+        return sorted(result.scalars().all())
+
+    async def release(self, owner: str) -> None:
+        """Give up claims on unfinished broadcasts, so another instance resumes them right away."""
+        stmt = (
+            update(Broadcast)
+            .where(Broadcast.owner == owner, Broadcast.status.in_(_UNFINISHED))
+            .values(owner=None, heartbeat_at=None)
+        )
+        await self.session.execute(stmt)
+
+    async def save_progress(
+        self, broadcast_id: int, owner: str, last_user_id: int, sent: int, failed: int, blocked: int
+    ) -> bool:
+        """Advance checkpoint, add chunk counters and renew the claim.
+
+        Returns False when ``owner`` no longer runs the broadcast (cancelled or claimed
+        by another instance); nothing is saved then.
+        """
+        stmt = (
+            update(Broadcast)
+            .where(
+                Broadcast.id == broadcast_id,
+                Broadcast.owner == owner,
+                Broadcast.status == BroadcastStatus.RUNNING.value,
+            )
+            .values(
+                last_user_id=last_user_id,
+                sent_count=Broadcast.sent_count + sent,
+                failed_count=Broadcast.failed_count + failed,
+                blocked_count=Broadcast.blocked_count + blocked,
+                heartbeat_at=datetime.utcnow(),
+            )
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount > 0
+
+    async def set_status(self, broadcast_id: int, status: BroadcastStatus) -> None:
+        """Change broadcast status, stamping start/finish time."""
+        values: dict = {"status": status.value}
+        if status == BroadcastStatus.RUNNING:
+            values["started_at"] = datetime.utcnow()
+        elif status in (BroadcastStatus.COMPLETED, BroadcastStatus.CANCELLED):
+            values["finished_at"] = datetime.utcnow()
+        stmt = update(Broadcast).where(Broadcast.id == broadcast_id).values(**values)
+        await self.session.execute(stmt)
@@ -0,0 +1,75 @@
+"""FSM state repository."""
+from collections.abc import Sequence
+from typing import Any
+
+from sqlalchemy import String, column, delete, func, select, text, values
+from sqlalchemy.dialects.postgresql import JSONB, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.database.models.fsm_states import FsmState
+
+FsmRecord = tuple[str | None, dict[str, Any]]
+
+_NOTIFY = text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload")
+
+
+class FsmStateRepository:
+    """Reads and writes FSM records keyed by storage key."""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get(self, key: str) -> FsmRecord | None:
+        """Get (state, data) of a key, or None if nothing is stored."""
+        result = await self.session.execute(select(FsmState.state, FsmState.data).where(FsmState.key == key))
+        row = result.first()
+        return (row.state, row.data) if row is not None else None
+
+    async def save_many(self, records: Sequence[tuple[str, str | None, dict[str, Any]]]) -> None:
+        """Upsert (key, state, data) records in one statement."""
+        if not records:
+            return
+
+        rows = values(
+            column("key", String),
+            column("state", String),
+            column("data", JSONB),
+            name="records",
+        ).data(list(records))
+        stmt = insert(FsmState).from_select(
+            [FsmState.key, FsmState.state, FsmState.data],
+            select(rows.c.key, rows.c.state, rows.c.data),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FsmState.key],
+            set_={
+                FsmState.state: stmt.excluded.state,
+                FsmState.data: stmt.excluded.data,
+                FsmState.updated_at: func.now(),
+            },
+        )
+        await self.session.execute(stmt)
+
+    async def delete_many(self, keys: Sequence[str]) -> None:
+        """Delete records of keys."""
+        if keys:
+            await self.session.execute(delete(FsmState).where(FsmState.key.in_(keys)))
+
+    async def delete_expired(self, ttl: int, limit: int = 10_000) -> list[str]:
+        """Delete up to ``limit`` records not written for ``ttl`` seconds. Returns their keys."""
+        expired = (
+            select(FsmState.key)
+            .where(FsmState.updated_at < func.now() - func.make_interval(0, 0, 0, 0, 0, 0, ttl))
+            .order_by(FsmState.updated_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self.session.execute(
+            delete(FsmState).where(FsmState.key.in_(expired.scalar_subquery())).returning(FsmState.key)
+        )
+        return list(result.scalars().all())
+
+    async def notify(self, channel: str, payloads: Sequence[str]) -> None:
+        """Send NOTIFY payloads, delivered to listeners on commit."""
+        if payloads:
+            await self.session.execute(_NOTIFY, {"channel": channel, "payloads": list(payloads)})
@@ -1,66 +1,300 @@
 """User repository with user-specific operations."""
-from datetime import datetime, timedelta
+from collections.abc import AsyncIterator, Sequence
+from datetime import date, datetime, timedelta
 
-from sqlalchemy import func, select
+from sqlalchemy import (
+    BIGINT,
+    Boolean,
+    ColumnElement,
+    DateTime,
+    Integer,
+    Select,
+    bindparam,
+    column,
+    delete,
+    exists,
+    false,
+    func,
+    literal_column,
+    or_,
+    select,
+    true,
+    union_all,
+    update,
+    values,
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from infrastructure.database.core.replicas import replica_read
+from infrastructure.database.core.session import mark_writes
 from infrastructure.database.models.users import User
-from infrastructure.database.repositories.base import BaseRepository
-from shared.dto.user import UserCreateDTO, UserUpdateDTO
-from shared.enums import UserStatus
+from infrastructure.database.repositories.base import BaseRepository, BulkUpsertResult, render_once
+from infrastructure.database.repositories.user_stats_repository import UserStatsRepository
+from infrastructure.database.user_cache import INVALIDATIONS_KEY, UserCache
+from shared.dto.user import UserCreateDTO, UserSnapshotDTO, UserUpdateDTO
+from shared.enums import UserRole, UserStatDimension, UserStatus
+
+# Row count from which sync_users switches to COPY
+COPY_THRESHOLD = 10_000
+
+# session.info key of {telegram_id: role} changed in the current transaction, see RoleIndex
+ROLE_CHANGES_KEY = "role_changes"
+
+
+def _build_get_or_create() -> Select:
+    """Build the ``get_or_create`` upsert: rows of (User, created, written)."""
+    insert_stmt = insert(User).values(
+        telegram_id=bindparam("telegram_id"),
+        username=bindparam("username"),
+        first_name=bindparam("first_name"),
+        last_name=bindparam("last_name"),
+        language=bindparam("language"),
+        last_activity_at=bindparam("last_activity_at"),
+    )
+    excluded = insert_stmt.excluded
+    upsert = insert_stmt.on_conflict_do_update(
+        index_elements=[User.telegram_id],
+        set_={
+            User.username: excluded.username,
+            User.first_name: excluded.first_name,
+            User.last_name: excluded.last_name,
+            User.language: excluded.language,
+            User.updated_at: func.now(),
+        },
+        where=or_(
+            User.username.is_distinct_from(excluded.username),
+            User.first_name.is_distinct_from(excluded.first_name),
+            User.last_name.is_distinct_from(excluded.last_name),
+            User.language.is_distinct_from(excluded.language),
+        ),
+    ).returning(
+        *User.__table__.c,
+        literal_column("xmax = 0", Boolean).label("created"),
+        true().label("written"),
+    )
+    upserted = upsert.cte("upserted")
+
+    # Skipped updates return no rows from the CTE, so fall back to the current row
+    unchanged = select(*User.__table__.c, false().label("created"), false().label("written")).where(
+        User.telegram_id == bindparam("telegram_id"),
+        ~exists(select(upserted.c.id)),
+    )
+    rows = render_once(union_all(select(upserted), unchanged)).columns(
+        *User.__table__.c, column("created", Boolean), column("written", Boolean)
+    )
+    return (
+        select(User, rows.selected_columns.created, rows.selected_columns.written)
+        .from_statement(rows)
+        .execution_options(populate_existing=True)
+    )
+
+
+_GET_OR_CREATE = _build_get_or_create()
 
 
 class UserRepository(BaseRepository[User]):
     """Repository for User model."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, cache: UserCache | None = None):
         super().__init__(session, User)
+        self.cache = cache
+        # Users written in this session must not be cached before commit
+        self._written: set[int] = set()
 
     async def get_by_telegram_id(self, telegram_id: int) -> User | None:
         """Get user by Telegram ID."""
         return await self.get_by(telegram_id=telegram_id)
 
+    async def get_snapshot(self, telegram_id: int) -> UserSnapshotDTO | None:
+        """Get detached user snapshot by Telegram ID, served from cache when possible."""
+        if self.cache is not None:
+            snapshot = self.cache.get(telegram_id)
+            if snapshot is not None:
+                return snapshot
+
+        user = await self.get_by_telegram_id(telegram_id)
+        if user is None:
+            return None
+
+        snapshot = UserSnapshotDTO.model_validate(user)
+        self._cache_snapshot(snapshot)
+        return snapshot
+
+    def _cache_snapshot(self, snapshot: UserSnapshotDTO) -> None:
+        """Store snapshot unless the user has uncommitted writes in this session."""
+        if self.cache is not None and snapshot.telegram_id not in self._written:
+            self.cache.set(snapshot)
+
+    def _invalidate(self, telegram_id: int) -> None:
+        """Drop cached snapshot after a write, and again once the write commits."""
+        self._written.add(telegram_id)
+        if self.cache is not None:
+            self.cache.invalidate(telegram_id)
+            # Another session may cache the old row before this one commits
+            self.session.info.setdefault(INVALIDATIONS_KEY, {}).setdefault(self.cache, set()).add(telegram_id)
+
+    def _record_role(self, telegram_id: int, role: UserRole) -> None:
+        """Remember a role change; ``RoleIndex`` applies it when the transaction commits."""
+        self.session.info.setdefault(ROLE_CHANGES_KEY, {})[telegram_id] = role
+
     async def get_by_username(self, username: str) -> User | None:
         """Get user by username."""
         return await self.get_by(username=username)
 
     async def get_or_create(self, dto: UserCreateDTO) -> tuple[User, bool]:
-        """Get existing user or create new one. Returns (user, created)."""
-        user = await self.get_by_telegram_id(dto.telegram_id)
-
-        if user:
-            # Update user data
-            user.username = dto.username
-            user.first_name = dto.first_name
-            user.last_name = dto.last_name
-            user.language = dto.language.value
-            user.last_activity_at = datetime.utcnow()
-            await self.session.flush()
+        """Upsert user in a single round trip. Returns (user, created).
+
+        Runs ``INSERT ... ON CONFLICT (telegram_id) DO UPDATE ... RETURNING``. The update
+        branch only fires when profile fields differ; otherwise the existing row is read
+        back in the same statement, so unchanged users cost no write. Activity of existing
+        users is tracked by ``ActivityBuffer``. The statement is rendered once at import
+        (see ``_build_get_or_create``), so calls skip SQL compilation.
+        """
+        params = {
+            "telegram_id": dto.telegram_id,
+            "username": dto.username,
+            "first_name": dto.first_name,
+            "last_name": dto.last_name,
+            "language": dto.language.value,
+            "last_activity_at": datetime.utcnow(),
+        }
+        result = await self.session.execute(_GET_OR_CREATE, params)
+        record = result.first()
+        if record is None:
+            # Row committed by a concurrent insert after our snapshot was taken
+            self._invalidate(dto.telegram_id)
+            user = await self.get_by_telegram_id(dto.telegram_id)
             return user, False
 
-        # Create new user
-        user = await self.create(
-            telegram_id=dto.telegram_id,
-            username=dto.username,
-            first_name=dto.first_name,
-            last_name=dto.last_name,
-            language=dto.language.value,
-            last_activity_at=datetime.utcnow(),
+        user, created, written = record
+        if written:
+            # The upsert runs as a SELECT, which the session does not count as a write
+            mark_writes(self.session)
+            self._invalidate(dto.telegram_id)
+        elif self.cache is not None:
+            self._cache_snapshot(UserSnapshotDTO.model_validate(user))
+        return user, created
+
+    async def sync_users(self, dtos: Sequence[UserCreateDTO]) -> BulkUpsertResult:
+        """Bulk insert or update users from an external source, matched by Telegram ID.
+
+        Uses COPY into a staging table from ``COPY_THRESHOLD`` rows on,
+        multi-row ``INSERT ... ON CONFLICT`` below it.
+        """
+        columns = ("telegram_id", "username", "first_name", "last_name", "language")
+        conflict_columns = ("telegram_id",)
+
+        if len(dtos) >= COPY_THRESHOLD:
+            records = (
+                (dto.telegram_id, dto.username, dto.first_name, dto.last_name, dto.language.value) for dto in dtos
+            )
+            result = await self.copy_upsert(records, columns, conflict_columns)
+        else:
+            data = [
+                {
+                    "telegram_id": dto.telegram_id,
+                    "username": dto.username,
+                    "first_name": dto.first_name,
+                    "last_name": dto.last_name,
+                    "language": dto.language.value,
+                }
+                for dto in dtos
+            ]
+            result = await self.upsert_many(data, conflict_columns)
+
+        for dto in dtos:
+            self._invalidate(dto.telegram_id)
+        return result
+
+    async def update(self, id: int, **kwargs) -> User | None:
+        """Update user by ID and invalidate its cached snapshot."""
+        user = await super().update(id, **kwargs)
+        if user is not None:
+            self._invalidate(user.telegram_id)
+            if "role" in kwargs:
+                self._record_role(user.telegram_id, UserRole(kwargs["role"]))
+        return user
+
+    async def delete(self, id: int) -> bool:
+        """Delete user by ID and invalidate its cached snapshot."""
+        stmt = delete(User).where(User.id == id).returning(User.telegram_id)
+        result = await self.session.execute(stmt)
+        telegram_id = result.scalar_one_or_none()
+        if telegram_id is None:
+            return False
+        self._invalidate(telegram_id)
+        self._record_role(telegram_id, UserRole.USER)
+        return True
+
+    async def set_status(self, telegram_id: int, status: UserStatus) -> bool:
+        """Change user status by Telegram ID."""
+        return await self._update_by_telegram_id(telegram_id, status=status.value)
+
+    async def set_role(self, telegram_id: int, role: UserRole) -> bool:
+        """Change user role by Telegram ID."""
+        updated = await self._update_by_telegram_id(telegram_id, role=role.value)
+        if updated:
+            self._record_role(telegram_id, role)
+        return updated
+
+    async def set_status_many(self, telegram_ids: Sequence[int], status: UserStatus) -> int:
+        """Change status of multiple users by Telegram ID. Returns number of updated users."""
+        if not telegram_ids:
+            return 0
+        stmt = (
+            update(User)
+            .where(User.telegram_id.in_(telegram_ids))
+            .values(status=status.value, updated_at=func.now())
+            .execution_options(synchronize_session=False)
         )
-        return user, True
+        result = await self.session.execute(stmt)
+        for telegram_id in telegram_ids:
+            self._invalidate(telegram_id)
+        return result.rowcount
+
+    async def _update_by_telegram_id(self, telegram_id: int, **kwargs) -> bool:
+        """Update user columns by Telegram ID."""
+        stmt = (
+            update(User)
+            .where(User.telegram_id == telegram_id)
+            .values(**kwargs, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        self._invalidate(telegram_id)
+        return result.rowcount > 0
 
     async def update_user(self, user_id: int, dto: UserUpdateDTO) -> User | None:
         """Update user with DTO."""
         data = dto.model_dump(exclude_none=True)
         return await self.update(user_id, **data)
 
-    async def increment_messages(self, user_id: int) -> None:
-        """Increment user's message count."""
-        user = await self.get(user_id)
-        if user:
-            user.total_messages += 1
-            user.last_activity_at = datetime.utcnow()
-            await self.session.flush()
+    async def apply_activity(self, rows: list[tuple[int, int, datetime]]) -> int:
+        """Apply aggregated (telegram_id, messages, last_activity_at) rows in one UPDATE.
+
+        Returns number of updated users.
+        """
+        if not rows:
+            return 0
+
+        activity = values(
+            column("telegram_id", BIGINT),
+            column("messages", Integer),
+            column("last_activity_at", DateTime),
+            name="activity",
+        ).data(rows)
+        stmt = (
+            update(User)
+            .where(User.telegram_id == activity.c.telegram_id)
+            .values(
+                total_messages=User.total_messages + activity.c.messages,
+                last_activity_at=func.greatest(User.last_activity_at, activity.c.last_activity_at),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount
 
     async def get_active_users(self, period_hours: int = 24) -> list[User]:
         """Get users active in the last N hours."""
@@ -73,6 +307,64 @@ class UserRepository(BaseRepository[User]):
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
+    async def iter_active_users(
+        self, period_hours: int = 24, chunk_size: int = 1000
+    ) -> AsyncIterator[Sequence[User]]:
+        """Stream users active in the last N hours in chunks (constant memory)."""
+        since = datetime.utcnow() - timedelta(hours=period_hours)
+        async for chunk in self.stream(
+            User.last_activity_at >= since,
+            chunk_size=chunk_size,
+            status=UserStatus.ACTIVE.value,
+        ):
+            yield chunk
+
+    @staticmethod
+    def _recipient_criteria(
+        status: UserStatus, language: str | None, active_since: datetime | None
+    ) -> list[ColumnElement[bool]]:
+        """Build WHERE criteria for broadcast recipients."""
+        criteria = [User.status == status.value]
+        if language is not None:
+            criteria.append(User.language == language)
+        if active_since is not None:
+            criteria.append(User.last_activity_at >= active_since)
+        return criteria
+
+    async def get_recipients(
+        self,
+        after_id: int = 0,
+        limit: int = 1000,
+        status: UserStatus = UserStatus.ACTIVE,
+        language: str | None = None,
+        active_since: datetime | None = None,
+    ) -> list[tuple[int, int]]:
+        """Get next page of (id, telegram_id) recipients after ``after_id`` (keyset)."""
+        stmt = (
+            select(User.id, User.telegram_id)
+            .where(User.id > after_id, *self._recipient_criteria(status, language, active_since))
+            .order_by(User.id)
+            .limit(limit)
+        )
+        result = await self.session.execute(stmt)
+        return [(row.id, row.telegram_id) for row in result]
+
+    async def count_recipients(
+        self,
+        status: UserStatus = UserStatus.ACTIVE,
+        language: str | None = None,
+        active_since: datetime | None = None,
+    ) -> int:
+        """Count broadcast recipients matching filters."""
+        stmt = (
+            select(func.count())
+            .select_from(User)
+            .where(*self._recipient_criteria(status, language, active_since))
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar() or 0
+
+    @replica_read
     async def count_active_users(self, period_hours: int = 24) -> int:
         """Count active users in the last N hours."""
         since = datetime.utcnow() - timedelta(hours=period_hours)
@@ -85,20 +377,43 @@ class UserRepository(BaseRepository[User]):
         result = await self.session.execute(stmt)
         return result.scalar() or 0
 
+    async def count_active_on(self, day: date | None = None) -> int:
+        """Count users active on ``day`` (UTC, default today), from the ``user_stats`` rollup."""
+        day = day or datetime.utcnow().date()
+        return await UserStatsRepository(self.session).get_value(UserStatDimension.ACTIVE, day.isoformat())
+
+    async def get_privileged_roles(self) -> list[tuple[int, UserRole]]:
+        """Get (telegram_id, role) of users whose role is not ``user``.
+
+        Read from the primary: the result replaces the role index, which must not
+        go back to a lagging replica's view.
+        """
+        stmt = select(User.telegram_id, User.role).where(User.role != UserRole.USER.value)
+        result = await self.session.execute(stmt)
+        return [(telegram_id, UserRole(role)) for telegram_id, role in result.all()]
+
+    @replica_read
     async def get_admins(self) -> list[User]:
         """Get all admin users."""
-        from shared.enums import UserRole
-
         stmt = select(User).where(User.role == UserRole.ADMIN.value)
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
+    @replica_read
     async def count_new_users(self, since: datetime) -> int:
         """Count users created since date."""
         stmt = select(func.count()).select_from(User).where(User.created_at >= since)
         result = await self.session.execute(stmt)
         return result.scalar() or 0
 
+    async def count_new_since(self, since: date) -> int:
+        """Count users created on or after ``since`` (whole UTC days), from the ``user_stats`` rollup."""
+        days = (datetime.utcnow().date() - since).days + 1
+        if days < 1:
+            return 0
+        summary = await UserStatsRepository(self.session).get_summary(days)
+        return sum(summary.new_by_day.values())
+
     async def count_by_status(self, status: UserStatus) -> int:
-        """Count users by status."""
-        return await self.count(status=status.value)
+        """Count users by status, from the ``user_stats`` rollup."""
+        return await UserStatsRepository(self.session).get_value(UserStatDimension.STATUS, status.value)
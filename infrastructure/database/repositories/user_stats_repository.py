@@ -0,0 +1,156 @@
+"""User statistics rollup repository."""
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import ColumnElement, and_, func, literal, literal_column, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.database.core.replicas import replica_read
+from infrastructure.database.models.user_stats import UserStat
+from infrastructure.database.models.users import User
+from shared.dto.user import UserStatsDTO
+from shared.enums import UserStatDimension
+
+COUNTER_DIMENSIONS = (
+    UserStatDimension.TOTAL,
+    UserStatDimension.STATUS,
+    UserStatDimension.ROLE,
+    UserStatDimension.LANGUAGE,
+)
+DAILY_DIMENSIONS = (UserStatDimension.NEW, UserStatDimension.ACTIVE)
+
+# pg_try_advisory_xact_lock key of UserStatsReconciler passes
+RECONCILE_LOCK_ID = 0x75737473
+
+
+def _day_key(column: ColumnElement) -> ColumnElement[str]:
+    """SQL expression rendering a timestamp as a daily bucket key."""
+    # Inlined, so GROUP BY matches the selected expression
+    return func.to_char(column, literal_column("'YYYY-MM-DD'"))
+
+
+class UserStatsRepository:
+    """Reads and corrects the ``user_stats`` rollup.
+
+    Counters are maintained by triggers on ``users`` (see the ``add_user_stats``
+    migration); reads sum a handful of shard rows instead of scanning ``users``.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    @replica_read
+    async def get_value(self, dimension: UserStatDimension, key: str = "") -> int:
+        """Get one counter."""
+        stmt = select(func.sum(UserStat.value)).where(UserStat.dimension == dimension.value, UserStat.key == key)
+        result = await self.session.execute(stmt)
+        return int(result.scalar() or 0)
+
+    @replica_read
+    async def get_summary(self, days: int = 7) -> UserStatsDTO:
+        """Get all counters plus daily buckets of the last ``days`` days in one query."""
+        since = (datetime.utcnow().date() - timedelta(days=days - 1)).isoformat()
+        stmt = (
+            select(UserStat.dimension, UserStat.key, func.sum(UserStat.value))
+            .where(
+                or_(
+                    UserStat.dimension.in_([dimension.value for dimension in COUNTER_DIMENSIONS]),
+                    and_(
+                        UserStat.dimension.in_([dimension.value for dimension in DAILY_DIMENSIONS]),
+                        UserStat.key >= since,
+                    ),
+                )
+            )
+            .group_by(UserStat.dimension, UserStat.key)
+        )
+        result = await self.session.execute(stmt)
+
+        values: dict[str, dict[str, int]] = {dimension.value: {} for dimension in UserStatDimension}
+        for dimension, key, value in result:
+            if value:
+                values[dimension][key] = int(value)
+
+        return UserStatsDTO(
+            total=values[UserStatDimension.TOTAL.value].get("", 0),
+            by_status=values[UserStatDimension.STATUS.value],
+            by_role=values[UserStatDimension.ROLE.value],
+            by_language=values[UserStatDimension.LANGUAGE.value],
+            new_by_day={date.fromisoformat(key): value for key, value in values[UserStatDimension.NEW.value].items()},
+            active_by_day={
+                date.fromisoformat(key): value for key, value in values[UserStatDimension.ACTIVE.value].items()
+            },
+        )
+
+    async def get_drift(self) -> list[tuple[str, str, int]]:
+        """Compare rollup with exact counts over ``users``. Returns (dimension, key, correction) rows.
+
+        Must run in a REPEATABLE READ transaction so both sides see one snapshot.
+        Past days of active users cannot be recounted. For today, users active
+        now are a lower bound (deleted users stay counted), so it is only raised.
+        """
+        today = datetime.utcnow().date()
+        day_start = datetime.combine(today, datetime.min.time())
+        exact = (
+            select(
+                literal(UserStatDimension.TOTAL.value).label("dimension"),
+                literal("").label("key"),
+                func.count().label("value"),
+            )
+            .select_from(User)
+            .union_all(
+                select(literal(UserStatDimension.STATUS.value), User.status, func.count()).group_by(User.status),
+                select(literal(UserStatDimension.ROLE.value), User.role, func.count()).group_by(User.role),
+                select(literal(UserStatDimension.LANGUAGE.value), User.language, func.count()).group_by(
+                    User.language
+                ),
+                select(literal(UserStatDimension.NEW.value), _day_key(User.created_at), func.count()).group_by(
+                    _day_key(User.created_at)
+                ),
+                select(literal(UserStatDimension.ACTIVE.value), literal(today.isoformat()), func.count()).where(
+                    User.last_activity_at >= day_start
+                ),
+            )
+            .subquery("exact")
+        )
+        stored = (
+            select(UserStat.dimension, UserStat.key, func.sum(UserStat.value).label("value"))
+            .where(
+                or_(
+                    UserStat.dimension != UserStatDimension.ACTIVE.value,
+                    UserStat.key == today.isoformat(),
+                )
+            )
+            .group_by(UserStat.dimension, UserStat.key)
+            .subquery("stored")
+        )
+        correction = func.coalesce(exact.c.value, 0) - func.coalesce(stored.c.value, 0)
+        stmt = select(
+            func.coalesce(exact.c.dimension, stored.c.dimension),
+            func.coalesce(exact.c.key, stored.c.key),
+            correction,
+        ).select_from(
+            exact.join(
+                stored,
+                and_(exact.c.dimension == stored.c.dimension, exact.c.key == stored.c.key),
+                full=True,
+            )
+        ).where(
+            correction != 0,
+            or_(func.coalesce(exact.c.dimension, stored.c.dimension) != UserStatDimension.ACTIVE.value, correction > 0),
+        )
+        result = await self.session.execute(stmt)
+        return [(dimension, key, int(value)) for dimension, key, value in result]
+
+    async def try_lock_reconcile(self) -> bool:
+        """Take the reconciliation advisory lock until the transaction ends. Returns False if it is held."""
+        result = await self.session.execute(select(func.pg_try_advisory_xact_lock(RECONCILE_LOCK_ID)))
+        return bool(result.scalar())
+
+    async def add(self, dimension: str, key: str, delta: int) -> None:
+        """Add ``delta`` to a counter (shard 0)."""
+        stmt = insert(UserStat).values(dimension=dimension, key=key, shard=0, value=delta)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserStat.dimension, UserStat.key, UserStat.shard],
+            set_={UserStat.value: UserStat.value + stmt.excluded.value},
+        )
+        await self.session.execute(stmt)
@@ -0,0 +1,150 @@
+"""In-process index of user roles for access checks."""
+import asyncio
+import contextlib
+from collections.abc import Iterable
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from config.settings.base import get_settings
+from infrastructure.database.core.session import TrackedSession, get_session_factory
+from infrastructure.database.repositories.user_repository import ROLE_CHANGES_KEY, UserRepository
+from infrastructure.monitoring.logging import get_logger
+from shared.enums import UserRole
+
+logger = get_logger(__name__)
+
+# A role passes checks for itself and every role below it
+ROLE_RANKS: dict[UserRole, int] = {UserRole.USER: 0, UserRole.PREMIUM: 1, UserRole.MODERATOR: 2, UserRole.ADMIN: 3}
+
+
+class RoleIndex:
+    """Roles of privileged users keyed by ``telegram_id``; checks never query the database.
+
+    Users in ``admin_ids`` are always admins. Other roles are loaded from
+    ``users`` (rows whose role is not ``user``, via the partial index) by
+    ``refresh()`` and then every ``interval`` seconds. Role changes made
+    through ``UserRepository`` in this process apply as soon as their
+    transaction commits; changes made elsewhere show up within ``interval``.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        admin_ids: Iterable[int],
+        interval: float,
+    ):
+        self.session_factory = session_factory
+        self.admin_ids = frozenset(admin_ids)
+        self.interval = interval
+        self.refreshes = 0
+        self._roles: dict[int, UserRole] = {}
+        # Changes applied while a refresh is loading, re-applied over its result
+        self._applied_during_refresh: dict[int, UserRole] | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._roles)
+
+    def role_of(self, telegram_id: int) -> UserRole:
+        """Get user's role; users not in the index are ``user``."""
+        if telegram_id in self.admin_ids:
+            return UserRole.ADMIN
+        return self._roles.get(telegram_id, UserRole.USER)
+
+    def has_role(self, telegram_id: int, role: UserRole) -> bool:
+        """Check that user's role is ``role`` or above it."""
+        return ROLE_RANKS[self.role_of(telegram_id)] >= ROLE_RANKS[role]
+
+    def apply(self, changes: dict[int, UserRole]) -> None:
+        """Apply committed role changes."""
+        for telegram_id, role in changes.items():
+            if role == UserRole.USER:
+                self._roles.pop(telegram_id, None)
+            else:
+                self._roles[telegram_id] = role
+        if self._applied_during_refresh is not None:
+            self._applied_during_refresh.update(changes)
+
+    async def refresh(self) -> int:
+        """Reload roles from the database. Returns number of privileged users."""
+        self._applied_during_refresh = {}
+        try:
+            async with self.session_factory() as session:
+                rows = await UserRepository(session).get_privileged_roles()
+            roles = dict(rows)
+            for telegram_id, role in self._applied_during_refresh.items():
+                if role == UserRole.USER:
+                    roles.pop(telegram_id, None)
+                else:
+                    roles[telegram_id] = role
+            self._roles = roles
+        finally:
+            self._applied_during_refresh = None
+
+        self.refreshes += 1
+        return len(roles)
+
+    async def _run(self) -> None:
+        """Refresh periodically until cancelled."""
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error("Role index refresh failed: %s (%s)", e, type(e).__name__)
+
+    def start(self) -> None:
+        """Start periodic refresh."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="role-index-refresh")
+
+    async def close(self) -> None:
+        """Stop periodic refresh."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+@event.listens_for(TrackedSession, "after_commit")
+def _on_commit(session: Session) -> None:
+    """Apply role changes of the committed transaction."""
+    changes = session.info.pop(ROLE_CHANGES_KEY, None)
+    if changes and _role_index is not None:
+        _role_index.apply(changes)
+
+
+@event.listens_for(TrackedSession, "after_rollback")
+def _on_rollback(session: Session) -> None:
+    """Forget role changes of the rolled back transaction."""
+    session.info.pop(ROLE_CHANGES_KEY, None)
+
+
+_role_index: RoleIndex | None = None
+
+
+def get_role_index() -> RoleIndex:
+    """Get or create role index."""
+    global _role_index
+
+    if _role_index is None:
+        settings = get_settings()
+        _role_index = RoleIndex(
+            session_factory=get_session_factory(),
+            admin_ids=settings.bot.admin_ids,
+            interval=settings.bot.role_refresh_interval,
+        )
+
+    return _role_index
+
+
+async def close_role_index() -> None:
+    """Stop role index refresh."""
+    global _role_index
+
+    if _role_index is not None:
+        await _role_index.close()
+        _role_index = None
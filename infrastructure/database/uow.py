@@ -4,23 +4,52 @@ from typing import Self
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from infrastructure.database.repositories.broadcast_repository import BroadcastRepository
+from infrastructure.database.repositories.fsm_state_repository import FsmStateRepository
 from infrastructure.database.repositories.user_repository import UserRepository
+from infrastructure.database.repositories.user_stats_repository import UserStatsRepository
+from infrastructure.database.user_cache import UserCache
 
 
 class UnitOfWork:
     """Unit of Work for managing database transactions and repositories."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, user_cache: UserCache | None = None):
         self.session = session
+        self.user_cache = user_cache
         self._users: UserRepository | None = None
+        self._broadcasts: BroadcastRepository | None = None
+        self._user_stats: UserStatsRepository | None = None
+        self._fsm_states: FsmStateRepository | None = None
 
     @property
     def users(self) -> UserRepository:
         """Get User repository."""
         if self._users is None:
-            self._users = UserRepository(self.session)
+            self._users = UserRepository(self.session, cache=self.user_cache)
         return self._users
 
+    @property
+    def broadcasts(self) -> BroadcastRepository:
+        """Get Broadcast repository."""
+        if self._broadcasts is None:
+            self._broadcasts = BroadcastRepository(self.session)
+        return self._broadcasts
+
+    @property
+    def user_stats(self) -> UserStatsRepository:
+        """Get user statistics rollup repository."""
+        if self._user_stats is None:
+            self._user_stats = UserStatsRepository(self.session)
+        return self._user_stats
+
+    @property
+    def fsm_states(self) -> FsmStateRepository:
+        """Get FSM state repository."""
+        if self._fsm_states is None:
+            self._fsm_states = FsmStateRepository(self.session)
+        return self._fsm_states
+
     # === REGISTER NEW REPOSITORIES ABOVE ===
 
     async def commit(self) -> None:
@@ -0,0 +1,114 @@
+"""In-process TTL/LRU cache of user snapshots."""
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from config.settings.base import get_settings
+from infrastructure.database.core.session import TrackedSession
+from shared.dto.user import UserSnapshotDTO
+
+# session.info key of {cache: {telegram_id, ...}} written in the current transaction
+INVALIDATIONS_KEY = "user_cache_invalidations"
+
+
+@dataclass
+class UserCacheStats:
+    """User cache counters."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+
+class UserCache:
+    """LRU cache of ``UserSnapshotDTO`` keyed by ``telegram_id`` with TTL eviction.
+
+    Holds at most ``max_size`` entries; the least recently used one is evicted
+    when full. Entries older than ``ttl`` seconds are treated as misses. The
+    cache is per process, so TTL bounds staleness against writes made by other
+    instances. ``UserRepository`` invalidates users it writes right away and
+    again when the transaction commits, dropping snapshots read in between.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.stats = UserCacheStats()
+        # telegram_id -> (expires_at, snapshot)
+        self._entries: OrderedDict[int, tuple[float, UserSnapshotDTO]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, telegram_id: int) -> UserSnapshotDTO | None:
+        """Get cached snapshot or None."""
+        entry = self._entries.get(telegram_id)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+
+        expires_at, snapshot = entry
+        if expires_at < time.monotonic():
+            del self._entries[telegram_id]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(telegram_id)
+        self.stats.hits += 1
+        return snapshot
+
+    def set(self, snapshot: UserSnapshotDTO) -> None:
+        """Store snapshot, evicting the least recently used entry if full."""
+        telegram_id = snapshot.telegram_id
+        if telegram_id in self._entries:
+            self._entries.move_to_end(telegram_id)
+        elif len(self._entries) >= self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+        self._entries[telegram_id] = (time.monotonic() + self.ttl, snapshot)
+
+    def invalidate(self, telegram_id: int) -> None:
+        """Drop cached snapshot."""
+        if self._entries.pop(telegram_id, None) is not None:
+            self.stats.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all cached snapshots."""
+        self._entries.clear()
+
+
+@event.listens_for(TrackedSession, "after_commit")
+def _on_commit(session: Session) -> None:
+    """Drop snapshots cached while the committed transaction was writing them."""
+    for cache, telegram_ids in session.info.pop(INVALIDATIONS_KEY, {}).items():
+        for telegram_id in telegram_ids:
+            cache.invalidate(telegram_id)
+
+
+@event.listens_for(TrackedSession, "after_rollback")
+def _on_rollback(session: Session) -> None:
+    """Forget invalidations of the rolled back transaction."""
+    session.info.pop(INVALIDATIONS_KEY, None)
+
+
+_user_cache: UserCache | None = None
+
+
+def get_user_cache() -> UserCache:
+    """Get or create user cache."""
+    global _user_cache
+
+    if _user_cache is None:
+        settings = get_settings()
+        _user_cache = UserCache(
+            max_size=settings.database.user_cache_size,
+            ttl=settings.database.user_cache_ttl,
+        )
+
+    return _user_cache
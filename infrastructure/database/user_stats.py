@@ -0,0 +1,106 @@
+"""Periodic reconciliation of the user statistics rollup."""
+import asyncio
+import contextlib
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from config.settings.base import get_settings
+from infrastructure.database.core.session import get_session_factory
+from infrastructure.database.repositories.user_stats_repository import UserStatsRepository
+from infrastructure.monitoring.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class UserStatsReconciler:
+    """Corrects drift between ``user_stats`` and ``users`` every ``interval`` seconds.
+
+    Drift (e.g. after a TRUNCATE or manual edits with triggers disabled) is
+    measured on one REPEATABLE READ snapshot and applied as increments, so
+    updates committed meanwhile by triggers are kept. Each correction is its own
+    short transaction and never holds one counter row while waiting on another.
+
+    A pass runs only while holding a transaction-level advisory lock, so with
+    several instances one reconciles and the others skip; two passes
+    measuring the same drift would apply it twice.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession], interval: float):
+        self.session_factory = session_factory
+        self.interval = interval
+        self.corrections = 0
+        self._task: asyncio.Task[None] | None = None
+
+    async def reconcile(self) -> int:
+        """Measure and correct drift. Returns number of corrected counters, 0 if another instance holds the lock."""
+        # The lock is released when this transaction ends, also if the process dies
+        async with self.session_factory() as lock_session:
+            if not await UserStatsRepository(lock_session).try_lock_reconcile():
+                logger.debug("User stats reconciliation skipped: another instance holds the lock")
+                return 0
+            return await self._reconcile()
+
+    async def _reconcile(self) -> int:
+        async with self.session_factory() as session:
+            await session.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            drift = await UserStatsRepository(session).get_drift()
+
+        for dimension, key, delta in drift:
+            async with self.session_factory() as session:
+                await UserStatsRepository(session).add(dimension, key, delta)
+                await session.commit()
+
+        if drift:
+            self.corrections += len(drift)
+            logger.warning(
+                "User stats drift corrected: %s",
+                ", ".join(f"{dimension}:{key}{delta:+d}" for dimension, key, delta in drift),
+            )
+        return len(drift)
+
+    async def _run(self) -> None:
+        """Reconcile periodically until cancelled."""
+        while True:
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error("User stats reconciliation failed: %s (%s)", e, type(e).__name__)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """Start periodic reconciliation."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="user-stats-reconcile")
+
+    async def close(self) -> None:
+        """Stop periodic reconciliation."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+
+_reconciler: UserStatsReconciler | None = None
+
+
+def get_user_stats_reconciler() -> UserStatsReconciler:
+    """Get or create user stats reconciler."""
+    global _reconciler
+
+    if _reconciler is None:
+        _reconciler = UserStatsReconciler(
+            session_factory=get_session_factory(),
+            interval=get_settings().database.user_stats_reconcile_interval,
+        )
+
+    return _reconciler
+
+
+async def close_user_stats_reconciler() -> None:
+    """Stop user stats reconciler."""
+    global _reconciler
+
+    if _reconciler is not None:
+        await _reconciler.close()
+        _reconciler = None
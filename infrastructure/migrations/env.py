@@ -8,6 +8,9 @@ from config.settings.base import get_settings
 from infrastructure.database.models.base import Base
 
 # Import all models for autogenerate
+from infrastructure.database.models.broadcasts import Broadcast  # noqa: F401
+from infrastructure.database.models.fsm_states import FsmState  # noqa: F401
+from infrastructure.database.models.user_stats import UserStat  # noqa: F401
 from infrastructure.database.models.users import User  # noqa: F401
 
 # === IMPORT NEW MODELS FOR MIGRATION ABOVE ===
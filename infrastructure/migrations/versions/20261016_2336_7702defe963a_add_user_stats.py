@@ -0,0 +1,110 @@
+"""add_user_stats
+
+Revision ID: 7702defe963a
+Revises: cc1a5b922d8e
+Create Date: 2026-10-16 23:36:12.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7702defe963a'
+down_revision: Union[str, None] = 'cc1a5b922d8e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Statement-level triggers aggregate the transition tables into one upsert per statement.
+# Each backend writes its own shard, so concurrent transactions do not queue on one row.
+UPSERT_DELTAS = """
+    INSERT INTO user_stats (dimension, key, shard, value)
+    SELECT d.dimension, d.key, pg_backend_pid() % 16, sum(d.delta)
+    FROM {source}
+    CROSS JOIN LATERAL (VALUES {deltas}) AS d(dimension, key, delta)
+    WHERE d.key IS NOT NULL
+    GROUP BY d.dimension, d.key
+    HAVING sum(d.delta) <> 0
+    ORDER BY d.dimension, d.key
+    ON CONFLICT (dimension, key, shard) DO UPDATE SET value = user_stats.value + EXCLUDED.value;
+"""
+
+INSERT_DELTAS = """
+    ('total', '', 1), ('status', n.status, 1), ('role', n.role, 1), ('language', n.language, 1),
+    ('new', to_char(n.created_at, 'YYYY-MM-DD'), 1),
+    ('active', to_char(n.last_activity_at, 'YYYY-MM-DD'), 1)
+"""
+
+# Unchanged columns cancel out; a user counts as active once per day, on the first activity that day
+UPDATE_DELTAS = """
+    ('status', o.status, -1), ('status', n.status, 1),
+    ('role', o.role, -1), ('role', n.role, 1),
+    ('language', o.language, -1), ('language', n.language, 1),
+    ('new', to_char(o.created_at, 'YYYY-MM-DD'), -1), ('new', to_char(n.created_at, 'YYYY-MM-DD'), 1),
+    ('active', CASE WHEN o.last_activity_at IS NULL OR n.last_activity_at::date > o.last_activity_at::date
+        THEN to_char(n.last_activity_at, 'YYYY-MM-DD') END, 1)
+"""
+
+# Past activity stays counted for its day
+DELETE_DELTAS = """
+    ('total', '', -1), ('status', o.status, -1), ('role', o.role, -1), ('language', o.language, -1),
+    ('new', to_char(o.created_at, 'YYYY-MM-DD'), -1)
+"""
+
+# event -> (transition tables, source rows, deltas, function options)
+TRIGGERS = {
+    "insert": ("NEW TABLE AS new_rows", "new_rows n", INSERT_DELTAS, ""),
+    # Transition tables have no statistics; a nested loop join is quadratic on bulk updates
+    "update": (
+        "OLD TABLE AS old_rows NEW TABLE AS new_rows",
+        "old_rows o JOIN new_rows n ON n.id = o.id",
+        UPDATE_DELTAS,
+        " SET enable_nestloop = off",
+    ),
+    "delete": ("OLD TABLE AS old_rows", "old_rows o", DELETE_DELTAS, ""),
+}
+
+# Today's active users are exact; earlier days cannot be rebuilt from last_activity_at
+BACKFILL = """
+    INSERT INTO user_stats (dimension, key, shard, value)
+    SELECT 'total', '', 0, count(*) FROM users
+    UNION ALL SELECT 'status', status, 0, count(*) FROM users GROUP BY status
+    UNION ALL SELECT 'role', role, 0, count(*) FROM users GROUP BY role
+    UNION ALL SELECT 'language', language, 0, count(*) FROM users GROUP BY language
+    UNION ALL SELECT 'new', to_char(created_at, 'YYYY-MM-DD'), 0, count(*) FROM users GROUP BY 2
+    UNION ALL SELECT 'active', to_char(now() AT TIME ZONE 'utc', 'YYYY-MM-DD'), 0, count(*) FROM users
+        WHERE last_activity_at >= date_trunc('day', now() AT TIME ZONE 'utc')
+"""
+
+
+def upgrade() -> None:
+    op.create_table('user_stats',
+    sa.Column('dimension', sa.String(length=16), nullable=False),
+    sa.Column('key', sa.String(length=32), nullable=False),
+    sa.Column('shard', sa.SmallInteger(), nullable=False),
+    sa.Column('value', sa.BIGINT(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('dimension', 'key', 'shard')
+    )
+
+    for event, (referencing, source, deltas, options) in TRIGGERS.items():
+        op.execute(
+            f"CREATE FUNCTION user_stats_on_{event}() RETURNS trigger LANGUAGE plpgsql{options} AS $$ BEGIN"
+            f"{UPSERT_DELTAS.format(source=source, deltas=deltas)}"
+            f"RETURN NULL; END $$"
+        )
+        op.execute(
+            f"CREATE TRIGGER users_stats_{event} AFTER {event.upper()} ON users "
+            f"REFERENCING {referencing} FOR EACH STATEMENT EXECUTE FUNCTION user_stats_on_{event}()"
+        )
+
+    # Triggers hold a lock on users until commit, so no write slips between them and the backfill
+    op.execute(BACKFILL)
+
+
+def downgrade() -> None:
+    for event in TRIGGERS:
+        op.execute(f"DROP TRIGGER users_stats_{event} ON users")
+        op.execute(f"DROP FUNCTION user_stats_on_{event}()")
+    op.drop_table('user_stats')
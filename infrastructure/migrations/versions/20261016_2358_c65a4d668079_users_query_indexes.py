@@ -0,0 +1,58 @@
+"""users_query_indexes
+
+Revision ID: c65a4d668079
+Revises: 7702defe963a
+Create Date: 2026-10-16 23:58:54.325378
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c65a4d668079'
+down_revision: Union[str, None] = '7702defe963a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name -> (column, predicate); partial indexes skip rows the queries never ask for
+NEW_INDEXES = {
+    # get_active_users / count_active_users / iter_active_users / broadcast active_since
+    'ix_users_active_last_activity_at': ('last_activity_at', "status = 'active'"),
+    # get_admins; role = 'admin' implies the predicate
+    'ix_users_privileged_role': ('role', "role <> 'user'"),
+    'ix_users_username_not_null': ('username', 'username IS NOT NULL'),
+    # Referral lookups and ON DELETE SET NULL of the self-referencing FK
+    'ix_users_referrer_id_not_null': ('referrer_id', 'referrer_id IS NOT NULL'),
+}
+
+# Single-column indexes replaced above; ix_users_status is dropped outright (a few values, never selective)
+OLD_INDEXES = {
+    'ix_users_last_activity_at': 'last_activity_at',
+    'ix_users_role': 'role',
+    'ix_users_username': 'username',
+    'ix_users_referrer_id': 'referrer_id',
+    'ix_users_status': 'status',
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY does not block writes to users, but cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        for name, (column, predicate) in NEW_INDEXES.items():
+            op.create_index(
+                name, 'users', [column], postgresql_where=sa.text(predicate),
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+        for name in OLD_INDEXES:
+            op.drop_index(name, table_name='users', postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, column in OLD_INDEXES.items():
+            op.create_index(name, 'users', [column], postgresql_concurrently=True, if_not_exists=True)
+        for name in NEW_INDEXES:
+            op.drop_index(name, table_name='users', postgresql_concurrently=True, if_exists=True)
@@ -1,8 +1,165 @@
 """Standard Python logging setup."""
+import atexit
+import copy
 import logging
+import queue
+import random
 import sys
+import threading
+from collections.abc import Mapping
+from datetime import UTC, datetime
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
 
-from config.settings.base import get_settings
+from config.settings.base import LoggingSettings, get_settings
+from shared.utils.rate_limit import KeyedTokenBuckets
+
+try:
+    import orjson
+
+    def _dumps(data: dict[str, Any]) -> str:
+        return orjson.dumps(data, default=str).decode()
+
+except ImportError:  # pragma: no cover - orjson is optional
+    import json
+
+    def _dumps(data: dict[str, Any]) -> str:
+        return json.dumps(data, default=str, ensure_ascii=False)
+
+
+_listener: QueueListener | None = None
+
+# Attributes every LogRecord has; anything else was passed via ``extra``
+_RECORD_ATTRS = frozenset(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "taskName"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one-line JSON objects (uses orjson when installed)."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data: dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, UTC).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                data[key] = value
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            data["stack_info"] = self.formatStack(record.stack_info)
+        return _dumps(data)
+
+
+class SamplingFilter(logging.Filter):
+    """Passes only a fraction of sub-WARNING records of configured loggers.
+
+    ``rates`` maps logger name prefixes to the share of records kept (0..1);
+    the longest matching prefix wins. Warnings and errors are never sampled.
+    Filters run on every thread that logs, so resolving a new logger name is locked.
+    """
+
+    def __init__(self, rates: Mapping[str, float]):
+        super().__init__()
+        self.rates = dict(rates)
+        self._resolved: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _rate(self, name: str) -> float:
+        rate = self._resolved.get(name)
+        if rate is None:
+            with self._lock:
+                matches = [prefix for prefix in self.rates if name == prefix or name.startswith(prefix + ".")]
+                rate = self.rates[max(matches, key=len)] if matches else 1.0
+                self._resolved[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class ErrorRateLimitFilter(logging.Filter):
+    """Limits repeats of the same error to ``limit`` records per ``interval`` seconds.
+
+    Records are keyed by logger, message template and exception type. The
+    number of suppressed repeats is appended to the next record that passes.
+    Filters run on every thread that logs and the buckets are not thread-safe,
+    so error records are filtered under a lock.
+    """
+
+    def __init__(self, limit: int, interval: float):
+        super().__init__()
+        self._buckets = KeyedTokenBuckets(limit / interval, capacity=limit, idle_ttl=interval, max_keys=10_000)
+        self._suppressed: dict[tuple[Any, ...], int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.ERROR:
+            return True
+
+        exc_type = record.exc_info[0] if record.exc_info else None
+        key = (record.name, record.msg, exc_type)
+        with self._lock:
+            if not self._buckets.try_acquire(key):
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return False
+            suppressed = self._suppressed.pop(key, 0)
+
+        if suppressed:
+            record.msg = f"{record.msg} [{suppressed} similar suppressed]"
+        return True
+
+
+class BackgroundQueueHandler(QueueHandler):
+    """Queue handler that never blocks the caller.
+
+    Only the message is rendered on the calling thread (so lazy objects are not
+    touched from the listener thread); formatting, exceptions and I/O happen in
+    the listener. Records that overflow the queue are counted and dropped.
+    """
+
+    def __init__(self, log_queue: queue.Queue[logging.LogRecord]):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def _build_handlers(config: LoggingSettings) -> list[logging.Handler]:
+    """Create root handlers: stdout, optionally behind a background queue."""
+    global _listener
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter() if config.json_format else logging.Formatter(config.format))
+
+    if not config.queue:
+        handler: logging.Handler = stream_handler
+    else:
+        log_queue: queue.Queue[logging.LogRecord] = queue.Queue(config.queue_size)
+        handler = BackgroundQueueHandler(log_queue)
+        _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+        _listener.start()
+
+    if config.sample_rates:
+        handler.addFilter(SamplingFilter(config.sample_rates))
+    if config.error_limit:
+        handler.addFilter(ErrorRateLimitFilter(config.error_limit, config.error_limit_interval))
+    return [handler]
 
 
 def setup_logging() -> logging.Logger:
@@ -10,10 +167,11 @@ def setup_logging() -> logging.Logger:
     settings = get_settings()
 
     # Configure root logger
+    close_logging()
     logging.basicConfig(
         level=settings.logging.log_level,
-        format=settings.logging.format,
-        stream=sys.stdout,
+        handlers=_build_handlers(settings.logging),
+        force=True,
     )
 
     # Reduce noise from third-party libraries
@@ -26,6 +184,18 @@ def setup_logging() -> logging.Logger:
     return logger
 
 
+def close_logging() -> None:
+    """Flush queued records and stop the background listener."""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(close_logging)
+
+
 def get_logger(name: str | None = None) -> logging.Logger:
     """Get logger instance."""
     return logging.getLogger(name or get_settings().app_name)
@@ -0,0 +1,220 @@
+"""In-process metrics with Prometheus text exposition."""
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Sequence
+from typing import TypeVar
+
+from aiohttp import web
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from infrastructure.monitoring.logging import get_logger
+
+logger = get_logger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_Labels = tuple[str, ...]
+M = TypeVar("M", bound="Metric")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values, strict=True))
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class Metric(ABC):
+    """Base metric: a family of values keyed by label values."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+
+    @abstractmethod
+    def samples(self) -> Iterator[tuple[str, _Labels, tuple[str, ...], float]]:
+        """Yield (suffix, extra label names, label values, value) samples."""
+
+    def render(self) -> str:
+        """Render metric in Prometheus text format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        for suffix, extra_names, values, value in self.samples():
+            labels = _format_labels(self.label_names + extra_names, values)
+            lines.append(f"{self.name}{suffix}{labels} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing counter."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[_Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Increase counter for label values."""
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterator[tuple[str, _Labels, tuple[str, ...], float]]:
+        for labels, value in self._values.items():
+            yield "", (), labels, value
+
+
+class Gauge(Metric):
+    """Value that goes up and down, or is read from a callback at scrape time."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[_Labels, float] = {}
+        self._function: Callable[[], float] | None = None
+
+    def set(self, value: float, *labels: str) -> None:
+        """Set gauge value."""
+        self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        """Increase gauge value."""
+        self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        """Decrease gauge value."""
+        self._values[labels] = self._values.get(labels, 0.0) - amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Read the (unlabelled) value from ``function`` at scrape time."""
+        self._function = function
+
+    def samples(self) -> Iterator[tuple[str, _Labels, tuple[str, ...], float]]:
+        if self._function is not None:
+            yield "", (), (), self._function()
+            return
+        for labels, value in self._values.items():
+            yield "", (), labels, value
+
+
+class Histogram(Metric):
+    """Distribution of observed values in fixed buckets.
+
+    ``observe`` is a dict lookup plus a bisect over the bucket bounds; buckets
+    are made cumulative only when rendered.
+    """
+
+    type = "histogram"
+
+    def __init__(
+        self, name: str, documentation: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [count per bucket..., count above last bucket, sum]
+        self._values: dict[_Labels, list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        """Record one observation."""
+        row = self._values.get(labels)
+        if row is None:
+            row = self._values[labels] = [0.0] * (len(self.buckets) + 2)
+        row[bisect_left(self.buckets, value)] += 1
+        row[-1] += value
+
+    def samples(self) -> Iterator[tuple[str, _Labels, tuple[str, ...], float]]:
+        bounds = [*map(_format_value, self.buckets), "+Inf"]
+        for labels, row in self._values.items():
+            cumulative = 0.0
+            for bound, count in zip(bounds, row[:-1], strict=True):
+                cumulative += count
+                yield "_bucket", ("le",), (*labels, bound), cumulative
+            yield "_sum", (), labels, row[-1]
+            yield "_count", (), labels, cumulative
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: M) -> M:
+        """Add metric to registry."""
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text format."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = MetricsRegistry()
+
+UPDATES_TOTAL = registry.register(Counter("bot_updates_total", "Updates received", ["type"]))
+UPDATE_ERRORS_TOTAL = registry.register(
+    Counter("bot_update_errors_total", "Updates failed with an exception", ["error"])
+)
+UPDATES_IN_FLIGHT = registry.register(Gauge("bot_updates_in_flight", "Updates being processed"))
+HANDLER_DURATION = registry.register(
+    Histogram("bot_handler_duration_seconds", "Update processing time", ["router", "handler"])
+)
+SCHEDULER_QUEUED = registry.register(Gauge("bot_scheduler_queued", "Updates waiting in per-chat queues"))
+SCHEDULER_ACTIVE_CHATS = registry.register(Gauge("bot_scheduler_active_chats", "Chats with queued updates"))
+API_DURATION = registry.register(
+    Histogram("telegram_api_duration_seconds", "Telegram Bot API request time", ["method"])
+)
+API_QUEUED = registry.register(Gauge("telegram_api_queued", "Outgoing calls waiting for rate limit tokens"))
+API_ERRORS_TOTAL = registry.register(
+    Counter("telegram_api_errors_total", "Telegram Bot API request errors", ["method", "error"])
+)
+DB_POOL_CHECKED_OUT = registry.register(Gauge("db_pool_checked_out", "Connections checked out of the pool", ["pool"]))
+DB_POOL_OVERFLOW = registry.register(Gauge("db_pool_overflow", "Connections open beyond pool_size", ["pool"]))
+DB_POOL_CHECKOUTS_TOTAL = registry.register(Counter("db_pool_checkouts_total", "Connection checkouts", ["pool"]))
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Track pool usage through checkout/checkin pool events, labelled ``pool=name``."""
+    pool = engine.sync_engine.pool
+
+    @event.listens_for(engine.sync_engine, "checkout")
+    def _on_checkout(*args: object) -> None:
+        DB_POOL_CHECKOUTS_TOTAL.inc(name)
+        DB_POOL_CHECKED_OUT.inc(name)
+        DB_POOL_OVERFLOW.set(max(pool.overflow(), 0), name)
+
+    @event.listens_for(engine.sync_engine, "checkin")
+    def _on_checkin(*args: object) -> None:
+        DB_POOL_CHECKED_OUT.dec(name)
+        DB_POOL_OVERFLOW.set(max(pool.overflow(), 0), name)
+
+
+async def start_metrics_server(host: str, port: int) -> web.AppRunner:
+    """Serve ``/metrics`` in Prometheus text format. Returns runner to clean up."""
+
+    async def handle(request: web.Request) -> web.Response:
+        return web.Response(text=registry.render(), headers={"Content-Type": CONTENT_TYPE})
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host=host, port=port).start()
+    logger.info("Metrics server listening on %s:%s/metrics", host, port)
+    return runner
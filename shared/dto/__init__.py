@@ -1,8 +1,9 @@
 """Data Transfer Objects."""
-from shared.dto.user import UserCreateDTO, UserResponseDTO, UserUpdateDTO
+from shared.dto.user import UserCreateDTO, UserResponseDTO, UserSnapshotDTO, UserUpdateDTO
 
 __all__ = [
     "UserCreateDTO",
     "UserUpdateDTO",
     "UserResponseDTO",
+    "UserSnapshotDTO",
 ]
@@ -1,5 +1,5 @@
 """User-related Data Transfer Objects."""
-from datetime import datetime
+from datetime import date, datetime
 
 from pydantic import BaseModel, ConfigDict, Field
 
@@ -50,3 +50,50 @@ class UserResponseDTO(BaseModel):
         if self.username:
             return f"@{self.username}"
         return self.full_name or self.first_name
+
+
+class UserSnapshotDTO(BaseModel):
+    """Immutable, session-independent snapshot of a user (safe to cache and share)."""
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    id: int
+    telegram_id: int
+    username: str | None
+    first_name: str
+    last_name: str | None
+    language: Language
+    role: UserRole
+    status: UserStatus
+    referrer_id: int | None
+    created_at: datetime
+
+    @property
+    def full_name(self) -> str:
+        """Get user's full name."""
+        if self.last_name:
+            return f"{self.first_name} {self.last_name}"
+        return self.first_name
+
+    @property
+    def is_admin(self) -> bool:
+        """Check if user is admin."""
+        return self.role == UserRole.ADMIN
+
+    @property
+    def is_active(self) -> bool:
+        """Check if user is active."""
+        return self.status == UserStatus.ACTIVE
+
+
+class UserStatsDTO(BaseModel):
+    """User counters read from the statistics rollup."""
+
+    model_config = ConfigDict(frozen=True)
+
+    total: int = 0
+    by_status: dict[str, int] = Field(default_factory=dict)
+    by_role: dict[str, int] = Field(default_factory=dict)
+    by_language: dict[str, int] = Field(default_factory=dict)
+    new_by_day: dict[date, int] = Field(default_factory=dict, description="New users per UTC day")
+    active_by_day: dict[date, int] = Field(default_factory=dict, description="Distinct active users per UTC day")
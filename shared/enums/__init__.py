@@ -26,3 +26,23 @@ class Language(str, Enum):
     RU = "ru"
     EN = "en"
     UK = "uk"
+
+
+class BroadcastStatus(str, Enum):
+    """Broadcast status enumeration."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
+
+
+class UserStatDimension(str, Enum):
+    """User statistics rollup dimension."""
+
+    TOTAL = "total"
+    STATUS = "status"
+    ROLE = "role"
+    LANGUAGE = "language"
+    NEW = "new"
+    ACTIVE = "active"
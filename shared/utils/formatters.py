@@ -1,5 +1,22 @@
 """Utility functions for formatting data."""
+import ast
+import keyword
+import re
+from collections.abc import Callable, Iterator
 from datetime import datetime
+from string import Formatter
+from typing import Any
+
+# Telegram limits, in UTF-16 code units of the text after entity parsing
+MESSAGE_LIMIT = 4096
+CAPTION_LIMIT = 1024
+
+RenderFunction = Callable[..., str]
+
+# Tag, entity, run of text, or a stray "<"/"&"
+_HTML_TOKEN = re.compile(r"<(/?)([a-zA-Z][\w-]*)[^>]*>|&#?\w+;|[^<&]+|[<&]")
+_HTML_TAG = re.compile(r"</?[a-zA-Z][\w-]*[^>]*>")
+_HTML_ENTITY = re.compile(r"&#?\w+;")
 
 
 def format_datetime(dt: datetime, fmt: str = "%Y-%m-%d %H:%M:%S") -> str:
@@ -19,20 +36,306 @@ def truncate_string(text: str, max_length: int = 50, suffix: str = "...") -> str
     return text[: max_length - len(suffix)] + suffix
 
 
+# str.replace per special character, skipped when the character is absent:
+# the membership test is a vectorized scan and nothing is copied for it.
+# str.translate with multi-character replacements and re.sub are several
+# times slower on real (non-ASCII) text, see bench_formatters.
+_HTML_ESCAPES = (("&", "&amp;"), ("<", "&lt;"), (">", "&gt;"), ('"', "&quot;"), ("'", "&#x27;"))
+# Backslash first, so the escapes added after it are not doubled
+_MARKDOWN_ESCAPES = tuple((char, f"\\{char}") for char in "\\_*[]()~`>#+-=|{}.!")
+
+
 def escape_html(text: str) -> str:
     """Escape HTML special characters."""
-    return (
-        text.replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-        .replace('"', "&quot;")
-        .replace("'", "&#x27;")
-    )
+    for char, escaped in _HTML_ESCAPES:
+        if char in text:
+            text = text.replace(char, escaped)
+    return text
 
 
 def escape_markdown(text: str) -> str:
-    """Escape Markdown special characters."""
-    special_chars = ["_", "*", "[", "]", "(", ")", "~", "`", ">", "#", "+", "-", "=", "|", "{", "}", ".", "!"]
-    for char in special_chars:
-        text = text.replace(char, f"\\{char}")
+    """Escape MarkdownV2 special characters."""
+    for char, escaped in _MARKDOWN_ESCAPES:
+        if char in text:
+            text = text.replace(char, escaped)
     return text
+
+
+ESCAPERS: dict[str, Callable[[str], str]] = {"HTML": escape_html, "MarkdownV2": escape_markdown}
+
+
+class SafeText(str):
+    """Text already formatted for the parse mode; templates insert it as is."""
+
+    __slots__ = ()
+
+
+def _format_escaped(value: Any, spec: str, escape: Callable[[str], str]) -> str:
+    if isinstance(value, SafeText):
+        return value
+    return escape(format(value, spec))
+
+
+# Globals of compiled templates; a placeholder with one of these names would shadow it
+_TEMPLATE_NAMES = frozenset({"SafeText", "repr", "str", "ascii"})
+
+
+def compile_template(
+    template: str,
+    name: str = "<template>",
+    escape: Callable[[str], str] | None = None,
+) -> tuple[RenderFunction, frozenset[str]]:
+    """Compile a ``str.format`` template into an f-string function of its placeholders.
+
+    Returns the function and its placeholder names. The function takes the
+    placeholders as keyword arguments and ignores extra ones. With ``escape``,
+    formatted values except ``SafeText`` are escaped and the result is
+    ``SafeText``. Placeholder names starting with ``_``, keywords and the
+    names the function uses itself are rejected.
+    """
+    parts: list[ast.expr] = []
+    fields: dict[str, None] = {}
+    for literal, field, spec, conversion in Formatter().parse(template):
+        if literal:
+            parts.append(ast.Constant(literal))
+        if field is None:
+            continue
+        if not field.isidentifier() or (spec and "{" in spec):
+            raise ValueError(f"Message {name!r}: placeholder {{{field}}} must be a plain name")
+        if field.startswith("_") or keyword.iskeyword(field) or field in _TEMPLATE_NAMES:
+            raise ValueError(f"Message {name!r}: placeholder name {{{field}}} is reserved")
+        fields[field] = None
+
+        value: ast.expr = ast.Name(field, ast.Load())
+        if escape is None:
+            parts.append(
+                ast.FormattedValue(
+                    value=value,
+                    conversion=ord(conversion) if conversion else -1,
+                    format_spec=ast.JoinedStr([ast.Constant(spec)]) if spec else None,
+                )
+            )
+            continue
+        if conversion:
+            converter = {"r": "repr", "s": "str", "a": "ascii"}[conversion]
+            value = ast.Call(ast.Name(converter, ast.Load()), [value], [])
+        call = ast.Call(
+            ast.Name("_format_escaped", ast.Load()),
+            [value, ast.Constant(spec or ""), ast.Name("_escape", ast.Load())],
+            [],
+        )
+        parts.append(ast.FormattedValue(value=call, conversion=-1, format_spec=None))
+
+    if not fields:
+        text = "".join(part.value for part in parts if isinstance(part, ast.Constant))
+        if escape is not None:
+            text = SafeText(text)
+        return (lambda **_: text), frozenset()
+
+    body: ast.expr = ast.JoinedStr(parts)
+    if escape is not None:
+        body = ast.Call(ast.Name("SafeText", ast.Load()), [body], [])
+    function = ast.Expression(
+        ast.Lambda(
+            args=ast.arguments(
+                posonlyargs=[],
+                args=[],
+                kwonlyargs=[ast.arg(field) for field in fields],
+                kw_defaults=[None] * len(fields),
+                kwarg=ast.arg("_extra"),
+                defaults=[],
+            ),
+            body=body,
+        )
+    )
+    code = compile(ast.fix_missing_locations(function), f"<message {name}>", "eval")
+    namespace = {"_format_escaped": _format_escaped, "_escape": escape, "SafeText": SafeText}
+    return eval(code, namespace), frozenset(fields)  # noqa: S307 - built from AST nodes, no source text
+
+
+class Template:
+    """Message template compiled once, with values escaped for ``parse_mode``.
+
+    ``Template("<b>{name}</b>: {score:.1f}").render(name=..., score=...)``.
+    Values are escaped as plain text; pass ``SafeText`` to insert markup.
+    ``parse_mode=None`` inserts values as is.
+    """
+
+    __slots__ = ("source", "parse_mode", "fields", "_render")
+
+    def __init__(self, source: str, parse_mode: str | None = "HTML"):
+        if parse_mode is not None and parse_mode not in ESCAPERS:
+            raise ValueError(f"Unsupported parse mode {parse_mode!r}, expected one of {sorted(ESCAPERS)} or None")
+        self.source = source
+        self.parse_mode = parse_mode
+        escape = ESCAPERS[parse_mode] if parse_mode is not None else None
+        self._render, self.fields = compile_template(source, escape=escape)
+
+    def render(self, **values: Any) -> str:
+        """Render with placeholder values. Missing values raise TypeError."""
+        return self._render(**values)
+
+    __call__ = render
+
+    def __repr__(self) -> str:
+        return f"<Template parse_mode={self.parse_mode} fields={sorted(self.fields)}>"
+
+
+def utf16_len(text: str) -> int:
+    """Length in UTF-16 code units, the unit of Telegram's limits and offsets."""
+    if text.isascii():
+        return len(text)
+    return len(text.encode("utf-16-le")) // 2
+
+
+def _utf16_prefix(text: str, units: int) -> int:
+    """Number of leading characters of ``text`` that fit in ``units`` UTF-16 code units."""
+    head = text[:units]
+    if head.isascii():
+        return len(head)
+    # A surrogate pair cut in half is dropped by the decoder
+    return len(head.encode("utf-16-le")[: 2 * units].decode("utf-16-le", "ignore"))
+
+
+def _check_parse_mode(parse_mode: str | None) -> bool:
+    if parse_mode not in (None, "HTML"):
+        raise ValueError(f"Splitting supports HTML and plain text, not {parse_mode!r}")
+    return parse_mode is not None
+
+
+def _visible_len(text: str, html: bool) -> int:
+    if html:
+        text = _HTML_ENTITY.sub("&", _HTML_TAG.sub("", text))
+    return utf16_len(text)
+
+
+def _cut(text: str, units: int, has_content: bool) -> tuple[str, str] | None:
+    """Split ``text`` so the head fits ``units``, preferring paragraph, line and word ends.
+
+    The separator at the cut is dropped. Returns None when the part already
+    has content and the text has no break: the part should end before it.
+    """
+    head = text[: _utf16_prefix(text, units)]
+    for separator in ("\n\n", "\n", " "):
+        index = head.rfind(separator)
+        if index > len(head) // 2:
+            return head[:index], text[index + len(separator) :]
+    index = max(head.rfind("\n"), head.rfind(" "))
+    if index > 0:
+        return head[:index], text[index + 1 :]
+    if has_content:
+        return None
+    return head, text[len(head) :]
+
+
+def _chunks(text: str, limit: int, html: bool) -> Iterator[tuple[str, str]]:
+    """Yield (body, closing tags) of consecutive parts of at most ``limit`` visible units.
+
+    Parts never end inside a tag or entity; tags open at a cut are closed at
+    the end of the part and reopened at the start of the next one.
+    """
+    if limit < 1:
+        raise ValueError("limit must be positive")
+
+    stack: list[tuple[str, str]] = []  # (name, opening tag)
+    body: list[str] = []
+    size = 0
+    produced = False
+
+    def part() -> tuple[str, str]:
+        # Tags opened right before the cut are left to the next part, not emptied
+        kept = len(stack)
+        while kept and body and body[-1] is stack[kept - 1][1]:
+            body.pop()
+            kept -= 1
+        return "".join(body), "".join(f"</{name}>" for name, _ in reversed(stack[:kept]))
+
+    for match in _HTML_TOKEN.finditer(text) if html else (None,):
+        token = text if match is None else match.group()
+        if match is not None and match.group(2):
+            body.append(token)
+            tag = match.group(2).lower()
+            if not match.group(1):
+                stack.append((tag, token))
+            else:
+                for index in range(len(stack) - 1, -1, -1):
+                    if stack[index][0] == tag:
+                        del stack[index]
+                        break
+            continue
+
+        if match is not None and len(token) > 1 and token[0] == "&":
+            width = 2 if token.startswith("&#") and _entity_codepoint(token) > 0xFFFF else 1
+            if size + width > limit:
+                yield part()
+                produced = True
+                body, size = [opening for _, opening in stack], 0
+            body.append(token)
+            size += width
+            continue
+
+        while token:
+            if produced and not size:
+                # A part does not start with the whitespace left after a cut
+                token = token.lstrip()
+                if not token:
+                    break
+            width = utf16_len(token)
+            if size + width <= limit:
+                body.append(token)
+                size += width
+                break
+            cut = _cut(token, limit - size, size > 0)
+            if cut is not None:
+                head, token = cut
+                body.append(head)
+            yield part()
+            produced = True
+            body, size = [opening for _, opening in stack], 0
+
+    if size or not produced:
+        yield part()
+
+
+def _entity_codepoint(entity: str) -> int:
+    number = entity[2:-1]
+    try:
+        return int(number[1:], 16) if number[:1] in ("x", "X") else int(number)
+    except ValueError:
+        return 0
+
+
+def split_message(text: str, limit: int = MESSAGE_LIMIT, parse_mode: str | None = "HTML") -> list[str]:
+    """Split text into messages of at most ``limit`` visible UTF-16 units.
+
+    Cuts at paragraph, line or word ends when possible, never inside a tag or
+    entity, and keeps formatting: open tags are closed and reopened across
+    parts. Supports ``HTML`` and plain text (``parse_mode=None``).
+    """
+    html = _check_parse_mode(parse_mode)
+    if _visible_len(text, html) <= limit:
+        return [text]
+    return [body + tags for body, tags in _chunks(text, limit, html)]
+
+
+def truncate_message(
+    text: str,
+    limit: int = MESSAGE_LIMIT,
+    parse_mode: str | None = "HTML",
+    suffix: str = "…",
+) -> str:
+    """Truncate text to ``limit`` visible UTF-16 units, keeping the markup valid.
+
+    ``suffix`` is inserted before the closing tags and must be valid in
+    ``parse_mode``. When ``limit`` leaves no room for text, the result is the
+    suffix alone, itself truncated to ``limit``.
+    """
+    html = _check_parse_mode(parse_mode)
+    if _visible_len(text, html) <= limit:
+        return text
+    room = limit - _visible_len(suffix, html)
+    if room < 1:
+        body, tags = next(_chunks(suffix, limit, html))
+        return body + tags
+    body, tags = next(_chunks(text, room, html))
+    return body + suffix + tags
@@ -0,0 +1,122 @@
+"""Token bucket rate limiters."""
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second up to ``capacity``.
+
+    ``acquire`` reserves tokens immediately and sleeps off any deficit, so waiters
+    are served in arrival order without a lock.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available right now."""
+        self._refill()
+        if self._tokens < tokens:
+            return False
+        self._tokens -= tokens
+        return True
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Take tokens, possibly going into debt. Returns seconds to wait before proceeding."""
+        self._refill()
+        self._tokens -= tokens
+        return -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+    async def acquire(self, tokens: float = 1.0) -> float:
+        """Wait until tokens are available. Returns seconds waited."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def pause(self, seconds: float) -> None:
+        """Block the bucket for ``seconds`` (e.g. after a RetryAfter from the server)."""
+        self._refill()
+        self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+
+class KeyedTokenBuckets:
+    """Per-key token buckets held in compact LRU storage with idle eviction.
+
+    Each key costs one ``[tokens, updated]`` list. Keys idle for ``idle_ttl``
+    seconds are evicted lazily from the LRU end; at most ``max_keys`` are kept.
+    Keys still in debt (paused, or with reservations not yet due) are never
+    evicted, since a fresh bucket would lift the pause; they may push the count
+    over ``max_keys`` until their debt is paid off.
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None, idle_ttl: float = 60.0, max_keys: int = 100_000):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self.idle_ttl = idle_ttl
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[Hashable, list[float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    def _bucket(self, key: Hashable, now: float) -> list[float]:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            self._evict(now)
+            bucket = [self.capacity, now]
+            self._buckets[key] = bucket
+        else:
+            self._buckets.move_to_end(key)
+            bucket[0] = min(self.capacity, bucket[0] + (now - bucket[1]) * self.rate)
+            bucket[1] = now
+        return bucket
+
+    def _evict(self, now: float) -> None:
+        buckets = self._buckets
+        kept = 0
+        while len(buckets) > kept:
+            key, oldest = next(iter(buckets.items()))
+            if len(buckets) < self.max_keys and now - oldest[1] < self.idle_ttl:
+                break
+            if oldest[0] + (now - oldest[1]) * self.rate < 0:
+                buckets.move_to_end(key)
+                kept += 1
+            else:
+                buckets.popitem(last=False)
+
+    def try_acquire(self, key: Hashable, tokens: float = 1.0) -> bool:
+        """Take tokens for key if available right now."""
+        bucket = self._bucket(key, time.monotonic())
+        if bucket[0] < tokens:
+            return False
+        bucket[0] -= tokens
+        return True
+
+    def reserve(self, key: Hashable, tokens: float = 1.0) -> float:
+        """Take tokens for key, possibly going into debt. Returns seconds to wait."""
+        bucket = self._bucket(key, time.monotonic())
+        bucket[0] -= tokens
+        return -bucket[0] / self.rate if bucket[0] < 0 else 0.0
+
+    async def acquire(self, key: Hashable, tokens: float = 1.0) -> float:
+        """Wait until tokens for key are available. Returns seconds waited."""
+        delay = self.reserve(key, tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def pause(self, key: Hashable, seconds: float) -> None:
+        """Block key for ``seconds``."""
+        bucket = self._bucket(key, time.monotonic())
+        bucket[0] = min(bucket[0], 0.0) - seconds * self.rate
@@ -0,0 +1 @@
+"""Performance benchmarks (run as scripts, not collected by pytest)."""
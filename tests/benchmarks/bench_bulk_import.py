@@ -0,0 +1,81 @@
+"""Benchmark bulk user import paths against the configured database.
+
+Usage:
+    python -m tests.benchmarks.bench_bulk_import --rows 1000000
+
+Every run happens in a transaction that is rolled back, so the database is left untouched.
+"""
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from infrastructure.database.core.session import close_engine, get_session_factory
+from infrastructure.database.repositories.base import BulkUpsertResult
+from infrastructure.database.repositories.user_repository import UserRepository
+
+COLUMNS = ("telegram_id", "username", "first_name", "last_name", "language")
+BASE_TELEGRAM_ID = 9_000_000_000
+
+
+def make_records(rows: int) -> list[tuple[Any, ...]]:
+    """Generate synthetic user records."""
+    return [
+        (BASE_TELEGRAM_ID + i, f"user{i}", f"First{i}", None if i % 3 else f"Last{i}", "en" if i % 2 else "ru")
+        for i in range(rows)
+    ]
+
+
+async def run(name: str, rows: int, fn: Callable[[UserRepository], Awaitable[BulkUpsertResult]]) -> None:
+    """Run one benchmark case inside a rolled-back transaction."""
+    async with get_session_factory()() as session:
+        repo = UserRepository(session)
+        start = time.perf_counter()
+        result = await fn(repo)
+        elapsed = time.perf_counter() - start
+        await session.rollback()
+
+    print(
+        f"{name:<28} rows={rows:>9} inserted={result.inserted:>9} updated={result.updated:>9} "
+        f"time={elapsed:8.2f}s rate={rows / elapsed:>10.0f} rows/s"
+    )
+
+
+async def main() -> None:
+    """Run benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows for the COPY path")
+    parser.add_argument("--insert-rows", type=int, default=100_000, help="Rows for multi-row INSERT paths")
+    args = parser.parse_args()
+
+    copy_records = make_records(args.rows)
+    insert_records = copy_records[: args.insert_rows]
+    insert_data = [dict(zip(COLUMNS, record, strict=True)) for record in insert_records]
+
+    async def orm_add_all(repo: UserRepository) -> BulkUpsertResult:
+        await repo.create_many(insert_data)
+        return BulkUpsertResult(inserted=len(insert_data))
+
+    async def upsert_many(repo: UserRepository) -> BulkUpsertResult:
+        return await repo.upsert_many(insert_data, conflict_columns=("telegram_id",))
+
+    async def copy_upsert(repo: UserRepository) -> BulkUpsertResult:
+        return await repo.copy_upsert(copy_records, COLUMNS, conflict_columns=("telegram_id",))
+
+    async def copy_upsert_existing(repo: UserRepository) -> BulkUpsertResult:
+        # Second pass in the same transaction exercises the update branch
+        await repo.copy_upsert(copy_records, COLUMNS, conflict_columns=("telegram_id",))
+        return await repo.copy_upsert(copy_records, COLUMNS, conflict_columns=("telegram_id",))
+
+    try:
+        await run("create_many (ORM add_all)", args.insert_rows, orm_add_all)
+        await run("upsert_many (multi-row)", args.insert_rows, upsert_many)
+        await run("copy_upsert (insert)", args.rows, copy_upsert)
+        await run("copy_upsert (insert+update)", args.rows * 2, copy_upsert_existing)
+    finally:
+        await close_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
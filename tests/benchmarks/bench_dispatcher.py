@@ -0,0 +1,254 @@
+"""Benchmark dispatcher throughput on synthetic updates against the configured database.
+
+Builds the dispatcher exactly like ``main()`` (routers, middlewares, Dishka) with a
+stubbed Bot API session, and feeds updates through ``Dispatcher.feed_update``.
+
+Usage:
+    python -m tests.benchmarks.bench_dispatcher --updates 5000 --concurrency 10 --output results.json
+
+Updates come from users with Telegram IDs counting up from ``BASE_TELEGRAM_ID``.
+The run refuses to start if any user in that ID range exists, and deletes exactly
+that range afterwards. Compare runs with any JSON diff tool.
+"""
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections.abc import AsyncGenerator, Callable
+from datetime import datetime
+from typing import Any
+
+from aiogram import Bot
+from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.base import BaseSession
+from aiogram.enums import ParseMode
+from aiogram.methods import GetMe, SendMessage, TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+from sqlalchemy import delete, event, func, select
+
+from apps.bot.main import create_dispatcher
+from infrastructure.database.core.session import get_engine, get_session_factory
+from infrastructure.database.models.users import User as UserModel
+
+BASE_TELEGRAM_ID = 8_000_000_000
+BOT_USER = User(id=1, is_bot=True, first_name="Bench", username="bench_bot")
+WARMUP_UPDATES = 200
+# Updates of each run_scenario() call that also go through the tracemalloc pass
+ALLOC_SAMPLE = 200
+
+
+class StubSession(BaseSession):
+    """Bot API session that answers every call locally without network I/O."""
+
+    async def make_request(
+        self, bot: Bot, method: TelegramMethod[TelegramType], timeout: int | None = None
+    ) -> TelegramType:
+        if isinstance(method, GetMe):
+            return BOT_USER
+        if isinstance(method, SendMessage):
+            return Message(
+                message_id=1,
+                date=datetime.now(),
+                chat=Chat(id=method.chat_id, type="private"),
+                from_user=BOT_USER,
+                text=method.text,
+            )
+        return True
+
+    async def stream_content(self, *args: Any, **kwargs: Any) -> AsyncGenerator[bytes, None]:
+        yield b""
+
+    async def close(self) -> None:
+        pass
+
+
+class RoundTripCounter:
+    """Counts statements and BEGIN/COMMIT/ROLLBACK sent by the engine."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        sync_engine = get_engine().sync_engine
+        event.listen(sync_engine, "after_cursor_execute", self._on_statement)
+        for name in ("begin", "commit", "rollback"):
+            event.listen(sync_engine, name, self._on_transaction)
+
+    def _on_statement(self, *args: Any) -> None:
+        self.count += 1
+
+    def _on_transaction(self, conn: Any) -> None:
+        if conn.get_execution_options().get("isolation_level") != "AUTOCOMMIT":
+            self.count += 1
+
+
+def _user(i: int) -> User:
+    return User(id=BASE_TELEGRAM_ID + i, is_bot=False, first_name=f"User{i}", username=f"user{i}", language_code="ru")
+
+
+def _message(i: int, text: str) -> Message:
+    user = _user(i)
+    return Message(
+        message_id=i, date=datetime.now(), chat=Chat(id=user.id, type="private"), from_user=user, text=text
+    )
+
+
+SCENARIOS: dict[str, Callable[[int], Update]] = {
+    "start": lambda i: Update(update_id=i, message=_message(i, "/start")),
+    "text": lambda i: Update(update_id=i, message=_message(i, "hello")),
+    "callback": lambda i: Update(
+        update_id=i,
+        callback_query=CallbackQuery(
+            id=str(i), from_user=_user(i), chat_instance="bench", data="bench", message=_message(i, "menu")
+        ),
+    ),
+}
+
+
+def _percentile(values: list[float], q: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+async def run_scenario(
+    dp: Any,
+    bot: Bot,
+    make_update: Callable[[int], Update],
+    first_id: int,
+    updates: int,
+    concurrency: int,
+    counter: RoundTripCounter,
+) -> dict[str, Any]:
+    """Feed updates (distinct users from ``first_id`` on) with ``concurrency`` workers and collect timings."""
+    latencies: list[float] = []
+    pending = iter([make_update(first_id + i) for i in range(updates)])
+
+    async def worker() -> None:
+        for update in pending:
+            started = time.perf_counter()
+            await dp.feed_update(bot, update)
+            latencies.append(time.perf_counter() - started)
+
+    round_trips = counter.count
+    blocks = sys.getallocatedblocks()
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    round_trips = counter.count - round_trips
+    retained_blocks = sys.getallocatedblocks() - blocks
+
+    # Separate, slower pass under tracemalloc for allocation volume
+    sample = min(updates, ALLOC_SAMPLE)
+    tracemalloc.start()
+    allocated = 0
+    for i in range(sample):
+        update = make_update(first_id + updates + i)
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        await dp.feed_update(bot, update)
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "updates": updates,
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 4),
+        "updates_per_sec": round(updates / elapsed, 1),
+        "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+        "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+        "max_ms": round(latencies[-1] * 1000, 3),
+        "db_round_trips_per_update": round(round_trips / updates, 2),
+        "peak_alloc_bytes_per_update": allocated // sample,
+        "retained_blocks_per_update": round(retained_blocks / updates, 2),
+    }
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def telegram_ids(updates: int) -> range:
+    """Telegram IDs of every user a run with ``updates`` per scenario sends updates from."""
+    warmup = min(updates, WARMUP_UPDATES)
+    # Warm-up takes [0, 2 * warmup), the measured run the rest, both plus their tracemalloc sample
+    return range(BASE_TELEGRAM_ID, BASE_TELEGRAM_ID + 2 * warmup + updates + min(updates, ALLOC_SAMPLE))
+
+
+async def count_users(ids: range) -> int:
+    """Count users whose Telegram ID is in ``ids``."""
+    async with get_session_factory()() as session:
+        query = select(func.count()).where(UserModel.telegram_id >= ids.start, UserModel.telegram_id < ids.stop)
+        return (await session.execute(query)).scalar_one()
+
+
+async def cleanup(ids: range) -> None:
+    """Delete users created by the benchmark."""
+    async with get_session_factory()() as session:
+        await session.execute(
+            delete(UserModel).where(UserModel.telegram_id >= ids.start, UserModel.telegram_id < ids.stop)
+        )
+        await session.commit()
+
+
+async def main() -> None:
+    """Run benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--updates", type=int, default=5000, help="Updates per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Updates fed at once")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append", help="Run only these scenarios")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    ids = telegram_ids(args.updates)
+    existing = await count_users(ids)
+    if existing:
+        sys.exit(
+            f"{existing} users already have Telegram IDs in [{ids.start}, {ids.stop}), which the benchmark "
+            "deletes when done. Run it against a dedicated database."
+        )
+
+    bot = Bot(token="1:bench", session=StubSession(), default=DefaultBotProperties(parse_mode=ParseMode.HTML))
+    dp, container = create_dispatcher(bot)
+    counter = RoundTripCounter()
+
+    results: dict[str, Any] = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "scenarios": {},
+    }
+
+    workflow_data = {"dispatcher": dp, "bots": [bot], **dp.workflow_data}
+    await dp.emit_startup(bot=bot, **workflow_data)
+    try:
+        for name in args.scenario or SCENARIOS:
+            # Warm up caches, prepared statements and the connection pool on separate users
+            warmup = min(args.updates, WARMUP_UPDATES)
+            await run_scenario(dp, bot, SCENARIOS[name], 0, warmup, args.concurrency, counter)
+            first_id = warmup * 2
+            result = await run_scenario(dp, bot, SCENARIOS[name], first_id, args.updates, args.concurrency, counter)
+            results["scenarios"][name] = result
+            print(
+                f"{name:<10} {result['updates_per_sec']:>9.1f} upd/s  p50={result['p50_ms']:>7.3f}ms  "
+                f"p99={result['p99_ms']:>7.3f}ms  rt/upd={result['db_round_trips_per_update']:>5.2f}  "
+                f"alloc/upd={result['peak_alloc_bytes_per_update']:>7}B"
+            )
+    finally:
+        await dp.emit_shutdown(bot=bot, **workflow_data)
+        await cleanup(ids)
+        await container.close()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,181 @@
+"""End-to-end load test: the real bot process against a local fake Bot API server.
+
+Starts ``FakeBotAPI``, launches ``apps.bot.main`` in polling mode with
+``BOT__API_BASE_URL`` pointing at it, and pushes ``/start`` updates at a fixed
+rate from a growing number of simulated users. Each reply is matched to its
+update to measure end-to-end latency (HTTP, polling, dispatch, DB, sendMessage).
+
+Usage:
+    python -m tests.benchmarks.bench_e2e --users 1000,5000,20000 --rate 300 --duration 30 --output e2e.json
+
+Simulated users have Telegram IDs counting up from ``BASE_TELEGRAM_ID``. The run
+refuses to start if any user in that ID range exists, and deletes exactly that
+range afterwards.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import delete, func, select
+
+from infrastructure.database.core.session import close_engine, get_session_factory
+from infrastructure.database.models.users import User
+from tests.benchmarks.fake_bot_api import FakeBotAPI
+
+BASE_TELEGRAM_ID = 8_500_000_000
+BOT_TOKEN = "123456:load-test"
+
+
+def _percentile(values: list[float], q: float) -> float:
+    return sorted(values)[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+async def count_users(ids: range) -> int:
+    """Count users whose Telegram ID is in ``ids``."""
+    async with get_session_factory()() as session:
+        query = select(func.count()).where(User.telegram_id >= ids.start, User.telegram_id < ids.stop)
+        return (await session.execute(query)).scalar_one()
+
+
+async def cleanup(ids: range) -> None:
+    """Delete users created by the load test."""
+    async with get_session_factory()() as session:
+        await session.execute(delete(User).where(User.telegram_id >= ids.start, User.telegram_id < ids.stop))
+        await session.commit()
+
+
+async def start_bot(api_url: str, api_limits: bool, log_file: str | None) -> asyncio.subprocess.Process:
+    """Launch the bot in polling mode against the fake server."""
+    env = {
+        **os.environ,
+        "BOT__TOKEN": BOT_TOKEN,
+        "BOT__MODE": "polling",
+        "BOT__API_BASE_URL": api_url,
+        "BOT__API_RATE_LIMIT": str(api_limits).lower(),
+        "BOT__DROP_PENDING_UPDATES": "true",
+    }
+    output = open(log_file, "w") if log_file else subprocess.DEVNULL  # noqa: SIM115
+    return await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "apps.bot.main", env=env, stdout=output, stderr=subprocess.STDOUT
+    )
+
+
+async def wait_for_polling(api: FakeBotAPI, bot: asyncio.subprocess.Process, timeout: float = 30.0) -> None:
+    """Wait until the bot starts long polling."""
+    deadline = time.monotonic() + timeout
+    while api.stats.calls["getUpdates"] == 0:
+        if bot.returncode is not None:
+            raise RuntimeError(f"Bot exited with code {bot.returncode}")
+        if time.monotonic() > deadline:
+            raise TimeoutError("Bot did not start polling")
+        await asyncio.sleep(0.1)
+
+
+async def run_phase(api: FakeBotAPI, users: int, rate: float, duration: float, drain: float) -> dict[str, Any]:
+    """Push updates from ``users`` users, wait for replies and summarize.
+
+    The phase lasts at least ``users / rate`` seconds so that every simulated
+    user sends an update; shorter phases would only exercise the first
+    ``rate * duration`` users.
+    """
+    api.reset_stats()
+    duration = max(duration, users / rate)
+    started = time.monotonic()
+    await api.generate(rate, users, duration)
+
+    deadline = time.monotonic() + drain
+    while api.pending_replies and time.monotonic() < deadline:
+        await asyncio.sleep(0.1)
+    elapsed = time.monotonic() - started
+
+    stats = api.stats
+    send_calls = stats.calls["sendMessage"]
+    return {
+        "users": users,
+        "active_users": min(users, stats.updates_sent),
+        "offered_rate": rate,
+        "load_seconds": round(duration, 2),
+        "updates": stats.updates_sent,
+        "replies": stats.replies,
+        "seconds": round(elapsed, 2),
+        "replies_per_sec": round(stats.replies / elapsed, 1),
+        "p50_ms": round(_percentile(stats.latencies, 0.50) * 1000, 1),
+        "p95_ms": round(_percentile(stats.latencies, 0.95) * 1000, 1),
+        "p99_ms": round(_percentile(stats.latencies, 0.99) * 1000, 1),
+        "unanswered_rate": round(api.pending_replies / stats.updates_sent, 4) if stats.updates_sent else 0.0,
+        "injected_429_rate": round(stats.injected_429 / send_calls, 4) if send_calls else 0.0,
+        "calls": dict(stats.calls),
+    }
+
+
+async def main() -> None:
+    """Run load test."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", default="1000,5000,20000", help="Comma-separated simulated user counts")
+    parser.add_argument("--rate", type=float, default=300, help="Updates per second")
+    parser.add_argument("--duration", type=float, default=30, help="Min seconds of load per phase")
+    parser.add_argument("--drain", type=float, default=30, help="Max seconds to wait for outstanding replies")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Fake Bot API response delay")
+    parser.add_argument("--error-rate", type=float, default=0, help="Share of sendMessage calls answered with 429")
+    parser.add_argument("--api-limits", action="store_true", help="Keep the bot's outgoing rate limiter on")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--bot-log", help="Write bot output to this file")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    phases = [int(users) for users in args.users.split(",")]
+    ids = range(BASE_TELEGRAM_ID, BASE_TELEGRAM_ID + max(phases))
+    existing = await count_users(ids)
+    if existing:
+        await close_engine()
+        sys.exit(
+            f"{existing} users already have Telegram IDs in [{ids.start}, {ids.stop}), which the load test "
+            "deletes when done. Run it against a dedicated database."
+        )
+
+    api = FakeBotAPI(BASE_TELEGRAM_ID, latency=args.latency_ms / 1000, error_rate=args.error_rate)
+    await api.start(args.host, args.port)
+
+    results: dict[str, Any] = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "latency_ms": args.latency_ms,
+        "error_rate": args.error_rate,
+        "phases": [],
+    }
+
+    bot = await start_bot(f"http://{args.host}:{args.port}", args.api_limits, args.bot_log)
+    try:
+        await wait_for_polling(api, bot)
+        for users in phases:
+            result = await run_phase(api, users, args.rate, args.duration, args.drain)
+            results["phases"].append(result)
+            print(
+                f"users={result['active_users']:>6}  {result['replies_per_sec']:>7.1f} replies/s  "
+                f"p50={result['p50_ms']:>7.1f}ms  p95={result['p95_ms']:>7.1f}ms  p99={result['p99_ms']:>7.1f}ms  "
+                f"unanswered={result['unanswered_rate']:.2%}  429={result['injected_429_rate']:.2%}"
+            )
+    finally:
+        if bot.returncode is None:
+            bot.terminate()
+        await bot.wait()
+        await api.close()
+        await cleanup(ids)
+        await close_engine()
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,126 @@
+"""Benchmark message formatting helpers (no database needed).
+
+Usage:
+    python -m tests.benchmarks.bench_formatters --number 20000 --output formatters.json
+
+Times escaping against the previous implementations (unconditional replace
+chains) and single-pass alternatives (``str.translate``, ``re.sub``) on short,
+long plain and long markup-heavy text; template rendering with
+auto-escaping against escaping by hand; and splitting/truncating a long HTML
+message.
+"""
+import argparse
+import json
+import re
+import timeit
+from collections.abc import Callable
+from typing import Any
+
+from shared.utils.formatters import Template, escape_html, escape_markdown, split_message, truncate_message
+
+_HTML_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"})
+_MARKDOWN_CHARS = "\\_*[]()~`>#+-=|{}.!"
+_MARKDOWN_TABLE = str.maketrans({char: f"\\{char}" for char in _MARKDOWN_CHARS})
+_MARKDOWN_RE = re.compile("[" + re.escape(_MARKDOWN_CHARS) + "]")
+_HTML_RE = re.compile("[&<>\"']")
+_HTML_ENTITIES = {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#x27;"}
+
+TEXTS = {
+    "short": "Привет, Иван!",
+    "long_plain": "Обычный текст сообщения без разметки и спецсимволов " * 200,
+    "long_markup": '<b>Цена:</b> 1.5 * (2 + 3) = 7.5 & "скидка" -10% [подробнее](url) ' * 150,
+}
+
+
+def escape_html_chained(text: str) -> str:
+    """Previous ``escape_html``."""
+    return (
+        text.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+        .replace("'", "&#x27;")
+    )
+
+
+def escape_markdown_loop(text: str) -> str:
+    """Previous ``escape_markdown`` (plus the backslash it missed)."""
+    for char in _MARKDOWN_CHARS:
+        text = text.replace(char, f"\\{char}")
+    return text
+
+
+def _ns(fn: Callable[[], Any], number: int) -> float:
+    """Best of 5 runs, nanoseconds per call."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e9
+
+
+def bench_escape(number: int) -> dict[str, float]:
+    """Time HTML and MarkdownV2 escaping of each text."""
+    variants: dict[str, Callable[[str], str]] = {
+        "html_current": escape_html,
+        "html_chained": escape_html_chained,
+        "html_translate": lambda text: text.translate(_HTML_TABLE),
+        "html_re_sub": lambda text: _HTML_RE.sub(lambda m: _HTML_ENTITIES[m.group()], text),
+        "markdown_current": escape_markdown,
+        "markdown_loop": escape_markdown_loop,
+        "markdown_translate": lambda text: text.translate(_MARKDOWN_TABLE),
+        "markdown_re_sub": lambda text: _MARKDOWN_RE.sub(r"\\\g<0>", text),
+    }
+    results: dict[str, float] = {}
+    for text_name, text in TEXTS.items():
+        runs = number if len(text) < 100 else max(number // 100, 10)
+        for variant, fn in variants.items():
+            results[f"{variant}_{text_name}_ns"] = _ns(lambda fn=fn, text=text: fn(text), runs)
+    return results
+
+
+def bench_template(number: int) -> dict[str, float]:
+    """Time an auto-escaping template against escaping values by hand."""
+    template = Template("<b>{name}</b> ({username}): {score:.1f} pts, rank {rank}")
+    source = template.source
+    values = {"name": "Tom & <Jerry>", "username": "tom_j", "score": 97.25, "rank": 3}
+    return {
+        "template_render_ns": _ns(lambda: template.render(**values), number),
+        "manual_escape_format_ns": _ns(
+            lambda: source.format(
+                name=escape_html(values["name"]),
+                username=escape_html(values["username"]),
+                score=values["score"],
+                rank=values["rank"],
+            ),
+            number,
+        ),
+    }
+
+
+def bench_split(number: int) -> dict[str, float]:
+    """Time splitting and truncating a ~20k character HTML message."""
+    line = "Строка с <i>курсивом</i> и <a href='https://example.com'>ссылкой</a> &amp; 😀\n"
+    text = "<b>Заголовок</b>\n\n" + line * 300
+    runs = max(number // 100, 10)
+    return {
+        "split_html_20k_us": _ns(lambda: split_message(text), runs) / 1000,
+        "truncate_html_20k_us": _ns(lambda: truncate_message(text), runs) / 1000,
+        "split_plain_20k_us": _ns(lambda: split_message(text, parse_mode=None), runs) / 1000,
+    }
+
+
+def main() -> None:
+    """Run benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=20_000, help="Calls per measurement for short inputs")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    results = bench_escape(args.number) | bench_template(args.number) | bench_split(args.number)
+    for name, value in results.items():
+        print(f"{name:<40} {value:>12.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
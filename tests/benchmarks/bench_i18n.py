@@ -0,0 +1,130 @@
+"""Benchmark per-message localization cost (no database needed).
+
+Usage:
+    python -m tests.benchmarks.bench_i18n --number 200000 --output i18n.json
+
+Compares compiled catalog templates with inline f-strings and ``str.format``
+on the same text, and times locale resolution in ``I18nMiddleware`` for cached
+and uncached users.
+"""
+import argparse
+import contextlib
+import json
+import time
+import timeit
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from aiogram.types import User as TelegramUser
+
+from apps.bot.locales import I18n
+from apps.bot.locales.i18n import LOCALES_DIR
+from apps.bot.middlewares.i18n_middleware import I18nMiddleware
+from infrastructure.database.user_cache import UserCache
+from shared.dto.user import UserSnapshotDTO
+from shared.enums import Language, UserRole, UserStatus
+
+STATUS = {
+    "id": 42,
+    "processed": 1500,
+    "total": 10000,
+    "sent": 1480,
+    "failed": 12,
+    "blocked": 8,
+    "rate": 27.53,
+    "eta": "308 s",
+}
+
+
+def _ns(fn: Callable[[], Any], number: int) -> float:
+    """Best of 5 runs, nanoseconds per call."""
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e9
+
+
+def bench_render(i18n: I18n, number: int) -> dict[str, float]:
+    """Time rendering of a static and a placeholder-heavy message."""
+    t = i18n.get("en")
+    template = (
+        "<b>Broadcast #{id}</b>\n\nProcessed: {processed}/{total}\nSent: {sent}\nFailed: {failed}\n"
+        "Blocked the bot: {blocked}\nRate: {rate:.1f} msg/s\nRemaining: {eta}"
+    )
+    s = STATUS
+
+    return {
+        "static_catalog_ns": _ns(lambda: t("errors.unexpected"), number),
+        "placeholders_catalog_ns": _ns(lambda: t("broadcast.status", **s), number),
+        "placeholders_str_format_ns": _ns(lambda: template.format(**s), number),
+        "placeholders_fstring_ns": _ns(
+            lambda: (
+                f"<b>Broadcast #{s['id']}</b>\n\nProcessed: {s['processed']}/{s['total']}\nSent: {s['sent']}\n"
+                f"Failed: {s['failed']}\nBlocked the bot: {s['blocked']}\nRate: {s['rate']:.1f} msg/s\n"
+                f"Remaining: {s['eta']}"
+            ),
+            number,
+        ),
+    }
+
+
+def bench_resolve(i18n: I18n, number: int) -> dict[str, float]:
+    """Time locale resolution in the middleware for a cached and an uncached user."""
+    cache = UserCache(max_size=10, ttl=3600)
+    cache.set(
+        UserSnapshotDTO(
+            id=1,
+            telegram_id=1,
+            username=None,
+            first_name="A",
+            last_name=None,
+            language=Language.UK,
+            role=UserRole.USER,
+            status=UserStatus.ACTIVE,
+            referrer_id=None,
+            created_at=datetime.utcnow(),
+        )
+    )
+    middleware = I18nMiddleware(i18n, cache)
+
+    async def handler(event: Any, data: dict[str, Any]) -> None:
+        return None
+
+    def resolve(user: TelegramUser) -> Callable[[], None]:
+        def run() -> None:
+            # Drive the coroutine by hand: it never awaits anything that suspends
+            coro = middleware(handler, None, {"event_from_user": user})  # type: ignore[arg-type]
+            with contextlib.suppress(StopIteration):
+                coro.send(None)
+
+        return run
+
+    cached = TelegramUser(id=1, is_bot=False, first_name="A", language_code="en")
+    uncached = TelegramUser(id=2, is_bot=False, first_name="B", language_code="pt-br")
+    return {
+        "resolve_cached_user_ns": _ns(resolve(cached), number),
+        "resolve_language_code_ns": _ns(resolve(uncached), number),
+    }
+
+
+def main() -> None:
+    """Run benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200_000, help="Calls per measurement")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    i18n = I18n(LOCALES_DIR, default_locale="ru")
+    results: dict[str, float] = {"load_ms": (time.perf_counter() - start) * 1000}
+    results |= bench_render(i18n, args.number)
+    results |= bench_resolve(i18n, args.number)
+
+    for name, value in results.items():
+        print(f"{name:<30} {value:>10.1f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Local fake Telegram Bot API server for load tests.
+
+Serves generated ``/start`` updates over ``getUpdates`` long polling, answers
+``sendMessage`` and other methods, and records every call. Point the bot at it
+with ``BOT__API_BASE_URL=http://host:port``.
+"""
+import asyncio
+import json
+import random
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from aiohttp import web
+
+BOT_USER = {"id": 1, "is_bot": True, "first_name": "Load", "username": "load_test_bot"}
+
+
+@dataclass
+class FakeApiStats:
+    """Calls, injected errors and reply latencies recorded by the fake server."""
+
+    updates_sent: int = 0
+    replies: int = 0
+    injected_429: int = 0
+    calls: Counter[str] = field(default_factory=Counter)
+    latencies: list[float] = field(default_factory=list)
+
+
+class FakeBotAPI:
+    """aiohttp app imitating the Bot API endpoints a polling bot uses.
+
+    Every response is delayed by ``latency`` seconds; ``error_rate`` of
+    ``sendMessage`` calls are answered with 429 and ``retry_after``.
+    """
+
+    def __init__(
+        self, base_telegram_id: int, latency: float = 0.0, error_rate: float = 0.0, retry_after: int = 1
+    ):
+        self.base_telegram_id = base_telegram_id
+        self.latency = latency
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.stats = FakeApiStats()
+        self._update_id = 0
+        self._updates: deque[dict[str, Any]] = deque()
+        self._new_updates = asyncio.Event()
+        # chat_id -> creation times of updates still waiting for a reply
+        self._pending: dict[int, deque[float]] = {}
+        self._runner: web.AppRunner | None = None
+
+    @property
+    def pending_replies(self) -> int:
+        """Updates not answered yet."""
+        return sum(len(times) for times in self._pending.values())
+
+    def reset_stats(self) -> None:
+        """Start a new measurement window."""
+        self.stats = FakeApiStats()
+        self._pending.clear()
+
+    async def start(self, host: str, port: int) -> None:
+        """Start serving."""
+        app = web.Application()
+        app.router.add_route("*", "/bot{token}/{method}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host=host, port=port).start()
+
+    async def close(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def push_update(self, user_index: int) -> None:
+        """Queue a ``/start`` message from simulated user ``user_index``."""
+        self._update_id += 1
+        user_id = self.base_telegram_id + user_index
+        user = {"id": user_id, "is_bot": False, "first_name": f"User{user_index}", "language_code": "ru"}
+        self._updates.append(
+            {
+                "update_id": self._update_id,
+                "message": {
+                    "message_id": self._update_id,
+                    "date": int(time.time()),
+                    "chat": {"id": user_id, "type": "private", "first_name": user["first_name"]},
+                    "from": user,
+                    "text": "/start",
+                    "entities": [{"type": "bot_command", "offset": 0, "length": 6}],
+                },
+            }
+        )
+        self._pending.setdefault(user_id, deque()).append(time.monotonic())
+        self.stats.updates_sent += 1
+        self._new_updates.set()
+
+    async def generate(self, rate: float, users: int, duration: float) -> None:
+        """Push ``rate * duration`` updates at ``rate`` per second from ``users`` users (round-robin)."""
+        tick = 0.01
+        total = round(rate * duration)
+        started = time.monotonic()
+        sent = 0
+        while sent < total:
+            due = min(total, int((time.monotonic() - started) * rate))
+            while sent < due:
+                self.push_update(sent % users)
+                sent += 1
+            await asyncio.sleep(tick)
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        params = await self._params(request)
+        self.stats.calls[method] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if method == "getUpdates":
+            return self._ok(await self._get_updates(params))
+        if method == "getMe":
+            return self._ok(BOT_USER)
+        if method == "sendMessage":
+            if self.error_rate and random.random() < self.error_rate:
+                self.stats.injected_429 += 1
+                return self._too_many_requests()
+            return self._ok(self._send_message(params))
+        return self._ok(True)
+
+    @staticmethod
+    async def _params(request: web.Request) -> dict[str, Any]:
+        if request.content_type == "application/json":
+            return await request.json()
+        return dict(await request.post())
+
+    async def _get_updates(self, params: dict[str, Any]) -> list[dict[str, Any]]:
+        offset = int(params.get("offset") or 0)
+        limit = int(params.get("limit") or 100)
+        timeout = float(params.get("timeout") or 0)
+
+        # Updates before offset are confirmed by the bot
+        while self._updates and self._updates[0]["update_id"] < offset:
+            self._updates.popleft()
+
+        if not self._updates and timeout:
+            self._new_updates.clear()
+            try:
+                await asyncio.wait_for(self._new_updates.wait(), timeout)
+            except TimeoutError:
+                return []
+
+        return [self._updates[i] for i in range(min(limit, len(self._updates)))]
+
+    def _send_message(self, params: dict[str, Any]) -> dict[str, Any]:
+        chat_id = int(params["chat_id"])
+        pending = self._pending.get(chat_id)
+        if pending:
+            self.stats.latencies.append(time.monotonic() - pending.popleft())
+            self.stats.replies += 1
+            if not pending:
+                del self._pending[chat_id]
+        return {
+            "message_id": random.randint(1, 2**31),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": BOT_USER,
+            "text": params.get("text", ""),
+        }
+
+    @staticmethod
+    def _ok(result: Any) -> web.Response:
+        return web.json_response({"ok": True, "result": result}, dumps=json.dumps)
+
+    def _too_many_requests(self) -> web.Response:
+        return web.json_response(
+            {
+                "ok": False,
+                "error_code": 429,
+                "description": f"Too Many Requests: retry after {self.retry_after}",
+                "parameters": {"retry_after": self.retry_after},
+            },
+            status=429,
+        )
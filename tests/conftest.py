@@ -0,0 +1,5 @@
+"""Shared test configuration."""
+import os
+
+# Settings are read from the environment; tests never talk to Telegram
+os.environ.setdefault("BOT__TOKEN", "42:TEST")
@@ -0,0 +1,36 @@
+"""Factories for Telegram objects used in tests."""
+from datetime import datetime
+
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+
+BOT_USER = User(id=1, is_bot=True, first_name="Test", username="test_bot")
+
+
+def make_user(telegram_id: int = 100, **fields: object) -> User:
+    """Build a Telegram user."""
+    return User(id=telegram_id, is_bot=False, first_name=f"User {telegram_id}", **fields)
+
+
+def make_message(chat_id: int = 100, text: str = "hello", user: User | None = None, message_id: int = 1) -> Message:
+    """Build a private chat message."""
+    return Message(
+        message_id=message_id,
+        date=datetime(2026, 1, 1),
+        chat=Chat(id=chat_id, type="private"),
+        from_user=user or make_user(chat_id),
+        text=text,
+    )
+
+
+def make_message_update(update_id: int, chat_id: int = 100, text: str = "hello", user: User | None = None) -> Update:
+    """Build an update with a private chat message."""
+    return Update(update_id=update_id, message=make_message(chat_id, text, user, message_id=update_id))
+
+
+def make_callback_update(update_id: int, chat_id: int = 100, data: str = "data") -> Update:
+    """Build an update with a callback query on a bot message."""
+    message = make_message(chat_id, "menu", BOT_USER)
+    callback = CallbackQuery(
+        id=str(update_id), from_user=make_user(chat_id), chat_instance="test", message=message, data=data
+    )
+    return Update(update_id=update_id, callback_query=callback)
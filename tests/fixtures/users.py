@@ -0,0 +1,22 @@
+"""Factories for user DTOs used in tests."""
+from datetime import datetime
+
+from shared.dto.user import UserSnapshotDTO
+from shared.enums import Language, UserRole, UserStatus
+
+
+def make_snapshot(telegram_id: int = 100, **fields: object) -> UserSnapshotDTO:
+    """Build a user snapshot."""
+    values = {
+        "id": telegram_id,
+        "telegram_id": telegram_id,
+        "username": None,
+        "first_name": f"User {telegram_id}",
+        "last_name": None,
+        "language": Language.RU,
+        "role": UserRole.USER,
+        "status": UserStatus.ACTIVE,
+        "referrer_id": None,
+        "created_at": datetime(2026, 1, 1),
+    }
+    return UserSnapshotDTO(**values | fields)
@@ -0,0 +1,58 @@
+"""Database fixtures for integration tests.
+
+Tests run against the configured database (``DATABASE_URL`` or ``POSTGRES__*``)
+with migrations applied, and are skipped when it is unreachable. Each test
+runs inside one outer transaction that is rolled back afterwards, so session
+commits only release savepoints and nothing is left behind.
+"""
+from collections.abc import AsyncIterator
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from config.settings.base import get_settings
+from infrastructure.database.core.session import TrackedSession
+
+
+@pytest.fixture
+async def engine() -> AsyncIterator[AsyncEngine]:
+    settings = get_settings().database
+    engine = create_async_engine(settings.async_url, connect_args=settings.async_connect_args, poolclass=NullPool)
+    try:
+        async with engine.connect():
+            pass
+    except Exception as e:
+        await engine.dispose()
+        pytest.skip(f"Database unavailable: {e}")
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+async def connection(engine: AsyncEngine) -> AsyncIterator[AsyncConnection]:
+    async with engine.connect() as connection:
+        transaction = await connection.begin()
+        try:
+            yield connection
+        finally:
+            await transaction.rollback()
+
+
+@pytest.fixture
+def session_factory(connection: AsyncConnection) -> async_sessionmaker[AsyncSession]:
+    """Sessions bound to the test transaction, configured like the application's."""
+    return async_sessionmaker(
+        bind=connection,
+        class_=AsyncSession,
+        sync_session_class=TrackedSession,
+        expire_on_commit=False,
+        autoflush=False,
+        join_transaction_mode="create_savepoint",
+    )
+
+
+@pytest.fixture
+async def session(session_factory: async_sessionmaker[AsyncSession]) -> AsyncIterator[AsyncSession]:
+    async with session_factory() as session:
+        yield session
@@ -0,0 +1,37 @@
+"""Tests for flushing the activity buffer to the database."""
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from infrastructure.database.activity import ActivityBuffer
+from infrastructure.database.models.users import User
+from infrastructure.database.repositories.user_repository import UserRepository
+from shared.dto.user import UserCreateDTO
+
+
+async def test_flush_applies_aggregated_activity(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    async with session_factory() as session:
+        for telegram_id in (7_000_000_011, 7_000_000_012):
+            await UserRepository(session).get_or_create(UserCreateDTO(telegram_id=telegram_id, first_name="Ann"))
+        await session.commit()
+
+    buffer = ActivityBuffer(session_factory, flush_interval=60, flush_max_users=100, max_users=100)
+    # Later than the registration, last_activity_at never moves back
+    at = datetime.utcnow() + timedelta(minutes=5)
+    buffer.record(7_000_000_011, messages=1, at=at)
+    buffer.record(7_000_000_011, messages=1, at=at)
+    buffer.record(7_000_000_012, at=at)
+    # Unknown users are skipped by the UPDATE
+    buffer.record(7_000_000_013, messages=5, at=at)
+
+    assert await buffer.flush() == 3
+    assert len(buffer) == 0
+
+    async with session_factory() as session:
+        rows = await session.execute(
+            select(User.telegram_id, User.total_messages, User.last_activity_at)
+            .where(User.telegram_id.in_((7_000_000_011, 7_000_000_012)))
+            .order_by(User.telegram_id)
+        )
+        assert rows.all() == [(7_000_000_011, 2, at), (7_000_000_012, 0, at)]
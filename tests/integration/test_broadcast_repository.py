@@ -0,0 +1,75 @@
+"""Tests for broadcast claims and checkpoints."""
+from datetime import datetime, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.database.repositories.broadcast_repository import BroadcastRepository
+from shared.enums import BroadcastStatus
+
+LEASE = timedelta(minutes=5)
+
+
+async def create_broadcasts(repository: BroadcastRepository, count: int) -> list[int]:
+    ids = []
+    for _ in range(count):
+        broadcast = await repository.create(text="hi")
+        ids.append(broadcast.id)
+    return ids
+
+
+async def claim(repository: BroadcastRepository, owner: str) -> list[int]:
+    claimed = await repository.claim_unfinished(owner, datetime.utcnow() - LEASE)
+    # Broadcasts left behind by other tests or runs are not ours to check
+    return [broadcast_id for broadcast_id in claimed if broadcast_id in repository.created_ids]
+
+
+async def test_each_broadcast_is_claimed_once(session: AsyncSession) -> None:
+    repository = BroadcastRepository(session)
+    repository.created_ids = await create_broadcasts(repository, 2)  # type: ignore[attr-defined]
+    done, = await create_broadcasts(repository, 1)
+    await repository.set_status(done, BroadcastStatus.COMPLETED)
+
+    assert await claim(repository, "a") == repository.created_ids  # type: ignore[attr-defined]
+    assert await claim(repository, "b") == []
+    # The owner reclaims its own broadcasts after a restart
+    assert await claim(repository, "a") == repository.created_ids  # type: ignore[attr-defined]
+
+
+async def test_stale_claim_is_taken_over(session: AsyncSession) -> None:
+    repository = BroadcastRepository(session)
+    broadcast_id, = repository.created_ids = await create_broadcasts(repository, 1)  # type: ignore[attr-defined]
+    await claim(repository, "a")
+    await repository.set_status(broadcast_id, BroadcastStatus.RUNNING)
+    assert await repository.save_progress(broadcast_id, "a", 10, 9, 1, 0)
+
+    broadcast = await repository.get(broadcast_id)
+    assert broadcast is not None
+    broadcast.heartbeat_at = datetime.utcnow() - LEASE - timedelta(seconds=1)
+    await session.flush()
+
+    assert await claim(repository, "b") == [broadcast_id]
+    # The previous owner notices on its next checkpoint and saves nothing
+    assert not await repository.save_progress(broadcast_id, "a", 20, 10, 0, 0)
+    await session.refresh(broadcast)
+    assert (broadcast.last_user_id, broadcast.sent_count, broadcast.failed_count) == (10, 9, 1)
+
+
+async def test_released_broadcasts_are_claimable(session: AsyncSession) -> None:
+    repository = BroadcastRepository(session)
+    repository.created_ids = await create_broadcasts(repository, 1)  # type: ignore[attr-defined]
+    await claim(repository, "a")
+
+    await repository.release("a")
+
+    assert await claim(repository, "b") == repository.created_ids  # type: ignore[attr-defined]
+
+
+async def test_cancelled_broadcast_stops_checkpoints(session: AsyncSession) -> None:
+    repository = BroadcastRepository(session)
+    broadcast_id, = repository.created_ids = await create_broadcasts(repository, 1)  # type: ignore[attr-defined]
+    await claim(repository, "a")
+    await repository.set_status(broadcast_id, BroadcastStatus.RUNNING)
+
+    await repository.set_status(broadcast_id, BroadcastStatus.CANCELLED)
+
+    assert not await repository.save_progress(broadcast_id, "a", 10, 10, 0, 0)
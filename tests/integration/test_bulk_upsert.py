@@ -0,0 +1,110 @@
+"""Tests for BaseRepository bulk upserts."""
+from collections.abc import AsyncIterator
+from datetime import datetime
+from typing import Any
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from infrastructure.database.core import session as session_module
+from infrastructure.database.core.replicas import ReplicaRouter, replica_context
+from infrastructure.database.core.session import has_writes
+from infrastructure.database.models.users import User
+from infrastructure.database.repositories.base import BaseRepository
+from shared.exceptions.base import DatabaseError
+
+BASE_ID = 7_000_000_200
+COLUMNS = ("telegram_id", "first_name", "username")
+CONFLICT = ("telegram_id",)
+
+
+def rows(*names: tuple[int, str]) -> list[dict[str, Any]]:
+    return [{"telegram_id": BASE_ID + offset, "first_name": name, "username": None} for offset, name in names]
+
+
+async def stored(session: AsyncSession) -> dict[int, User]:
+    result = await session.scalars(select(User).where(User.telegram_id.between(BASE_ID, BASE_ID + 99)))
+    return {user.telegram_id - BASE_ID: user for user in result}
+
+
+@pytest.fixture
+async def unreachable_replica(monkeypatch: pytest.MonkeyPatch) -> AsyncIterator[ReplicaRouter]:
+    """Router whose replica refuses connections, so any statement routed to it fails."""
+    router = ReplicaRouter([create_async_engine("postgresql+asyncpg://nobody@127.0.0.1:1/none")], 5, 5)
+    monkeypatch.setattr(session_module, "_replica_router", router)
+    yield router
+    await router.close()
+
+
+async def test_upsert_many_counts_inserted_and_updated_rows(session: AsyncSession) -> None:
+    repository = BaseRepository(session, User)
+    await repository.upsert_many(rows((0, "Ann"), (1, "Bob")), CONFLICT)
+
+    # Duplicate keys are collapsed, the last one wins
+    result = await repository.upsert_many(rows((1, "Bobby"), (2, "Cid"), (1, "Robert")), CONFLICT)
+
+    assert (result.inserted, result.updated, result.total) == (1, 1, 2)
+    assert has_writes(session)
+    users = await stored(session)
+    assert {offset: user.first_name for offset, user in users.items()} == {0: "Ann", 1: "Robert", 2: "Cid"}
+
+
+async def test_upsert_many_bumps_updated_at(session: AsyncSession) -> None:
+    repository = BaseRepository(session, User)
+    old = datetime(2020, 1, 1)
+    await repository.upsert_many([row | {"updated_at": old} for row in rows((0, "Ann"))], CONFLICT)
+
+    await repository.upsert_many(rows((0, "Anna")), CONFLICT)
+
+    user = (await stored(session))[0]
+    await session.refresh(user)
+    assert user.first_name == "Anna"
+    assert user.updated_at is not None and user.updated_at > old
+
+
+async def test_upsert_many_without_update_columns_skips_existing_rows(session: AsyncSession) -> None:
+    repository = BaseRepository(session, User)
+    await repository.upsert_many(rows((0, "Ann")), CONFLICT)
+
+    result = await repository.upsert_many(rows((0, "Anna"), (1, "Bob")), CONFLICT, update_columns=())
+
+    assert (result.inserted, result.updated) == (1, 0)
+    assert (await stored(session))[0].first_name == "Ann"
+
+
+async def test_upsert_many_of_nothing_writes_nothing(session: AsyncSession) -> None:
+    result = await BaseRepository(session, User).upsert_many([], CONFLICT)
+
+    assert result.total == 0
+    assert not has_writes(session)
+
+
+async def test_copy_upsert_counts_inserted_and_updated_rows(session: AsyncSession) -> None:
+    repository = BaseRepository(session, User)
+    await repository.upsert_many(rows((0, "Ann")), CONFLICT)
+
+    records = [(BASE_ID, "Anna", "anna"), (BASE_ID + 1, "Bob", None), (BASE_ID + 1, "Bob", None)]
+    result = await repository.copy_upsert(records, COLUMNS, CONFLICT)
+
+    assert (result.inserted, result.updated) == (1, 1)
+    assert has_writes(session)
+    users = await stored(session)
+    assert (users[0].first_name, users[0].username, users[1].first_name) == ("Anna", "anna", "Bob")
+
+
+async def test_bulk_upserts_fail_in_read_only_session(session: AsyncSession) -> None:
+    session.info["read_only"] = True
+    repository = BaseRepository(session, User)
+
+    with pytest.raises(DatabaseError, match="read-only"):
+        await repository.upsert_many(rows((0, "Ann")), CONFLICT)
+    with pytest.raises(DatabaseError, match="read-only"):
+        await repository.copy_upsert([(BASE_ID, "Ann", None)], COLUMNS, CONFLICT)
+
+
+async def test_upsert_is_not_routed_to_replica(session: AsyncSession, unreachable_replica: ReplicaRouter) -> None:
+    with replica_context():
+        result = await BaseRepository(session, User).upsert_many(rows((0, "Ann")), CONFLICT)
+
+    assert result.inserted == 1
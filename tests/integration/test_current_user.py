@@ -0,0 +1,80 @@
+"""Tests for CurrentUserMiddleware."""
+from typing import Any
+
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.types import TelegramObject
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from apps.bot.middlewares.current_user_middleware import CurrentUserMiddleware
+from infrastructure.database.models.users import User
+from infrastructure.database.user_cache import UserCache
+from tests.fixtures.telegram import BOT_USER, make_message, make_user
+
+TELEGRAM_ID = 7_000_000_101
+
+
+class Handler:
+    def __init__(self) -> None:
+        self.data: list[dict[str, Any]] = []
+
+    async def __call__(self, event: TelegramObject, data: dict[str, Any]) -> None:
+        self.data.append(dict(data))
+
+
+class CountingFactory:
+    """Session factory that counts the sessions opened."""
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]):
+        self.session_factory = session_factory
+        self.sessions = 0
+
+    def __call__(self) -> AsyncSession:
+        self.sessions += 1
+        return self.session_factory()
+
+
+async def test_unseen_user_is_registered_once_then_served_from_cache(
+    session_factory: async_sessionmaker[AsyncSession], session: AsyncSession
+) -> None:
+    factory = CountingFactory(session_factory)
+    cache = UserCache(max_size=10, ttl=60)
+    middleware = CurrentUserMiddleware(factory, cache)  # type: ignore[arg-type]
+    handler = Handler()
+    telegram_user = make_user(TELEGRAM_ID, username="ann")
+
+    for _ in range(2):
+        await middleware(handler, make_message(TELEGRAM_ID, user=telegram_user), {"event_from_user": telegram_user})
+
+    first, second = (data["user"] for data in handler.data)
+    assert first == second
+    assert (first.telegram_id, first.username) == (TELEGRAM_ID, "ann")
+    assert factory.sessions == 1
+    assert cache.get(TELEGRAM_ID) == first
+    assert await session.scalar(select(User.username).where(User.telegram_id == TELEGRAM_ID)) == "ann"
+
+
+async def test_changed_profile_is_updated(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    middleware = CurrentUserMiddleware(session_factory, UserCache(max_size=10, ttl=60))
+    handler = Handler()
+
+    for username in ("ann", "anna"):
+        telegram_user = make_user(TELEGRAM_ID, username=username)
+        await middleware(handler, make_message(TELEGRAM_ID, user=telegram_user), {"event_from_user": telegram_user})
+
+    assert [data["user"].username for data in handler.data] == ["ann", "anna"]
+
+
+async def test_agnostic_handler_and_bots_get_no_user() -> None:
+    def fail() -> AsyncSession:
+        raise AssertionError("no session expected")
+
+    middleware = CurrentUserMiddleware(fail, UserCache(max_size=10, ttl=60))  # type: ignore[arg-type]
+    handler = Handler()
+    flagged = HandlerObject(callback=handler, flags={"user_agnostic": True})
+
+    await middleware(handler, make_message(), {"event_from_user": make_user(1), "handler": flagged})
+    await middleware(handler, make_message(), {"event_from_user": BOT_USER})
+    await middleware(handler, make_message(), {})
+
+    assert all("user" not in data for data in handler.data)
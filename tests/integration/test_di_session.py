@@ -0,0 +1,104 @@
+"""Tests for the request-scoped session provided by the DI container."""
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+from dishka import AsyncContainer
+from sqlalchemy import event, func, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, async_sessionmaker
+
+from apps.bot.di_container import create_container
+from infrastructure.database.core.session import close_engine, get_session_factory, read_only_context
+from infrastructure.database.models.users import User
+from infrastructure.database.uow import UnitOfWork
+from shared.dto.user import UserCreateDTO
+from shared.enums import UserStatus
+from shared.exceptions.base import DatabaseError
+
+TELEGRAM_ID = 7_000_000_021
+
+
+@pytest.fixture
+async def container(
+    monkeypatch: pytest.MonkeyPatch, session_factory: async_sessionmaker[AsyncSession]
+) -> AsyncIterator[AsyncContainer]:
+    monkeypatch.setattr(
+        "apps.bot.di_container.get_session_factory", lambda read_only=False: session_factory
+    )
+    container = create_container()
+    yield container
+    await container.close()
+    await close_engine()
+
+
+async def count_users(session_factory: async_sessionmaker[AsyncSession]) -> int:
+    async with session_factory() as session:
+        return await session.scalar(select(func.count()).where(User.telegram_id == TELEGRAM_ID)) or 0
+
+
+async def test_upsert_is_committed(
+    container: AsyncContainer, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    async with container() as request:
+        uow = await request.get(UnitOfWork)
+        # A SELECT over a data-modifying CTE: not visible to the session as a write
+        await uow.users.get_or_create(UserCreateDTO(telegram_id=TELEGRAM_ID, first_name="Ann"))
+
+    assert await count_users(session_factory) == 1
+
+
+async def test_failed_request_is_rolled_back(
+    container: AsyncContainer, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    with pytest.raises(RuntimeError):
+        async with container() as request:
+            uow = await request.get(UnitOfWork)
+            await uow.users.get_or_create(UserCreateDTO(telegram_id=TELEGRAM_ID, first_name="Ann"))
+            raise RuntimeError("handler failed")
+
+    assert await count_users(session_factory) == 0
+
+
+async def test_unused_session_sends_nothing(container: AsyncContainer, connection: AsyncConnection) -> None:
+    statements: list[str] = []
+
+    def on_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    event.listen(connection.sync_connection, "before_cursor_execute", on_execute)
+    async with container() as request:
+        await request.get(AsyncSession)
+
+    assert statements == []
+
+
+async def test_read_only_session_rejects_writes(engine: Any) -> None:
+    with read_only_context():
+        container = create_container()
+        try:
+            async with container() as request:
+                session = await request.get(AsyncSession)
+                assert session.info.get("read_only")
+                with pytest.raises(DatabaseError):
+                    await UnitOfWork(session).users.set_status(TELEGRAM_ID, UserStatus.BLOCKED)
+        finally:
+            await container.close()
+            await close_engine()
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        text("WITH gone AS (DELETE FROM users WHERE telegram_id = 0 RETURNING id) SELECT count(*) FROM gone"),
+        select(func.nextval("users_id_seq")),
+    ],
+    ids=["data_modifying_cte", "function"],
+)
+async def test_read_only_session_writes_are_rejected_by_server(engine: Any, statement: Any) -> None:
+    try:
+        async with get_session_factory(read_only=True)() as session:
+            with pytest.raises(DBAPIError, match="read-only transaction"):
+                await session.execute(statement)
+    finally:
+        await close_engine()
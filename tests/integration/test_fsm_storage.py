@@ -0,0 +1,174 @@
+"""Tests for the Postgres FSM storage.
+
+Storages here share the real database (not the rolled back test transaction):
+LISTEN/NOTIFY only delivers committed writes. Keys use a random bot ID and are
+deleted afterwards.
+"""
+import asyncio
+import random
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+import pytest
+from aiogram import Bot, Dispatcher
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.types import TelegramObject
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from apps.bot.fsm_storage import PostgresStorage
+from apps.bot.locales import Translator
+from apps.bot.middlewares.throttling_middleware import ThrottlingMiddleware
+from infrastructure.database.core.session import TrackedSession
+from infrastructure.database.models.fsm_states import FsmState
+from infrastructure.database.repositories.fsm_state_repository import FsmStateRepository
+from tests.fixtures.telegram import make_message_update
+
+StorageFactory = Callable[..., PostgresStorage]
+
+
+@pytest.fixture
+def key() -> StorageKey:
+    return StorageKey(bot_id=random.randint(10**9, 2 * 10**9), chat_id=100, user_id=100)
+
+
+@pytest.fixture
+async def make_storage(engine: AsyncEngine, key: StorageKey) -> AsyncIterator[StorageFactory]:
+    session_factory = async_sessionmaker(
+        bind=engine, class_=AsyncSession, sync_session_class=TrackedSession, expire_on_commit=False
+    )
+    storages: list[PostgresStorage] = []
+
+    def make(**options: Any) -> PostgresStorage:
+        settings = {"cache_size": 100, "cache_ttl": 60, "flush_interval": 0, "state_ttl": 3600} | options
+        storage = PostgresStorage(engine, session_factory, cleanup_interval=3600, **settings)
+        storages.append(storage)
+        return storage
+
+    yield make
+
+    for storage in storages:
+        await storage.close()
+    async with session_factory() as session:
+        await session.execute(delete(FsmState).where(FsmState.key.startswith(f"fsm:{key.bot_id}:")))
+        await session.commit()
+
+
+async def wait_until(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not condition():
+            await asyncio.sleep(0.01)
+
+
+async def test_writes_go_through_to_the_database(make_storage: StorageFactory, key: StorageKey) -> None:
+    storage = make_storage()
+
+    await storage.set_state(key, "Form:name")
+    await storage.set_data(key, {"name": "Ann"})
+
+    assert storage.stats.flushes == 2
+    other = make_storage(cache_size=0)
+    assert await other.get_state(key) == "Form:name"
+    assert await other.get_data(key) == {"name": "Ann"}
+
+
+async def test_failed_write_through_raises_and_is_retried(
+    make_storage: StorageFactory, key: StorageKey, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    storage = make_storage()
+    other = make_storage(cache_size=0)
+
+    async def fail(self: FsmStateRepository, records: Any) -> None:
+        raise ConnectionError("database unavailable")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(FsmStateRepository, "save_many", fail)
+        with pytest.raises(ConnectionError):
+            await storage.set_state(key, "Form:name")
+
+    assert storage.stats.failed_flushes == 1
+    assert await other.get_state(key) is None
+
+    await storage.set_data(key, {"name": "Ann"})
+
+    assert await other.get_state(key) == "Form:name"
+    assert await other.get_data(key) == {"name": "Ann"}
+
+
+async def test_cleared_record_is_deleted(make_storage: StorageFactory, key: StorageKey) -> None:
+    storage = make_storage()
+    await storage.set_state(key, "Form:name")
+
+    await storage.set_state(key, None)
+
+    async with storage.session_factory() as session:
+        assert await session.get(FsmState, storage.key_builder.build(key)) is None
+
+
+async def test_write_behind_coalesces_until_flushed(make_storage: StorageFactory, key: StorageKey) -> None:
+    storage = make_storage(flush_interval=60)
+    storage.start()
+
+    await storage.set_state(key, "Form:name")
+    await storage.set_data(key, {"name": "Ann"})
+
+    other = make_storage(cache_size=0)
+    assert await storage.get_state(key) == "Form:name"
+    assert await other.get_state(key) is None
+
+    await storage.close()
+
+    assert (storage.stats.coalesced, storage.stats.flushes) == (1, 1)
+    assert await other.get_data(key) == {"name": "Ann"}
+
+    # After close, writes go straight to the database
+    await storage.set_state(key, "Form:age")
+    assert await other.get_state(key) == "Form:age"
+
+
+async def test_write_evicts_other_instances_cache(make_storage: StorageFactory, key: StorageKey) -> None:
+    first, second = make_storage(), make_storage()
+    for storage in (first, second):
+        storage.start()
+    await wait_until(lambda: first._listening and second._listening)
+
+    # NOTIFY arrives asynchronously: wait for it, so it cannot evict a later read
+    await first.set_state(key, "Form:name")
+    await wait_until(lambda: second.stats.invalidations == 1)
+    assert await second.get_state(key) == "Form:name"
+    hits = second.stats.hits
+    assert await second.get_state(key) == "Form:name"
+    assert second.stats.hits == hits + 1
+
+    await first.set_state(key, "Form:age")
+    await wait_until(lambda: second.stats.invalidations == 2)
+
+    assert await second.get_state(key) == "Form:age"
+
+
+async def test_dropped_updates_of_stateless_user_do_not_read_storage(
+    make_storage: StorageFactory, key: StorageKey, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    async def notify(event: TelegramObject, i18n: Translator) -> None: ...
+
+    monkeypatch.setattr(ThrottlingMiddleware, "_notify", staticmethod(notify))
+    # Expired at once, unless the record is empty
+    storage = make_storage(cache_ttl=0)
+    storage.start()
+    await wait_until(lambda: storage._listening)
+    dp = Dispatcher(storage=storage)
+    # As in main: the dispatcher's FSM middleware runs before throttling
+    dp.update.outer_middleware(ThrottlingMiddleware(rate=0.001, burst=1, notify_interval=60))
+    handled: list[int] = []
+
+    @dp.message()
+    async def handler(message: Any) -> None:
+        handled.append(message.message_id)
+
+    bot = Bot(f"{key.bot_id}:TEST")
+    for update_id in range(5):
+        await dp.feed_update(bot, make_message_update(update_id, chat_id=key.chat_id))
+
+    assert handled == [0]
+    assert storage.stats.misses == 1
+    assert storage.stats.hits == 4
@@ -0,0 +1,103 @@
+"""Tests for BaseRepository keyset pagination and streaming."""
+from collections.abc import AsyncIterator, Sequence
+
+import pytest
+from sqlalchemy import ColumnElement
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.database.models.users import User
+from infrastructure.database.repositories.base import BaseRepository
+
+BASE_ID = 7_000_000_300
+# Names repeat, so pages ordered by name must break ties by id
+NAMES = ["Bob", "Ann", "Bob", "Cid", "Ann", "Bob", "Ann"]
+IN_RANGE = User.telegram_id.between(BASE_ID, BASE_ID + 99)
+
+
+@pytest.fixture
+async def users(session: AsyncSession) -> list[User]:
+    users = [User(telegram_id=BASE_ID + i, first_name=name) for i, name in enumerate(NAMES)]
+    session.add_all(users)
+    await session.flush()
+    return users
+
+
+async def collect(pages: AsyncIterator[Sequence[User]]) -> list[list[int]]:
+    return [[user.id for user in page] async for page in pages]
+
+
+def flatten(pages: list[list[int]]) -> list[int]:
+    return [id for page in pages for id in page]
+
+
+async def test_pages_by_id_cover_all_rows_in_order(session: AsyncSession, users: list[User]) -> None:
+    repository = BaseRepository(session, User)
+    ids = sorted(user.id for user in users)
+
+    first = await repository.get_page(IN_RANGE, limit=3)
+    second = await repository.get_page(IN_RANGE, limit=3, after=first[-1].id)
+
+    assert [user.id for user in first + second] == ids[:6]
+    assert flatten(await collect(repository.iter_pages(IN_RANGE, chunk_size=3))) == ids
+
+
+async def test_ties_on_sort_key_are_neither_skipped_nor_repeated(session: AsyncSession, users: list[User]) -> None:
+    expected = [user.id for user in sorted(users, key=lambda user: (user.first_name, user.id))]
+
+    pages = await collect(BaseRepository(session, User).iter_pages(IN_RANGE, chunk_size=2, order_by="first_name"))
+
+    # Page boundaries fall inside runs of equal names
+    assert [len(page) for page in pages] == [2, 2, 2, 1]
+    assert flatten(pages) == expected
+
+
+@pytest.mark.parametrize("order_by", ["id", "first_name"])
+async def test_descending_pages(session: AsyncSession, users: list[User], order_by: str) -> None:
+    expected = [
+        user.id for user in sorted(users, key=lambda user: (getattr(user, order_by), user.id), reverse=True)
+    ]
+
+    pages = await collect(
+        BaseRepository(session, User).iter_pages(IN_RANGE, chunk_size=3, order_by=order_by, descending=True)
+    )
+
+    assert flatten(pages) == expected
+
+
+async def test_last_page_and_empty_result(session: AsyncSession, users: list[User]) -> None:
+    repository = BaseRepository(session, User)
+    last = max(user.id for user in users)
+    nothing: ColumnElement[bool] = User.telegram_id < 0
+
+    assert await repository.get_page(IN_RANGE, after=last) == []
+    assert await collect(repository.iter_pages(nothing)) == []
+    assert await collect(repository.stream(nothing)) == []
+    # A full last page costs one more, empty query, and yields nothing more
+    assert [len(page) for page in await collect(repository.iter_pages(IN_RANGE, chunk_size=7))] == [7]
+
+
+async def test_stream_yields_chunks_of_all_rows(session: AsyncSession, users: list[User]) -> None:
+    pages = await collect(BaseRepository(session, User).stream(IN_RANGE, chunk_size=3))
+
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert sorted(flatten(pages)) == sorted(user.id for user in users)
+
+
+async def test_stream_falls_back_to_pages_in_read_only_session(
+    session: AsyncSession, users: list[User], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    repository = BaseRepository(session, User)
+    iter_pages = repository.iter_pages
+    calls: list[int] = []
+
+    def spy(*criteria: ColumnElement[bool], chunk_size: int, **filters: object) -> AsyncIterator[Sequence[User]]:
+        calls.append(chunk_size)
+        return iter_pages(*criteria, chunk_size=chunk_size, **filters)
+
+    monkeypatch.setattr(repository, "iter_pages", spy)
+    session.info["read_only"] = True
+
+    pages = await collect(repository.stream(IN_RANGE, chunk_size=3))
+
+    assert calls == [3]
+    assert flatten(pages) == sorted(user.id for user in users)
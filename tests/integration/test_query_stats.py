@@ -0,0 +1,53 @@
+"""Tests for the SQL query instrumentation hooks."""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from infrastructure.database.core.query_stats import QueryBudgetExceededError, instrument_queries, track_queries
+
+
+async def test_counts_queries_and_round_trips(engine: AsyncEngine) -> None:
+    instrument_queries(engine, slow_query_ms=0)
+
+    with track_queries(update_id=1) as stats:
+        async with engine.begin() as connection:
+            await connection.execute(text("SELECT 1"))
+            await connection.execute(text("SELECT 2"))
+
+    # BEGIN, two statements, COMMIT
+    assert (stats.queries, stats.round_trips) == (2, 4)
+    assert stats.slowest_statement is not None
+
+
+async def test_failed_statement_leaves_no_timer_behind(engine: AsyncEngine) -> None:
+    instrument_queries(engine, slow_query_ms=0)
+
+    async with engine.connect() as connection:
+        with pytest.raises(DBAPIError):
+            await connection.execute(text("SELECT 1 / 0"))
+
+        assert not connection.sync_connection.info.get("query_started")  # type: ignore[union-attr]
+
+
+async def test_strict_budget_stops_the_statement_before_commit(engine: AsyncEngine) -> None:
+    instrument_queries(engine, slow_query_ms=0)
+    await _create_table(engine)
+
+    with track_queries(update_id=1, budget=1, strict=True):
+        async with engine.connect() as connection:
+            await connection.execute(text("INSERT INTO budget_test VALUES (1)"))
+            with pytest.raises(QueryBudgetExceededError):
+                await connection.execute(text("INSERT INTO budget_test VALUES (2)"))
+            await connection.rollback()
+
+    async with engine.connect() as connection:
+        assert (await connection.execute(text("SELECT count(*) FROM budget_test"))).scalar_one() == 0
+        await connection.execute(text("DROP TABLE budget_test"))
+        await connection.commit()
+
+
+async def _create_table(engine: AsyncEngine) -> None:
+    async with engine.begin() as connection:
+        await connection.execute(text("DROP TABLE IF EXISTS budget_test"))
+        await connection.execute(text("CREATE TABLE budget_test (id int)"))
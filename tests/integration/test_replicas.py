@@ -0,0 +1,108 @@
+"""Tests for read-replica routing."""
+from collections.abc import AsyncIterator
+
+import pytest
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from config.settings.base import get_settings
+from infrastructure.database.core import session as session_module
+from infrastructure.database.core.replicas import ReplicaRouter, replica_context, replica_read
+from infrastructure.database.core.session import TrackedSession
+
+PID = select(func.pg_backend_pid())
+
+
+class PidRepository:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.calls = 0
+
+    @replica_read
+    async def backend_pid(self) -> int:
+        self.calls += 1
+        return (await self.session.execute(PID)).scalar_one()
+
+
+@pytest.fixture
+async def router(engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch) -> AsyncIterator[ReplicaRouter]:
+    """Router whose only "replica" is another connection to the test database."""
+    settings = get_settings().database
+    replica = create_async_engine(
+        settings.async_url, connect_args=settings.async_connect_args, isolation_level="AUTOCOMMIT"
+    )
+    router = ReplicaRouter([replica], max_lag=5, check_interval=5)
+    monkeypatch.setattr(session_module, "_replica_router", router)
+    yield router
+    await router.close()
+
+
+@pytest.fixture
+def session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(bind=engine, class_=AsyncSession, sync_session_class=TrackedSession)
+
+
+async def terminate(engine: AsyncEngine, pid: int) -> None:
+    async with engine.connect() as connection:
+        await connection.execute(text("SELECT pg_terminate_backend(:pid)"), {"pid": pid})
+        await connection.commit()
+
+
+async def test_only_replica_reads_go_to_replica(
+    router: ReplicaRouter, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    async with session_factory() as session:
+        with replica_context():
+            replica_pid = (await session.execute(PID)).scalar_one()
+        primary_pid = (await session.execute(PID)).scalar_one()
+        await session.commit()
+
+    assert replica_pid != primary_pid
+
+
+async def test_replica_read_is_retried_on_primary_after_replica_disconnect(
+    engine: AsyncEngine, router: ReplicaRouter, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    async with session_factory() as session:
+        repository = PidRepository(session)
+        replica_pid = await repository.backend_pid()
+        await terminate(engine, replica_pid)
+
+        retried_pid = await repository.backend_pid()
+        primary_pid = (await session.execute(PID)).scalar_one()
+        await session.commit()
+
+    assert retried_pid == primary_pid != replica_pid
+    assert repository.calls == 3
+    assert not router.replicas[0].healthy
+    assert router.pick() is None
+
+
+async def test_read_only_session_stays_on_primary_when_forced(
+    router: ReplicaRouter, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    async with session_factory(info={"read_only": True}) as session:
+        replica_pid = (await session.execute(PID)).scalar_one()
+        with replica_context(False):
+            primary_pid = (await session.execute(PID)).scalar_one()
+        await session.commit()
+
+    assert replica_pid != primary_pid
+
+
+async def test_primary_disconnect_is_not_retried(
+    engine: AsyncEngine, router: ReplicaRouter, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    async with session_factory() as session:
+        pid = (await session.execute(PID)).scalar_one()
+        await terminate(engine, pid)
+
+        repository = PidRepository(session)
+        with replica_context(False), pytest.raises(DBAPIError) as error:
+            await repository.backend_pid()
+
+    assert repository.calls == 1
+
+    assert error.value.connection_invalidated
+    assert router.replicas[0].healthy
@@ -0,0 +1,130 @@
+"""Tests for UserRepository upserts and lookups."""
+from typing import Any
+
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, async_sessionmaker
+
+from infrastructure.database.core.session import has_writes
+from infrastructure.database.models.users import User
+from infrastructure.database.repositories.user_repository import UserRepository
+from infrastructure.database.user_cache import UserCache
+from shared.dto.user import UserCreateDTO
+from shared.enums import Language, UserStatus
+
+TELEGRAM_ID = 7_000_000_001
+
+
+def make_dto(**fields: Any) -> UserCreateDTO:
+    return UserCreateDTO(**{"telegram_id": TELEGRAM_ID, "first_name": "Ann", "username": "ann"} | fields)
+
+
+class StatementCounter:
+    def __init__(self, connection: AsyncConnection):
+        self.statements: list[str] = []
+        event.listen(connection.sync_connection, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        # Savepoints stand in for the transaction of the test's session
+        if "SAVEPOINT" not in statement:
+            self.statements.append(statement)
+
+
+async def test_get_or_create_inserts_new_user_in_one_statement(
+    session: AsyncSession, connection: AsyncConnection
+) -> None:
+    counter = StatementCounter(connection)
+
+    user, created = await UserRepository(session).get_or_create(make_dto(language=Language.EN))
+
+    assert created
+    assert len(counter.statements) == 1
+    assert (user.telegram_id, user.first_name, user.username, user.language) == (TELEGRAM_ID, "Ann", "ann", Language.EN)
+    assert user.id is not None
+    # The upsert is a SELECT over a data-modifying CTE: the session must still commit it
+    assert has_writes(session)
+
+
+async def test_get_or_create_returns_unchanged_user_without_writing(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    async with session_factory() as session:
+        created_user, _ = await UserRepository(session).get_or_create(make_dto())
+        await session.commit()
+
+    async with session_factory() as session:
+        user, created = await UserRepository(session).get_or_create(make_dto())
+
+        assert not created
+        assert user.id == created_user.id
+        assert user.updated_at == created_user.updated_at
+        assert not has_writes(session)
+
+
+async def test_get_or_create_updates_changed_profile(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    async with session_factory() as session:
+        created_user, _ = await UserRepository(session).get_or_create(make_dto())
+        await session.commit()
+
+    async with session_factory() as session:
+        user, created = await UserRepository(session).get_or_create(make_dto(username=None, last_name="Lee"))
+
+        assert not created
+        assert user.id == created_user.id
+        assert (user.username, user.last_name) == (None, "Lee")
+        assert has_writes(session)
+        await session.commit()
+
+    async with session_factory() as session:
+        stored = await session.scalar(select(User).where(User.telegram_id == TELEGRAM_ID))
+        assert stored is not None
+        assert (stored.username, stored.last_name) == (None, "Lee")
+
+
+async def test_get_or_create_refreshes_user_loaded_in_session(session: AsyncSession) -> None:
+    repository = UserRepository(session)
+    user, _ = await repository.get_or_create(make_dto())
+
+    updated, created = await repository.get_or_create(make_dto(first_name="Anna"))
+
+    assert not created
+    assert updated is user
+    assert user.first_name == "Anna"
+
+
+async def test_write_invalidates_snapshot_cached_before_commit(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    cache = UserCache(max_size=10, ttl=60)
+    async with session_factory() as session:
+        await UserRepository(session).get_or_create(make_dto())
+        await session.commit()
+
+    async with session_factory() as session:
+        repository = UserRepository(session, cache=cache)
+        old = await repository.get_snapshot(TELEGRAM_ID)
+        assert old is not None
+        await repository.set_status(TELEGRAM_ID, UserStatus.BLOCKED)
+        assert cache.get(TELEGRAM_ID) is None
+
+        # A concurrent reader caches the committed (old) row before this write commits
+        cache.set(old)
+        await session.commit()
+
+    assert cache.get(TELEGRAM_ID) is None
+
+
+async def test_rolled_back_write_keeps_cached_snapshot(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    cache = UserCache(max_size=10, ttl=60)
+    async with session_factory() as session:
+        await UserRepository(session).get_or_create(make_dto())
+        await session.commit()
+
+    async with session_factory() as session:
+        repository = UserRepository(session, cache=cache)
+        old = await repository.get_snapshot(TELEGRAM_ID)
+        assert old is not None
+        await repository.set_status(TELEGRAM_ID, UserStatus.BLOCKED)
+        cache.set(old)
+        await session.rollback()
+
+    assert cache.get(TELEGRAM_ID) == old
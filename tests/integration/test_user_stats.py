@@ -0,0 +1,78 @@
+"""Tests for the user statistics rollup and its reconciler."""
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from infrastructure.database.repositories.user_repository import UserRepository
+from infrastructure.database.repositories.user_stats_repository import RECONCILE_LOCK_ID
+from infrastructure.database.user_stats import UserStatsReconciler
+from shared.dto.user import UserCreateDTO
+from shared.enums import UserStatus
+
+FIRST_TELEGRAM_ID = 7_000_100_001
+
+
+async def create_users(repository: UserRepository, count: int) -> None:
+    for i in range(count):
+        await repository.get_or_create(UserCreateDTO(telegram_id=FIRST_TELEGRAM_ID + i, first_name=f"User {i}"))
+
+
+async def test_counts_come_from_the_rollup(session: AsyncSession) -> None:
+    repository = UserRepository(session)
+    today = datetime.utcnow().date()
+    before = (
+        await repository.count_by_status(UserStatus.ACTIVE),
+        await repository.count_new_since(today - timedelta(days=6)),
+        await repository.count_new_since(today),
+    )
+
+    await create_users(repository, 3)
+    await repository.set_status(FIRST_TELEGRAM_ID, UserStatus.BLOCKED)
+
+    after = (
+        await repository.count_by_status(UserStatus.ACTIVE),
+        await repository.count_new_since(today - timedelta(days=6)),
+        await repository.count_new_since(today),
+    )
+    assert [b - a for a, b in zip(before, after, strict=True)] == [2, 3, 3]
+    assert await repository.count_new_since(today + timedelta(days=1)) == 0
+
+
+async def test_exact_counts_keep_their_time_windows(session: AsyncSession) -> None:
+    repository = UserRepository(session)
+    hour_ago = datetime.utcnow() - timedelta(hours=1)
+    before = (await repository.count_active_users(period_hours=1), await repository.count_new_users(hour_ago))
+
+    await create_users(repository, 3)
+    await repository.set_status(FIRST_TELEGRAM_ID, UserStatus.BLOCKED)
+
+    after = (await repository.count_active_users(period_hours=1), await repository.count_new_users(hour_ago))
+    # Blocked users are not active, however recent their activity
+    assert [b - a for a, b in zip(before, after, strict=True)] == [2, 3]
+    assert await repository.count_new_users(datetime.utcnow() + timedelta(hours=1)) == 0
+
+
+class RecordingReconciler(UserStatsReconciler):
+    """Reconciler that records passes instead of measuring drift (which needs its own REPEATABLE READ transaction)."""
+
+    passes = 0
+
+    async def _reconcile(self) -> int:
+        self.passes += 1
+        return 1
+
+
+async def test_reconcile_runs_only_while_holding_the_lock(
+    engine: AsyncEngine, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    reconciler = RecordingReconciler(session_factory, interval=60)
+
+    async with engine.connect() as other_instance:
+        await other_instance.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": RECONCILE_LOCK_ID})
+        assert await reconciler.reconcile() == 0
+        await other_instance.rollback()
+
+    assert reconciler.passes == 0
+    assert await reconciler.reconcile() == 1
+    assert reconciler.passes == 1
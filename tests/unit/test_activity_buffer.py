@@ -0,0 +1,76 @@
+"""Tests for the write-behind activity buffer."""
+from datetime import datetime
+from typing import Any
+
+from infrastructure.database.activity import ActivityBuffer
+
+T0 = datetime(2026, 1, 1, 12, 0)
+T1 = datetime(2026, 1, 1, 12, 5)
+
+
+class FailingSessionFactory:
+    def __call__(self) -> Any:
+        raise ConnectionError("database is down")
+
+
+def make_buffer(**kwargs: Any) -> ActivityBuffer:
+    options = {"flush_interval": 60.0, "flush_max_users": 100, "max_users": 100} | kwargs
+    return ActivityBuffer(FailingSessionFactory(), **options)  # type: ignore[arg-type]
+
+
+def test_record_aggregates_per_user() -> None:
+    buffer = make_buffer()
+
+    buffer.record(1, messages=1, at=T1)
+    buffer.record(1, messages=2, at=T0)
+    buffer.record(2, at=T0)
+
+    assert buffer._pending == {1: [3, T1], 2: [0, T0]}
+    assert buffer.stats.recorded == 3
+
+
+def test_record_drops_new_users_beyond_bound() -> None:
+    buffer = make_buffer(max_users=1)
+
+    buffer.record(1, messages=1, at=T0)
+    buffer.record(2, messages=1, at=T0)
+    buffer.record(1, messages=1, at=T0)
+
+    assert len(buffer) == 1
+    assert buffer.stats.dropped == 1
+    assert buffer.stats.recorded == 2
+
+
+def test_record_wakes_flusher_when_full() -> None:
+    buffer = make_buffer(flush_max_users=2)
+
+    buffer.record(1, at=T0)
+    assert not buffer._wakeup.is_set()
+    buffer.record(2, at=T0)
+    assert buffer._wakeup.is_set()
+
+
+async def test_failed_flush_requeues_without_counting_activity_again() -> None:
+    buffer = make_buffer()
+    buffer.record(1, messages=2, at=T0)
+    buffer.record(2, messages=1, at=T0)
+
+    assert await buffer.flush() == 0
+    assert buffer.stats.failed_flushes == 1
+    assert buffer.stats.recorded == 2
+    assert buffer._pending == {1: [2, T0], 2: [1, T0]}
+
+
+async def test_failed_flush_merges_with_activity_recorded_meanwhile() -> None:
+    buffer = make_buffer(max_users=2)
+    buffer.record(1, messages=2, at=T0)
+    buffer.record(2, messages=1, at=T0)
+    rows = [(telegram_id, entry[0], entry[1]) for telegram_id, entry in sorted(buffer._pending.items())]
+    buffer._pending = {}
+    buffer.record(1, messages=1, at=T1)
+    buffer.record(3, messages=1, at=T1)
+
+    buffer._requeue(rows)
+
+    assert buffer._pending == {1: [3, T1], 3: [1, T1]}
+    assert buffer.stats.dropped == 1
@@ -0,0 +1,117 @@
+"""Tests for the outgoing Bot API rate limiter."""
+import asyncio
+import time
+from typing import Any
+
+import pytest
+from aiogram import Bot
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import GetMe, SendMessage
+
+from apps.bot.api_limiter import ApiRateLimiter, bulk_calls
+
+BOT = Bot("42:TEST")
+
+
+class FakeApi:
+    """``make_request`` stand-in that raises queued RetryAfter errors, then succeeds."""
+
+    def __init__(self, retry_after: list[int] | None = None):
+        self.retry_after = retry_after or []
+        self.sent: list[tuple[str, float]] = []
+
+    async def __call__(self, bot: Bot, method: Any) -> str:
+        self.sent.append((type(method).__name__, time.monotonic()))
+        if self.retry_after:
+            raise TelegramRetryAfter(method, "flood", retry_after=self.retry_after.pop(0))
+        return "ok"
+
+
+def make_limiter(global_rate: float = 1000, chat_rate: float = 1000, **kwargs: Any) -> ApiRateLimiter:
+    options: dict[str, Any] = {"group_rate": 1000, "chat_burst": 1, "max_retries": 2, "retry_backoff": 0} | kwargs
+    return ApiRateLimiter(global_rate=global_rate, chat_rate=chat_rate, **options)
+
+
+@pytest.fixture
+def no_sleep(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    """Record sleeps instead of sleeping."""
+    slept: list[float] = []
+
+    async def sleep(delay: float) -> None:
+        slept.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    return slept
+
+
+async def test_calls_to_one_chat_are_paced() -> None:
+    limiter = make_limiter(chat_rate=20)
+    api = FakeApi()
+
+    for _ in range(3):
+        await limiter(api, BOT, SendMessage(chat_id=1, text="hi"))
+
+    first, _, last = (sent_at for _, sent_at in api.sent)
+    assert last - first >= 0.09
+    assert limiter.stats.throttled == 2
+    assert limiter.stats.methods["SendMessage"].calls == 3
+
+
+async def test_other_chats_do_not_wait() -> None:
+    limiter = make_limiter(chat_rate=1)
+    api = FakeApi()
+
+    await asyncio.wait_for(
+        asyncio.gather(*(limiter(api, BOT, SendMessage(chat_id=chat_id, text="hi")) for chat_id in range(1, 20))),
+        timeout=0.5,
+    )
+
+    assert limiter.stats.throttled == 0
+
+
+async def test_bulk_calls_get_their_share_of_the_global_rate() -> None:
+    limiter = make_limiter(global_rate=1000, bulk_rate=20)
+    api = FakeApi()
+
+    # The bulk bucket allows a one-second burst, then paces
+    with bulk_calls():
+        for chat_id in range(1, 23):
+            await limiter(api, BOT, SendMessage(chat_id=chat_id, text="hi"))
+    await limiter(api, BOT, SendMessage(chat_id=100, text="hi"))
+
+    assert limiter.stats.throttled == 2
+
+
+async def test_retry_after_pauses_the_chat_and_counts_retries(no_sleep: list[float]) -> None:
+    limiter = make_limiter(chat_rate=1000)
+    api = FakeApi(retry_after=[3])
+
+    assert await limiter(api, BOT, SendMessage(chat_id=1, text="hi")) == "ok"
+
+    stats = limiter.stats.methods["SendMessage"]
+    assert (stats.calls, stats.retries, stats.requests, stats.errors) == (1, 1, 2, 0)
+    # The retry waited out the chat pause; the global bucket was not paused
+    assert no_sleep and no_sleep[0] >= 3
+    assert limiter._global.reserve() == 0
+
+
+async def test_unscoped_retry_after_pauses_the_global_bucket(no_sleep: list[float]) -> None:
+    limiter = make_limiter()
+    api = FakeApi(retry_after=[3])
+
+    assert await limiter(api, BOT, GetMe()) == "ok"
+
+    assert no_sleep == [3]
+    assert limiter._global.reserve() >= 2.9
+
+
+async def test_gives_up_after_max_retries(no_sleep: list[float]) -> None:
+    limiter = make_limiter(max_retries=2)
+    api = FakeApi(retry_after=[1, 1, 1])
+
+    with pytest.raises(TelegramRetryAfter):
+        await limiter(api, BOT, SendMessage(chat_id=1, text="hi"))
+
+    stats = limiter.stats.methods["SendMessage"]
+    assert (stats.calls, stats.retries, stats.errors) == (1, 2, 1)
+    assert len(api.sent) == 3
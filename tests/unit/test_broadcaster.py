@@ -0,0 +1,72 @@
+"""Tests for broadcast sends and claims."""
+import asyncio
+from typing import Any
+
+import pytest
+from aiogram.exceptions import TelegramBadRequest, TelegramForbiddenError, TelegramRetryAfter
+from aiogram.methods import SendMessage
+
+from apps.bot.api_limiter import _bulk_calls
+from apps.bot.services.broadcaster import Broadcaster, SendResult
+
+METHOD = SendMessage(chat_id=1, text="hi")
+
+
+class FakeBot:
+    def __init__(self, error: Exception | None = None):
+        self.error = error
+        self.bulk: list[bool] = []
+
+    async def send_message(self, chat_id: int, text: str, **kwargs: Any) -> None:
+        self.bulk.append(_bulk_calls.get())
+        if self.error is not None:
+            raise self.error
+
+
+def make_broadcaster(bot: FakeBot) -> Broadcaster:
+    return Broadcaster(bot, None, concurrency=2, chunk_size=10, lease=60)  # type: ignore[arg-type]
+
+
+async def test_send_is_a_bulk_call() -> None:
+    bot = FakeBot()
+
+    assert await make_broadcaster(bot)._send(1, "hi") == SendResult.SENT
+    assert bot.bulk == [True]
+    assert not _bulk_calls.get()
+
+
+async def test_send_outcomes() -> None:
+    blocked = TelegramForbiddenError(METHOD, "bot was blocked by the user")
+    assert await make_broadcaster(FakeBot(blocked))._send(1, "hi") == SendResult.BLOCKED
+
+    bad_request = TelegramBadRequest(METHOD, "chat not found")
+    assert await make_broadcaster(FakeBot(bad_request))._send(1, "hi") == SendResult.FAILED
+
+
+async def test_send_does_not_retry_retry_after_itself() -> None:
+    # The API rate limiter already retried; the error means it gave up
+    bot = FakeBot(TelegramRetryAfter(METHOD, "flood", retry_after=5))
+
+    assert await make_broadcaster(bot)._send(1, "hi") == SendResult.FAILED
+    assert len(bot.bulk) == 1
+
+
+async def test_unfinished_broadcasts_are_claimed_periodically(monkeypatch: pytest.MonkeyPatch) -> None:
+    broadcaster = Broadcaster(FakeBot(), None, concurrency=2, chunk_size=10, lease=0.02)  # type: ignore[arg-type]
+    claims = 0
+
+    async def resume() -> None:
+        nonlocal claims
+        claims += 1
+        if claims == 2:
+            raise ConnectionError("database unavailable")
+
+    monkeypatch.setattr(broadcaster, "resume", resume)
+    broadcaster.start_resuming()
+    await asyncio.sleep(0.1)
+    task = broadcaster._resume_task
+    await broadcaster.close()
+
+    # A failed claim does not stop the loop
+    assert claims >= 3
+    assert task is not None and task.cancelled()
@@ -0,0 +1,84 @@
+"""Tests for message formatting helpers."""
+import pytest
+
+from shared.utils.formatters import (
+    SafeText,
+    Template,
+    escape_html,
+    escape_markdown,
+    split_message,
+    truncate_message,
+    utf16_len,
+)
+
+
+def test_escape_html_escapes_special_characters() -> None:
+    assert escape_html("<a href=\"x\">Tom & 'Jerry'</a>") == (
+        "&lt;a href=&quot;x&quot;&gt;Tom &amp; &#x27;Jerry&#x27;&lt;/a&gt;"
+    )
+    assert escape_html("plain text") == "plain text"
+
+
+def test_escape_markdown_escapes_backslash_once() -> None:
+    assert escape_markdown("1.5 * (2+3) \\ x_y") == "1\\.5 \\* \\(2\\+3\\) \\\\ x\\_y"
+
+
+def test_template_escapes_values_but_not_safe_text() -> None:
+    template = Template("<b>{name}</b>: {score:.1f} {link}")
+
+    text = template(name="Tom & <Jerry>", score=97.25, link=SafeText("<a href='u'>more</a>"), unused=1)
+
+    assert text == "<b>Tom &amp; &lt;Jerry&gt;</b>: 97.2 <a href='u'>more</a>"
+    assert isinstance(text, SafeText)
+    assert template.fields == {"name", "score", "link"}
+
+
+def test_template_without_parse_mode_inserts_values_as_is() -> None:
+    assert Template("{name!r} <{count:03d}>", parse_mode=None).render(name="<b>", count=7) == "'<b>' <007>"
+
+
+def test_template_missing_value_raises_type_error() -> None:
+    with pytest.raises(TypeError):
+        Template("{name}").render()
+
+
+@pytest.mark.parametrize("source", ["{_escape}", "{_extra}", "{SafeText}", "{str!s}", "{class}", "{user.name}"])
+def test_template_rejects_reserved_and_complex_placeholders(source: str) -> None:
+    with pytest.raises(ValueError, match="placeholder"):
+        Template(source)
+
+
+def test_split_message_keeps_parts_within_limit_and_tags_balanced() -> None:
+    text = "<b>" + "word " * 50 + "</b>"
+
+    parts = split_message(text, limit=40)
+
+    assert len(parts) > 1
+    assert " ".join(part.removeprefix("<b>").removesuffix("</b>") for part in parts).split() == ["word"] * 50
+    for part in parts:
+        assert part.startswith("<b>") and part.endswith("</b>")
+        assert utf16_len(part) - len("<b></b>") <= 40
+
+
+def test_split_message_counts_utf16_units_and_never_cuts_entities() -> None:
+    parts = split_message("😀" * 5 + " &amp;" * 3, limit=6)
+
+    assert parts == ["😀😀😀", "😀😀 &amp;", "&amp; &amp;"]
+
+
+def test_split_message_returns_short_text_unchanged() -> None:
+    assert split_message("<i>short</i>", limit=5) == ["<i>short</i>"]
+
+
+def test_truncate_message_adds_suffix_inside_closing_tags() -> None:
+    assert truncate_message("<b>hello world</b>", limit=8) == "<b>hello…</b>"
+
+
+def test_truncate_message_limit_below_suffix_truncates_suffix() -> None:
+    assert truncate_message("hello", 1, None) == "…"
+    assert truncate_message("hello", 2, None, suffix="...") == ".."
+
+
+def test_truncate_message_rejects_non_positive_limit() -> None:
+    with pytest.raises(ValueError, match="limit must be positive"):
+        truncate_message("hello", 0, None)
@@ -0,0 +1,52 @@
+"""Tests for localization catalogs."""
+from pathlib import Path
+
+import pytest
+
+from apps.bot.locales.i18n import LOCALES_DIR, I18n
+from shared.enums import Language
+
+
+def write_catalogs(path: Path, **catalogs: str) -> Path:
+    for locale, text in catalogs.items():
+        (path / f"{locale}.toml").write_text(text, "utf-8")
+    return path
+
+
+def test_bundled_catalogs_match_supported_languages() -> None:
+    i18n = I18n(LOCALES_DIR, default_locale="ru", supported=[language.value for language in Language])
+
+    assert i18n.locales <= {language.value for language in Language}
+    assert Language(i18n.match("pt-br")) == Language.RU
+
+
+def test_catalog_of_unsupported_locale_fails_loading(tmp_path: Path) -> None:
+    path = write_catalogs(tmp_path, en='hello = "Hello"', de='hello = "Hallo"')
+
+    with pytest.raises(ValueError, match="unsupported locales"):
+        I18n(path, default_locale="en", supported=["en", "ru"])
+
+
+def test_language_code_matches_locale_or_default(tmp_path: Path) -> None:
+    i18n = I18n(write_catalogs(tmp_path, en='hello = "Hello"', uk='hello = "Привіт"'), default_locale="en")
+
+    assert i18n.match("uk") == "uk"
+    assert i18n.match("UK-ua") == "uk"
+    assert i18n.match("pt-br") == "en"
+    assert i18n.match(None) == "en"
+
+
+def test_missing_messages_fall_back_to_default_locale(tmp_path: Path) -> None:
+    path = write_catalogs(tmp_path, en='hello = "Hello, {name}"\nbye = "Bye"', uk='hello = "Привіт, {name}"')
+    i18n = I18n(path, default_locale="en")
+
+    assert i18n.get("uk")("hello", name="<b>") == "Привіт, &lt;b&gt;"
+    assert i18n.get("uk")("bye") == "Bye"
+    assert i18n.get("de")("bye") == "Bye"
+
+
+def test_unknown_placeholder_fails_loading(tmp_path: Path) -> None:
+    path = write_catalogs(tmp_path, en='hello = "Hello"', uk='hello = "Привіт, {name}"')
+
+    with pytest.raises(ValueError, match="unknown placeholders"):
+        I18n(path, default_locale="en")
@@ -0,0 +1,96 @@
+"""Tests for the index audit's redundancy and bloat checks."""
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from infrastructure.database.index_audit import BLOAT_MIN_BYTES, IndexStats, _estimate_bloat, _find_redundant
+
+BLOCK_SIZE = 8192
+PRIMARY = {"is_unique": True, "is_primary": True}
+
+
+def make_index(name: str, columns: list[int], **fields: Any) -> IndexStats:
+    defaults: dict[str, Any] = {
+        "schema": "public",
+        "table": "users",
+        "method": "btree",
+        "definition": "",
+        "predicate": None,
+        "is_unique": False,
+        "is_primary": False,
+        "is_valid": True,
+        "size_bytes": 0,
+        "scans": 1,
+        "tuples_read": 0,
+        "tuples_fetched": 0,
+    }
+    return IndexStats(name=name, columns=columns, **defaults | fields)
+
+
+def redundant(*indexes: IndexStats, key_counts: dict[str, int] | None = None) -> dict[str, list[str]]:
+    counts = {index.name: len(index.columns) for index in indexes} | (key_counts or {})
+    _find_redundant(list(indexes), counts)
+    return {index.name: index.redundant_with for index in indexes if index.redundant_with}
+
+
+def test_leading_prefix_is_redundant() -> None:
+    assert redundant(make_index("ix_status", [3]), make_index("ix_status_activity", [3, 5])) == {
+        "ix_status": ["ix_status_activity"]
+    }
+
+
+def test_non_leading_columns_other_predicates_and_tables_are_not_redundant() -> None:
+    assert redundant(make_index("ix_activity", [5]), make_index("ix_status_activity", [3, 5])) == {}
+    assert redundant(make_index("ix_a", [3]), make_index("ix_ab", [3, 5], predicate="(status = 'active')")) == {}
+    assert redundant(make_index("ix_a", [3]), make_index("ix_ab", [3, 5], table="broadcasts")) == {}
+    assert redundant(make_index("ix_a", [3]), make_index("ix_ab", [3, 5], method="gin")) == {}
+
+
+def test_included_columns_do_not_count_as_keys() -> None:
+    # (3) INCLUDE (5) has one key column, so it does not cover (3, 5)
+    covering = make_index("ix_covering", [3, 5])
+    assert redundant(make_index("ix_ab", [3, 5]), covering, key_counts={"ix_covering": 1}) == {
+        "ix_covering": ["ix_ab"]
+    }
+
+
+def test_identical_indexes_keep_the_constraint_or_the_first_name() -> None:
+    assert redundant(make_index("ix_b", [3]), make_index("ix_a", [3])) == {"ix_b": ["ix_a"]}
+    assert redundant(make_index("ix_plain", [3]), make_index("uq_key", [3], is_unique=True)) == {
+        "ix_plain": ["uq_key"]
+    }
+    assert redundant(make_index("uq_key", [3], is_unique=True), make_index("users_pkey", [3], **PRIMARY)) == {
+        "uq_key": ["users_pkey"]
+    }
+
+
+def test_unique_prefix_primary_key_and_expressions_are_kept() -> None:
+    assert redundant(make_index("uq_a", [3], is_unique=True), make_index("ix_ab", [3, 5])) == {}
+    assert redundant(make_index("users_pkey", [1], **PRIMARY), make_index("ix_id_status", [1, 3])) == {}
+    assert redundant(make_index("ix_lower", [0]), make_index("ix_lower_status", [0, 3])) == {}
+
+
+def bloat_row(**fields: Any) -> SimpleNamespace:
+    return SimpleNamespace(
+        **{"method": "btree", "key_width": 8, "reltuples": 100_000, "relpages": 1000, "fillfactor": 90} | fields
+    )
+
+
+def test_bloat_estimate_is_pages_beyond_the_expected_leaf_count() -> None:
+    # 20-byte tuples, (8192 - 40) * 0.9 usable bytes per page: 273 leaf pages + metapage
+    assert _estimate_bloat(bloat_row(), BLOCK_SIZE) == (1000 - 274) * BLOCK_SIZE
+    assert _estimate_bloat(bloat_row(relpages=200), BLOCK_SIZE) == 0
+
+
+@pytest.mark.parametrize("fields", [{"method": "gin"}, {"key_width": None}, {"reltuples": -1}])
+def test_bloat_is_unknown_without_statistics(fields: dict[str, Any]) -> None:
+    assert _estimate_bloat(bloat_row(**fields), BLOCK_SIZE) is None
+
+
+def test_bloat_is_reported_above_both_thresholds() -> None:
+    size = 10 * BLOAT_MIN_BYTES
+
+    assert make_index("ix", [3], size_bytes=size, bloat_bytes=size // 2).problems == ["bloated 50%"]
+    assert not make_index("ix", [3], size_bytes=size, bloat_bytes=size // 10).bloated
+    assert not make_index("ix", [3], size_bytes=BLOAT_MIN_BYTES, bloat_bytes=BLOAT_MIN_BYTES // 2).bloated
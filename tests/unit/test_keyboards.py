@@ -0,0 +1,97 @@
+"""Tests for the shared keyboard registry."""
+from pathlib import Path
+
+import pytest
+from aiogram.types import InlineKeyboardMarkup
+from aiogram.utils.keyboard import InlineKeyboardBuilder
+from pydantic import ValidationError
+
+from apps.bot.keyboards import registry as registry_module
+from apps.bot.keyboards.registry import KeyboardRegistry, freeze
+from apps.bot.locales import I18n, Translator
+from apps.bot.locales.i18n import LOCALES_DIR
+from shared.enums import Language
+
+
+def build_menu(i18n: Translator) -> InlineKeyboardMarkup:
+    builder = InlineKeyboardBuilder()
+    builder.button(text=i18n("menu"), callback_data="menu")
+    return builder.as_markup()
+
+
+def build_page(i18n: Translator, page: int) -> InlineKeyboardMarkup:
+    builder = InlineKeyboardBuilder()
+    builder.button(text=f"{i18n('menu')} {page}", callback_data=f"page:{page}")
+    return builder.as_markup()
+
+
+@pytest.fixture
+def i18n(tmp_path: Path) -> I18n:
+    (tmp_path / "en.toml").write_text('menu = "Menu"', "utf-8")
+    (tmp_path / "ru.toml").write_text('menu = "Меню"', "utf-8")
+    return I18n(tmp_path, default_locale="en")
+
+
+@pytest.fixture
+def keyboards(i18n: I18n) -> KeyboardRegistry:
+    return KeyboardRegistry(i18n, {"menu": build_menu, "page": build_page}, max_size=2)
+
+
+def test_keyboard_without_params_is_built_once_per_locale(i18n: I18n, keyboards: KeyboardRegistry) -> None:
+    en, ru = i18n.get("en"), i18n.get("ru")
+
+    first = keyboards.get("menu", en)
+
+    assert keyboards.get("menu", en) is first
+    assert keyboards.get("menu", ru) is not first
+    assert keyboards.get("menu", ru).inline_keyboard[0][0].text == "Меню"
+    assert (keyboards.stats.builds, keyboards.stats.hits) == (2, 2)
+
+
+def test_parameterized_keyboards_are_evicted_least_recently_used_first(
+    i18n: I18n, keyboards: KeyboardRegistry
+) -> None:
+    en = i18n.get("en")
+    one = keyboards.get("page", en, 1)
+    keyboards.get("page", en, 2)
+    assert keyboards.get("page", en, 1) is one
+
+    keyboards.get("page", en, 3)
+
+    assert keyboards.stats.evictions == 1
+    assert keyboards.get("page", en, 1) is one
+    builds = keyboards.stats.builds
+    keyboards.get("page", en, 2)
+    assert keyboards.stats.builds == builds + 1
+
+
+def test_warm_builds_only_keyboards_without_params(i18n: I18n, keyboards: KeyboardRegistry) -> None:
+    keyboards.warm()
+
+    assert keyboards.stats.builds == len(i18n.locales)
+    keyboards.get("menu", i18n.get("ru"))
+    assert keyboards.stats.builds == len(i18n.locales)
+
+
+def test_bundled_keyboards_warm_in_every_locale() -> None:
+    i18n = I18n(LOCALES_DIR, default_locale="ru", supported=[language.value for language in Language])
+    keyboards = KeyboardRegistry(i18n, registry_module._factories, max_size=10)
+
+    keyboards.warm()
+    builds = keyboards.stats.builds
+
+    for locale in i18n.locales:
+        assert keyboards.get("main_menu", i18n.get(locale)).inline_keyboard
+    assert keyboards.stats.builds == builds
+
+
+def test_markups_are_frozen_and_serialized_like_plain_ones(i18n: I18n, keyboards: KeyboardRegistry) -> None:
+    plain = build_menu(i18n.get("en"))
+    markup = keyboards.get("menu", i18n.get("en"))
+
+    assert markup.model_dump(exclude_unset=True) == plain.model_dump(exclude_unset=True)
+    assert freeze(plain) == markup
+    with pytest.raises(ValidationError):
+        markup.inline_keyboard = []
+    with pytest.raises(ValidationError):
+        markup.inline_keyboard[0][0].text = "changed"
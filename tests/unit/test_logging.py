@@ -0,0 +1,125 @@
+"""Tests for the logging pipeline: JSON format, filters and the background queue."""
+import json
+import logging
+import queue
+import sys
+import threading
+from collections.abc import Iterator
+
+import pytest
+
+from config.settings.base import LoggingSettings
+from infrastructure.monitoring import logging as logging_module
+from infrastructure.monitoring.logging import (
+    BackgroundQueueHandler,
+    ErrorRateLimitFilter,
+    JsonFormatter,
+    SamplingFilter,
+    close_logging,
+)
+from shared.utils import rate_limit
+
+
+def make_record(
+    name: str = "app", level: int = logging.INFO, msg: str = "hello %s", args: tuple = ("world",), **extra: object
+) -> logging.LogRecord:
+    record = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+def test_json_formatter_writes_message_extras_and_exception() -> None:
+    record = make_record(user_id=42)
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record.exc_info = sys.exc_info()
+
+    data = json.loads(JsonFormatter().format(record))
+
+    assert (data["level"], data["logger"], data["message"], data["user_id"]) == ("INFO", "app", "hello world", 42)
+    assert data["ts"].endswith("+00:00")
+    assert "ValueError: boom" in data["exc_info"]
+    assert "args" not in data and "msg" not in data
+
+
+def test_sampling_keeps_share_of_longest_matching_prefix(monkeypatch: pytest.MonkeyPatch) -> None:
+    sampling = SamplingFilter({"apps": 0.0, "apps.bot.scheduler": 1.0})
+    monkeypatch.setattr(logging_module.random, "random", lambda: 0.5)
+
+    assert not sampling.filter(make_record("apps.bot.middlewares"))
+    assert sampling.filter(make_record("apps.bot.scheduler.queue"))
+    assert sampling.filter(make_record("application"))
+    assert sampling.filter(make_record("apps.bot", logging.WARNING))
+
+    half = SamplingFilter({"apps": 0.6})
+    assert half.filter(make_record("apps"))
+    monkeypatch.setattr(logging_module.random, "random", lambda: 0.7)
+    assert not half.filter(make_record("apps"))
+
+
+def test_error_rate_limit_suppresses_repeats_and_reports_them(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    limit = ErrorRateLimitFilter(limit=2, interval=10)
+
+    passed = [limit.filter(make_record(level=logging.ERROR, msg="failed %s", args=(i,))) for i in range(5)]
+    assert passed == [True, True, False, False, False]
+    assert limit.filter(make_record(level=logging.ERROR, msg="other"))
+    assert limit.filter(make_record(level=logging.WARNING, msg="failed %s"))
+
+    now[0] += 5
+    record = make_record(level=logging.ERROR, msg="failed %s", args=(5,))
+    assert limit.filter(record)
+    assert record.getMessage() == "failed 5 [3 similar suppressed]"
+
+
+@pytest.fixture
+def frequent_thread_switches() -> Iterator[None]:
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+@pytest.mark.usefixtures("frequent_thread_switches")
+def test_error_rate_limit_holds_across_threads() -> None:
+    limit = ErrorRateLimitFilter(limit=5, interval=3600)
+    passed: list[bool] = []
+    start = threading.Barrier(8)
+
+    def log_errors(thread: int) -> None:
+        start.wait()
+        # Distinct keys make the buckets insert and reorder concurrently
+        results = [limit.filter(make_record(level=logging.ERROR, msg=f"error {i % 50}")) for i in range(500)]
+        passed.extend(results)
+
+    threads = [threading.Thread(target=log_errors, args=(thread,)) for thread in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(passed) == 50 * 5
+
+
+def test_queue_handler_drops_overflow_without_blocking() -> None:
+    handler = BackgroundQueueHandler(queue.Queue(2))
+
+    for i in range(5):
+        handler.handle(make_record(args=(i,)))
+
+    assert handler.dropped == 3
+    assert handler.queue.get_nowait().msg == "hello 0"
+
+
+def test_close_logging_flushes_queued_records(capsys: pytest.CaptureFixture[str]) -> None:
+    settings = LoggingSettings(format="%(message)s", queue=True, queue_size=1000, error_limit=0)
+    (handler,) = logging_module._build_handlers(settings)
+    try:
+        for i in range(200):
+            handler.handle(make_record(args=(i,)))
+    finally:
+        close_logging()
+
+    assert capsys.readouterr().out.splitlines() == [f"hello {i}" for i in range(200)]
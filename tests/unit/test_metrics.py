@@ -0,0 +1,75 @@
+"""Tests for the in-process metrics and their Prometheus exposition."""
+from collections.abc import Iterator
+
+import pytest
+
+from infrastructure.monitoring.metrics import Counter, Gauge, Histogram, Metric, MetricsRegistry
+
+
+def test_counter_renders_help_type_and_samples_per_label() -> None:
+    counter = Counter("updates_total", "Updates received", ["type"])
+    counter.inc("message")
+    counter.inc("message", amount=2)
+    counter.inc("callback_query", amount=0.5)
+
+    assert counter.render().splitlines() == [
+        "# HELP updates_total Updates received",
+        "# TYPE updates_total counter",
+        'updates_total{type="message"} 3',
+        'updates_total{type="callback_query"} 0.5',
+    ]
+
+
+def test_label_values_are_escaped() -> None:
+    counter = Counter("errors_total", "Errors", ["error"])
+    counter.inc('Bad "quote"\\path\nline')
+
+    assert counter.render().splitlines()[-1] == 'errors_total{error="Bad \\"quote\\"\\\\path\\nline"} 1'
+
+
+def test_histogram_renders_cumulative_buckets_sum_and_count() -> None:
+    histogram = Histogram("duration_seconds", "Time", ["handler"], buckets=(1.0, 0.1))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        histogram.observe(value, "start")
+
+    assert histogram.render().splitlines() == [
+        "# HELP duration_seconds Time",
+        "# TYPE duration_seconds histogram",
+        'duration_seconds_bucket{handler="start",le="0.1"} 2',
+        'duration_seconds_bucket{handler="start",le="1"} 3',
+        'duration_seconds_bucket{handler="start",le="+Inf"} 4',
+        'duration_seconds_sum{handler="start"} 3.65',
+        'duration_seconds_count{handler="start"} 4',
+    ]
+
+
+def test_gauge_function_is_read_at_render_time() -> None:
+    gauge = Gauge("queued", "Queued")
+    values = iter([1, 5])
+    gauge.set_function(lambda: next(values))
+
+    assert gauge.render().splitlines()[-1] == "queued 1"
+    assert gauge.render().splitlines()[-1] == "queued 5"
+
+
+def test_registry_renders_all_metrics_and_rejects_duplicate_names() -> None:
+    registry = MetricsRegistry()
+    registry.register(Gauge("a", "A")).set(1)
+    registry.register(Counter("b", "B"))
+
+    assert registry.render() == "# HELP a A\n# TYPE a gauge\na 1\n# HELP b B\n# TYPE b counter\n"
+    with pytest.raises(ValueError, match="already registered"):
+        registry.register(Counter("a", "Again"))
+
+
+def test_metric_subclass_must_implement_samples() -> None:
+    class Incomplete(Metric):
+        pass
+
+    class Constant(Metric):
+        def samples(self) -> Iterator[tuple[str, tuple[str, ...], tuple[str, ...], float]]:
+            yield "", (), (), 42
+
+    with pytest.raises(TypeError):
+        Incomplete("incomplete", "Incomplete")  # type: ignore[abstract]
+    assert Constant("answer", "Answer").render().splitlines()[-1] == "answer 42"
@@ -0,0 +1,44 @@
+"""Tests for SQL normalization and query budgets."""
+import pytest
+
+from infrastructure.database.core.query_stats import (
+    QueryBudgetExceededError,
+    get_query_stats,
+    normalize_sql,
+    track_queries,
+)
+
+
+def test_normalize_sql_groups_equal_queries() -> None:
+    statement = """SELECT users.id FROM users
+        WHERE users.telegram_id = 42 AND users.username = 'o''brien' AND users.id IN (1, 2, 3)"""
+
+    assert normalize_sql(statement) == (
+        "SELECT users.id FROM users WHERE users.telegram_id = ? AND users.username = ? AND users.id IN (...)"
+    )
+
+
+def test_normalize_sql_keeps_placeholders_and_identifiers() -> None:
+    statement = "SELECT t1.id FROM users AS t1 WHERE t1.telegram_id = $1 AND t1.status IN ($2, $3) LIMIT $4"
+
+    assert normalize_sql(statement) == (
+        "SELECT t1.id FROM users AS t1 WHERE t1.telegram_id = $1 AND t1.status IN (...) LIMIT $4"
+    )
+
+
+def test_over_budget_is_logged_not_raised() -> None:
+    with track_queries(update_id=1, budget=2) as stats:
+        stats.queries = 3
+        stats.check_budget()
+
+    assert stats.over_budget
+    assert get_query_stats() is None
+
+
+def test_strict_budget_raises_before_the_extra_query() -> None:
+    with track_queries(update_id=1, budget=2, strict=True) as stats:
+        stats.queries = 1
+        stats.check_budget()
+        stats.queries = 2
+        with pytest.raises(QueryBudgetExceededError, match="issued 3 queries"):
+            stats.check_budget()
@@ -0,0 +1,101 @@
+"""Tests for the token bucket rate limiters."""
+import pytest
+
+from shared.utils import rate_limit
+from shared.utils.rate_limit import KeyedTokenBuckets, TokenBucket
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(rate_limit.time, "monotonic", clock)
+    return clock
+
+
+def test_bucket_allows_a_burst_then_refills(clock: Clock) -> None:
+    bucket = TokenBucket(rate=2, capacity=3)
+
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+    clock.now += 0.5
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+    clock.now += 60
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+
+def test_reservations_queue_in_arrival_order(clock: Clock) -> None:
+    bucket = TokenBucket(rate=10, capacity=1)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == pytest.approx(0.1)
+    assert bucket.reserve() == pytest.approx(0.2)
+
+
+def test_pause_blocks_the_bucket(clock: Clock) -> None:
+    bucket = TokenBucket(rate=10)
+
+    bucket.pause(2)
+
+    assert bucket.reserve() == pytest.approx(2.1)
+
+
+def test_keyed_buckets_are_independent(clock: Clock) -> None:
+    buckets = KeyedTokenBuckets(rate=1, capacity=1)
+
+    assert buckets.try_acquire("a")
+    assert not buckets.try_acquire("a")
+    assert buckets.try_acquire("b")
+
+    buckets.pause("b", 5)
+    clock.now += 1
+    assert buckets.try_acquire("a")
+    assert not buckets.try_acquire("b")
+
+
+def test_keyed_buckets_evict_idle_keys(clock: Clock) -> None:
+    buckets = KeyedTokenBuckets(rate=1, capacity=1, idle_ttl=10)
+    buckets.try_acquire("a")
+    clock.now += 5
+    buckets.try_acquire("b")
+
+    clock.now += 6
+    buckets.try_acquire("c")
+
+    assert len(buckets) == 2
+
+
+def test_keyed_buckets_keep_at_most_max_keys(clock: Clock) -> None:
+    buckets = KeyedTokenBuckets(rate=1, max_keys=3)
+
+    for key in range(10):
+        buckets.try_acquire(key)
+
+    assert len(buckets) == 3
+    # The least recently used key was evicted and starts with a full bucket
+    assert buckets.try_acquire(0)
+
+
+def test_keyed_buckets_never_evict_paused_keys(clock: Clock) -> None:
+    buckets = KeyedTokenBuckets(rate=1, capacity=1, idle_ttl=10, max_keys=2)
+    buckets.pause("paused", 60)
+
+    clock.now += 30
+    for key in range(5):
+        buckets.try_acquire(key)
+
+    # Idle and least recently used, but still paused: evicting it would lift the pause
+    assert not buckets.try_acquire("paused")
+    assert len(buckets) == 2
+
+    clock.now += 31
+    buckets.try_acquire("new")
+    assert buckets.try_acquire("paused")
@@ -0,0 +1,34 @@
+"""Tests for the read-only session middleware."""
+from typing import Any
+
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.types import TelegramObject
+
+from apps.bot.middlewares.read_only_middleware import ReadOnlyMiddleware
+from infrastructure.database.core.replicas import get_actor
+from infrastructure.database.core.session import is_read_only
+from tests.fixtures.telegram import make_message, make_message_update, make_user
+
+
+async def capture(event: TelegramObject, data: dict[str, Any]) -> tuple[int | None, bool]:
+    return get_actor(), is_read_only()
+
+
+async def test_outer_call_attributes_the_update_to_the_sender() -> None:
+    middleware = ReadOnlyMiddleware()
+
+    result = await middleware(capture, make_message_update(1), {"event_from_user": make_user(42)})
+
+    assert result == (42, False)
+    assert get_actor() is None
+
+
+async def test_inner_call_enables_read_only_sessions_for_flagged_handlers() -> None:
+    middleware = ReadOnlyMiddleware()
+
+    async def stats() -> None: ...
+
+    flagged = {"handler": HandlerObject(stats, flags={"read_only": True})}
+    assert await middleware(capture, make_message(), flagged) == (None, True)
+    assert await middleware(capture, make_message(), {"handler": HandlerObject(stats)}) == (None, False)
+    assert not is_read_only()
@@ -0,0 +1,77 @@
+"""Tests for the role index and role filters."""
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any
+
+import pytest
+
+from apps.bot.filters import admin, roles
+from apps.bot.filters.roles import IsAdminFilter, IsModeratorFilter, IsPremiumFilter
+from infrastructure.database import role_index
+from infrastructure.database.repositories.user_repository import UserRepository
+from infrastructure.database.role_index import RoleIndex
+from shared.enums import UserRole
+from tests.fixtures.telegram import make_message, make_user
+
+
+@asynccontextmanager
+async def no_session() -> Any:
+    yield None
+
+
+@pytest.fixture
+def index(monkeypatch: pytest.MonkeyPatch) -> RoleIndex:
+    """Role index with admin 1, served to the filters."""
+    index = RoleIndex(no_session, admin_ids=[1], interval=60)
+    monkeypatch.setattr(role_index, "_role_index", index)
+    return index
+
+
+def test_roles_rank_admin_ids_and_default_to_user(index: RoleIndex) -> None:
+    index.apply({2: UserRole.MODERATOR, 3: UserRole.PREMIUM})
+
+    assert index.role_of(1) == UserRole.ADMIN
+    assert index.has_role(2, UserRole.PREMIUM)
+    assert not index.has_role(3, UserRole.MODERATOR)
+    assert index.role_of(4) == UserRole.USER
+
+    index.apply({2: UserRole.USER})
+    assert index.role_of(2) == UserRole.USER
+    assert len(index) == 1
+
+
+async def test_refresh_keeps_changes_applied_while_loading(index: RoleIndex, monkeypatch: pytest.MonkeyPatch) -> None:
+    loading = asyncio.Event()
+    release = asyncio.Event()
+
+    async def get_privileged_roles(self: UserRepository) -> list[tuple[int, UserRole]]:
+        loading.set()
+        await release.wait()
+        return [(2, UserRole.MODERATOR), (3, UserRole.PREMIUM)]
+
+    monkeypatch.setattr(UserRepository, "get_privileged_roles", get_privileged_roles)
+    refresh = asyncio.create_task(index.refresh())
+    await loading.wait()
+    index.apply({2: UserRole.USER, 5: UserRole.ADMIN})
+    release.set()
+
+    assert await refresh == 2
+    assert index.role_of(2) == UserRole.USER
+    assert index.role_of(3) == UserRole.PREMIUM
+    assert index.role_of(5) == UserRole.ADMIN
+
+
+async def test_filters_check_sender_role(index: RoleIndex) -> None:
+    index.apply({2: UserRole.MODERATOR})
+    message = make_message()
+
+    assert await IsAdminFilter()(message, event_from_user=make_user(1))
+    assert not await IsAdminFilter()(message, event_from_user=make_user(2))
+    assert await IsModeratorFilter()(message, event_from_user=make_user(2))
+    assert await IsPremiumFilter()(message, event_from_user=make_user(2))
+    assert not await IsPremiumFilter()(message, event_from_user=None)
+
+
+def test_admin_module_reexports_role_filters() -> None:
+    assert admin.IsAdminFilter is roles.IsAdminFilter
+    assert admin.HasRoleFilter is roles.HasRoleFilter
@@ -0,0 +1,162 @@
+"""Tests for the per-chat ordered update scheduler."""
+import asyncio
+from typing import Any
+
+from aiogram import Bot
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.types import Update
+
+from apps.bot.scheduler import ScheduledDispatcher, UpdateScheduler, get_chat_key
+from tests.fixtures.telegram import make_callback_update, make_message_update
+
+BOT = Bot("42:TEST")
+
+
+class RecordingDispatcher:
+    """Dispatcher stand-in that records processing order and overlap per chat."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.processed: list[tuple[int, int]] = []
+        self.active: dict[int, int] = {}
+        self.max_active: dict[int, int] = {}
+        self.max_total = 0
+
+    async def feed_update(self, bot: Bot, update: Update, **kwargs: Any) -> None:
+        chat_id = get_chat_key(update)
+        assert chat_id is not None
+        self.active[chat_id] = self.active.get(chat_id, 0) + 1
+        self.max_active[chat_id] = max(self.max_active.get(chat_id, 0), self.active[chat_id])
+        self.max_total = max(self.max_total, sum(self.active.values()))
+        try:
+            # Later updates finish sooner, so only the queue keeps them in order
+            await asyncio.sleep(self.delay / (1 + update.update_id % 3))
+            self.processed.append((chat_id, update.update_id))
+        finally:
+            self.active[chat_id] -= 1
+
+
+def make_scheduler(dispatcher: RecordingDispatcher, concurrency: int = 10, queue: int = 50) -> UpdateScheduler:
+    return UpdateScheduler(dispatcher, max_concurrency=concurrency, max_queue_per_chat=queue)  # type: ignore[arg-type]
+
+
+def test_chat_key_falls_back_to_callback_message_chat() -> None:
+    assert get_chat_key(make_message_update(1, chat_id=7)) == 7
+    assert get_chat_key(make_callback_update(2, chat_id=9)) == 9
+
+
+async def test_updates_of_one_chat_run_in_order_and_never_overlap() -> None:
+    dispatcher = RecordingDispatcher(delay=0.01)
+    scheduler = make_scheduler(dispatcher)
+
+    for update_id in range(30):
+        assert scheduler.submit(BOT, make_message_update(update_id, chat_id=100 + update_id % 3))
+    await scheduler.close()
+
+    for chat_id in (100, 101, 102):
+        order = [update_id for chat, update_id in dispatcher.processed if chat == chat_id]
+        assert order == sorted(order)
+        assert len(order) == 10
+        assert dispatcher.max_active[chat_id] == 1
+    # Different chats did run in parallel
+    assert dispatcher.max_total > 1
+    assert scheduler.stats.processed == 30
+    assert scheduler.stats.queued == 0
+    assert scheduler.stats.active_chats == 0
+
+
+async def test_concurrency_is_bounded() -> None:
+    dispatcher = RecordingDispatcher(delay=0.01)
+    scheduler = make_scheduler(dispatcher, concurrency=2)
+
+    for update_id in range(10):
+        scheduler.submit(BOT, make_message_update(update_id, chat_id=update_id))
+    await scheduler.close()
+
+    assert dispatcher.max_total == 2
+    assert scheduler.stats.processed == 10
+
+
+async def test_submit_rejects_updates_overflowing_chat_queue() -> None:
+    dispatcher = RecordingDispatcher(delay=0.01)
+    scheduler = make_scheduler(dispatcher, queue=2)
+
+    accepted = [scheduler.submit(BOT, make_message_update(update_id)) for update_id in range(4)]
+    await scheduler.close()
+
+    assert accepted == [True, True, False, False]
+    assert scheduler.stats.rejected == 2
+    assert [update_id for _, update_id in dispatcher.processed] == [0, 1]
+
+
+async def test_put_waits_for_room_instead_of_dropping() -> None:
+    dispatcher = RecordingDispatcher(delay=0.005)
+    scheduler = make_scheduler(dispatcher, queue=2)
+
+    for update_id in range(10):
+        assert await scheduler.put(BOT, make_message_update(update_id))
+        assert scheduler.stats.queued <= 2
+    await scheduler.close()
+
+    assert [update_id for _, update_id in dispatcher.processed] == list(range(10))
+    assert scheduler.stats.rejected == 0
+    assert scheduler.stats.waited > 0
+
+
+async def test_closed_scheduler_rejects_updates() -> None:
+    scheduler = make_scheduler(RecordingDispatcher())
+    await scheduler.close()
+
+    assert not await scheduler.put(BOT, make_message_update(1))
+    assert scheduler.stats.rejected == 1
+
+
+async def test_failed_update_does_not_stop_chat_queue() -> None:
+    dispatcher = RecordingDispatcher()
+    scheduler = make_scheduler(dispatcher)
+    feed_update = dispatcher.feed_update
+
+    async def failing(bot: Bot, update: Update, **kwargs: Any) -> None:
+        if update.update_id == 1:
+            raise RuntimeError("handler failed")
+        await feed_update(bot, update, **kwargs)
+
+    dispatcher.feed_update = failing  # type: ignore[method-assign]
+    for update_id in range(3):
+        scheduler.submit(BOT, make_message_update(update_id))
+    await scheduler.close()
+
+    assert [update_id for _, update_id in dispatcher.processed] == [0, 2]
+    assert scheduler.stats.failed == 1
+
+
+class RecordingStorage(MemoryStorage):
+    def __init__(self, dispatcher: ScheduledDispatcher | None = None):
+        super().__init__()
+        self.dispatcher = dispatcher
+        self.queued_at_close: int | None = None
+
+    async def close(self) -> None:
+        assert self.dispatcher is not None
+        stats = self.dispatcher.scheduler.stats
+        self.queued_at_close = stats.queued + stats.in_flight
+        await super().close()
+
+
+async def test_shutdown_drains_queues_before_storage_closes() -> None:
+    storage = RecordingStorage()
+    dp = ScheduledDispatcher(storage=storage, max_concurrent_updates=2, max_chat_queue_size=10)
+    storage.dispatcher = dp
+    processed: list[int] = []
+
+    @dp.message()
+    async def handler(message: Any) -> None:
+        await asyncio.sleep(0.01)
+        processed.append(message.message_id)
+
+    for update_id in range(5):
+        assert await dp._process_update(BOT, make_message_update(update_id))
+    await dp.emit_shutdown(bot=BOT)
+
+    assert processed == list(range(5))
+    assert storage.queued_at_close == 0
@@ -0,0 +1,85 @@
+"""Tests for the anti-flood throttling middleware."""
+from typing import Any
+
+import pytest
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.types import TelegramObject
+
+from apps.bot.locales import Translator
+from apps.bot.middlewares.throttling_middleware import ThrottlingMiddleware
+from tests.fixtures.telegram import make_message_update, make_user
+
+
+class Handler:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def __call__(self, event: TelegramObject, data: dict[str, Any]) -> str:
+        self.calls += 1
+        return "handled"
+
+
+@pytest.fixture
+def notified(monkeypatch: pytest.MonkeyPatch) -> list[TelegramObject]:
+    """Record slow-down notices instead of sending them."""
+    events: list[TelegramObject] = []
+
+    async def notify(event: TelegramObject, i18n: Translator) -> None:
+        events.append(event)
+
+    monkeypatch.setattr(ThrottlingMiddleware, "_notify", staticmethod(notify))
+    return events
+
+
+async def test_user_may_burst_then_is_dropped(notified: list[TelegramObject]) -> None:
+    middleware = ThrottlingMiddleware(rate=0.001, burst=3, notify_interval=60)
+    handler = Handler()
+    data = {"event_from_user": make_user(1)}
+
+    results = [await middleware(handler, make_message_update(i), data) for i in range(5)]
+
+    assert results == ["handled"] * 3 + [None] * 2
+    assert handler.calls == 3
+    assert middleware.dropped == 2
+    # Told to slow down once per notify_interval, not once per dropped update
+    assert len(notified) == 1
+
+
+async def test_users_have_separate_buckets(notified: list[TelegramObject]) -> None:
+    middleware = ThrottlingMiddleware(rate=0.001, burst=1, notify_interval=60)
+    handler = Handler()
+
+    for user_id in (1, 2, 3):
+        await middleware(handler, make_message_update(user_id), {"event_from_user": make_user(user_id)})
+
+    assert handler.calls == 3
+    assert middleware.dropped == 0
+
+
+async def test_updates_without_sender_pass() -> None:
+    middleware = ThrottlingMiddleware(rate=0.001, burst=1, notify_interval=60)
+    handler = Handler()
+
+    for i in range(3):
+        await middleware(handler, make_message_update(i), {})
+
+    assert handler.calls == 3
+
+
+async def test_handler_limit_applies_only_to_flagged_handlers(notified: list[TelegramObject]) -> None:
+    middleware = ThrottlingMiddleware(rate=0.001, burst=1, notify_interval=60)
+    handler = Handler()
+
+    async def report() -> None: ...
+
+    async def menu() -> None: ...
+
+    user = make_user(1)
+    flagged = {"event_from_user": user, "handler": HandlerObject(report, flags={"throttling": 0.001})}
+    unflagged = {"event_from_user": user, "handler": HandlerObject(menu)}
+    for i in range(3):
+        await middleware(handler, make_message_update(i), flagged)
+        await middleware(handler, make_message_update(i), unflagged)
+
+    assert handler.calls == 4
+    assert middleware.dropped == 2
@@ -0,0 +1,53 @@
+"""Tests for the user snapshot cache."""
+import pytest
+
+from infrastructure.database.user_cache import UserCache
+from tests.fixtures.users import make_snapshot
+
+
+def test_get_returns_stored_snapshot_and_counts_hits() -> None:
+    cache = UserCache(max_size=10, ttl=60)
+    snapshot = make_snapshot(1)
+    cache.set(snapshot)
+
+    assert cache.get(1) is snapshot
+    assert cache.get(2) is None
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache = UserCache(max_size=2, ttl=60)
+    cache.set(make_snapshot(1))
+    cache.set(make_snapshot(2))
+    cache.get(1)
+
+    cache.set(make_snapshot(3))
+
+    assert cache.get(2) is None
+    assert cache.get(1) is not None
+    assert cache.get(3) is not None
+    assert cache.stats.evictions == 1
+
+
+def test_expired_entry_is_a_miss(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr("infrastructure.database.user_cache.time.monotonic", lambda: now)
+    cache = UserCache(max_size=10, ttl=60)
+    cache.set(make_snapshot(1))
+
+    now += 61
+
+    assert cache.get(1) is None
+    assert len(cache) == 0
+    assert cache.stats.expirations == 1
+
+
+def test_invalidate_drops_entry() -> None:
+    cache = UserCache(max_size=10, ttl=60)
+    cache.set(make_snapshot(1))
+
+    cache.invalidate(1)
+    cache.invalidate(2)
+
+    assert cache.get(1) is None
+    assert cache.stats.invalidations == 1
@@ -0,0 +1,81 @@
+"""Tests for the webhook request handler."""
+import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
+
+import pytest
+from aiogram import Bot
+from aiogram.types import Update
+from aiohttp import web
+from aiohttp.test_utils import TestClient, TestServer
+
+from apps.bot.scheduler import UpdateScheduler
+from apps.bot.webhook import ScheduledRequestHandler
+from tests.fixtures.telegram import make_message_update
+
+BOT = Bot("42:TEST")
+PATH = "/webhook"
+SECRET = "s3cret"
+
+
+class BlockingDispatcher:
+    """Dispatcher stand-in whose handlers wait until released."""
+
+    def __init__(self) -> None:
+        self.release = asyncio.Event()
+        self.received: list[int] = []
+        self.processed: list[int] = []
+
+    async def feed_update(self, bot: Bot, update: Update, **kwargs: Any) -> None:
+        self.received.append(update.update_id)
+        await self.release.wait()
+        self.processed.append(update.update_id)
+
+
+@pytest.fixture
+def dispatcher() -> BlockingDispatcher:
+    return BlockingDispatcher()
+
+
+@pytest.fixture
+async def client(dispatcher: BlockingDispatcher) -> AsyncIterator[TestClient]:
+    scheduler = UpdateScheduler(dispatcher, max_concurrency=10, max_queue_per_chat=10)  # type: ignore[arg-type]
+    app = web.Application()
+    ScheduledRequestHandler(scheduler, BOT, secret_token=SECRET).register(app, path=PATH)
+    client = TestClient(TestServer(app))
+    await client.start_server()
+    yield client
+    dispatcher.release.set()
+    await client.close()
+
+
+async def post(client: TestClient, update: Update, secret: str | None = SECRET) -> web.Response:
+    headers = {"X-Telegram-Bot-Api-Secret-Token": secret} if secret is not None else {}
+    return await client.post(PATH, data=update.model_dump_json(exclude_unset=True), headers=headers)
+
+
+@pytest.mark.parametrize("secret", [None, "wrong"])
+async def test_request_without_valid_secret_is_rejected(
+    client: TestClient, dispatcher: BlockingDispatcher, secret: str | None
+) -> None:
+    response = await post(client, make_message_update(1), secret)
+
+    assert response.status == 401
+    await asyncio.sleep(0)
+    assert dispatcher.received == []
+
+
+async def test_update_is_acknowledged_before_it_is_handled(client: TestClient, dispatcher: BlockingDispatcher) -> None:
+    responses = [await post(client, make_message_update(update_id)) for update_id in (1, 2)]
+
+    assert [response.status for response in responses] == [200, 200]
+    assert [await response.json() for response in responses] == [{}, {}]
+    assert dispatcher.processed == []
+
+    dispatcher.release.set()
+    async with asyncio.timeout(5):
+        while len(dispatcher.processed) < 2:
+            await asyncio.sleep(0.01)
+
+    # Same chat: handled in arrival order
+    assert dispatcher.processed == [1, 2]